@@ -2,20 +2,28 @@ import os
 import logging
 import uuid
 import json
-from datetime import datetime
-import imagehash
-from PIL import Image
+import click
+import hmac
 from io import BytesIO
-from flask import Flask, render_template, request, redirect, url_for, session, flash, send_file, g, make_response, abort
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, send_file, g, make_response, abort, jsonify
+from markupsafe import Markup
 from werkzeug.utils import secure_filename
 from sqlalchemy import func
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 from config import Config
-from models import db, SkinAnalysis
+from models import db, SkinAnalysis, ensure_indexes
 from services.ai_service import analyze_skin_age
-from services.storage_service import upload_image, get_image_url
-from utils.common import allowed_file, generate_feedback, generate_image_hash
+from services.image_variants import VARIANT_SIZES, get_variant_path
+from services.analysis_jobs import analysis_jobs, DONE as JOB_DONE, FAILED as JOB_FAILED
+from services.render_cache import page_cache, results_fragment_cache
+from services.report_cache import pdf_report_cache, report_retention
+from services.report_export import parse_ids, stream_reports_zip
+from services.storage_service import image_store, remote_store, upload_image, get_image_url, schedule_remote_upload, upload_retention
+from services.upload_retention import EXPIRED_PREFIX, EVICTED_PREFIX, remote_key_for, variant_key_for
+from utils.common import allowed_file, generate_feedback
+from utils.image_context import ImageContext
 from utils.pdf_generator import create_skin_analysis_pdf
 from utils.product_recommendations import get_product_recommendations
 # Dashboard import will be added after app initialization
@@ -79,8 +87,8 @@ def assetlinks():
 # Privacy Policy route (required for Google Play)
 @app.route('/privacy-policy')
 def privacy_policy():
-    from datetime import datetime
-    return render_template('privacy_policy.html', current_date=datetime.now().strftime('%B %d, %Y'))
+    current_date = datetime.now().strftime('%B %d, %Y')
+    return page_cache.render('privacy_policy.html', key=current_date, current_date=current_date)
 
 # Set default language
 config = Config()
@@ -90,6 +98,10 @@ def before_request():
     # Always use English for simplified app
     g.lang = 'en'
     
+    # 이미지 응답은 공유 캐시에 저장되므로 세션(Set-Cookie, Vary: Cookie)을 건드리지 않음
+    if request.endpoint == 'serve_image':
+        return
+
     # Generate session ID for tracking
     if 'session_id' not in session:
         session['session_id'] = str(uuid.uuid4())
@@ -119,6 +131,15 @@ def nl2br_filter(s):
 
 app.jinja_env.filters['nl2br'] = nl2br_filter
 
+def image_variant_filter(analysis, size):
+    """Point an analysis image at one of its locally served resized variants, whatever its origin URL."""
+    key = variant_key_for(analysis.image_path)
+    if key is None:
+        return analysis.image_url
+    return url_for('serve_image', filename=key, size=size)
+
+app.jinja_env.filters['image_variant'] = image_variant_filter
+
 @app.route('/')
 def index():
     """Render the home page with image upload form."""
@@ -127,15 +148,171 @@ def index():
         session['user_id'] = str(uuid.uuid4())
         logger.debug(f"Created new session ID: {session['user_id']}")
     
-    return render_template('index_simple.html')
+    return page_cache.render('index_simple.html', lang=g.lang)
 
 @app.route('/serve_image/<filename>')
 def serve_image(filename):
-    """Serve the uploaded images."""
+    """Serve an uploaded image, or a resized variant of it via ?size=thumb|results."""
+    variant = request.args.get('size', 'original')
+    if variant not in VARIANT_SIZES:
+        abort(400)
+    key = secure_filename(filename)
+    source_path = image_store.local_path(key)
+    if source_path is None and variant != 'original' and hasattr(image_store, 'path_for'):
+        # The original may have been evicted by upload retention while its variants were kept
+        try:
+            path, mimetype = get_variant_path(image_store.path_for(key), variant, request.headers.get('Accept'))
+        except FileNotFoundError:
+            if not remote_store.bucket_name:
+                abort(404)
+            # No local variant left to build from: fall back to the mirrored original
+            return redirect(remote_store.url_for(remote_key_for(key)))
+        return _immutable_image_response(path, mimetype, vary_accept=True)
+    if source_path is None:
+        if not image_store.exists(key):
+            abort(404)
+        # Store without local files (e.g. memory): serve the original bytes
+        response = send_file(BytesIO(image_store.get(key)), mimetype='image/jpeg',
+                             download_name=key, conditional=True, etag=key,
+                             max_age=config.IMAGE_CACHE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    try:
+        path, mimetype = get_variant_path(source_path, variant, request.headers.get('Accept'))
+    except Exception as e:
+        logger.error(f"Could not generate {variant} variant of {filename}: {str(e)}")
+        path, mimetype = source_path, None
+
+    return _immutable_image_response(path, mimetype, vary_accept=variant != 'original')
+
+def _immutable_image_response(path, mimetype, vary_accept):
+    """send_file for upload images, which never change once written."""
+    # 업로드 파일은 변경되지 않으므로 장기 캐시 + ETag/Range 지원
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True,
+                         max_age=config.IMAGE_CACHE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    if vary_accept:
+        response.vary.add('Accept')
+    return response
+
+def run_analysis(image_context, actual_age):
+    """Analyze an uploaded image and build its feedback text."""
+    result = analyze_skin_age(image_context, actual_age)
+    if len(result) == 2:
+        skin_age, features = result
+    else:
+        skin_age, features, _ = result
+    logger.debug(f"Analysis complete: skin_age={skin_age}, features={features}")
+    
     try:
-        return send_file(f"/tmp/uploads/{filename}")
-    except FileNotFoundError:
-        abort(404)
+        feedback = generate_feedback(skin_age, features, 'en')
+    except Exception as e:
+        logger.error(f"Error generating feedback: {str(e)}")
+        feedback = "Analysis completed successfully."
+    
+    return skin_age, features, feedback
+
+def save_analysis(user_id, image_path, image_url, img_hash, actual_age, skin_age, features, feedback):
+    """Persist an analysis result and return the saved SkinAnalysis."""
+    analysis = SkinAnalysis()
+    analysis.user_id = user_id
+    analysis.user_account_id = None  # No user accounts in simplified version
+    analysis.image_path = image_path
+    analysis.image_url = image_url
+    analysis.image_hash = img_hash
+    analysis.skin_age = skin_age
+    analysis.actual_age = actual_age
+    analysis.features = features
+    analysis.feedback = feedback
+    db.session.add(analysis)
+    db.session.commit()
+    
+    # Push the local original to Firebase in the background; the row's URL is swapped afterwards
+    schedule_remote_upload(image_path, record_remote_uploads)
+    
+    # The row never changes after this point, so render its report ahead of the first download
+    if Config.PDF_PRERENDER:
+        pdf_report_cache.schedule(analysis.id, 'en', render_report)
+    return analysis
+
+def record_remote_uploads(uploaded):
+    """Point analyses at their Firebase URLs once a background upload batch finishes."""
+    with app.app_context():
+        try:
+            for local_path, _, url in uploaded:
+                SkinAnalysis.query.filter_by(image_path=local_path).update({'image_url': url})
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Could not record remote image URLs: {str(e)}")
+
+def record_removed_uploads(expired, evicted):
+    """Mark analyses whose local originals were removed by upload retention."""
+    with app.app_context():
+        try:
+            for path in expired:
+                SkinAnalysis.query.filter_by(image_path=path).update(
+                    {'image_path': EXPIRED_PREFIX + os.path.basename(path), 'image_url': ''},
+                    synchronize_session=False)
+            for path in evicted:
+                # Rows with a Firebase copy keep working through the remote path
+                SkinAnalysis.query.filter(SkinAnalysis.image_path == path,
+                                          SkinAnalysis.image_url.like('http%')).update(
+                    {'image_path': remote_key_for(path)}, synchronize_session=False)
+                SkinAnalysis.query.filter_by(image_path=path).update(
+                    {'image_path': EVICTED_PREFIX + os.path.basename(path)}, synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Could not mark removed uploads: {str(e)}")
+
+def referenced_uploads(paths, since):
+    """Return the upload paths used by analyses created after `since` (epoch seconds)."""
+    referenced = set()
+    cutoff = datetime.fromtimestamp(since, timezone.utc).replace(tzinfo=None)  # created_at은 naive UTC
+    with app.app_context():
+        try:
+            for start in range(0, len(paths), 500):
+                rows = (db.session.query(SkinAnalysis.image_path)
+                        .filter(SkinAnalysis.image_path.in_(paths[start:start + 500]),
+                                SkinAnalysis.created_at >= cutoff)
+                        .distinct())
+                referenced.update(row.image_path for row in rows)
+        except SQLAlchemyError as e:
+            # 확인할 수 없으면 이번 실행에서는 아무것도 지우지 않음
+            logger.error(f"Could not check referenced uploads: {str(e)}")
+            return set(paths)
+    return referenced
+
+def render_report(analysis_id, lang='en'):
+    """Render the PDF report for an analysis (callable outside a request)."""
+    with app.app_context():
+        analysis = db.session.get(SkinAnalysis, analysis_id)
+        return create_skin_analysis_pdf(analysis, lang)
+
+def job_owner():
+    """
+    비동기 분석 작업의 소유자 키를 반환합니다.
+
+    익명 세션(user_id 없음)은 세션마다 발급되는 session_id를 사용하므로,
+    다른 익명 세션이 작업 ID만으로 결과를 조회할 수 없습니다.
+    """
+    return session.get('user_id') or session.get('session_id')
+
+def analysis_job(image_context, actual_age, user_id, image_path, image_url, img_hash):
+    """Background job body for async mode. Returns the new analysis id."""
+    with app.app_context():
+        skin_age, features, feedback = run_analysis(image_context, actual_age)
+        try:
+            analysis = save_analysis(user_id, image_path, image_url, img_hash,
+                                     actual_age, skin_age, features, feedback)
+            return analysis.id
+        except Exception:
+            db.session.rollback()
+            raise
 
 @app.route('/upload', methods=['POST'])
 def upload():
@@ -153,19 +330,17 @@ def upload():
     
     if file and allowed_file(file.filename):
         try:
-            # Read and validate image
-            image_data = file.read()
-            file.seek(0)  # Reset file pointer
+            # Read the upload once; every later step shares this context
+            image_context = ImageContext.from_file(file)
             
             # Validate file size
-            if len(image_data) < Config.MIN_FILE_SIZE:
+            if image_context.size_bytes < Config.MIN_FILE_SIZE:
                 flash(f'File too small. Minimum size is {Config.MIN_FILE_SIZE // 1024}KB', 'danger')
                 return redirect(url_for('index'))
             
             # Validate image format and dimensions
             try:
-                img = Image.open(BytesIO(image_data))
-                width, height = img.size
+                width, height = image_context.size
                 
                 if width < Config.MIN_IMAGE_WIDTH or height < Config.MIN_IMAGE_HEIGHT:
                     flash(f'Image too small. Minimum dimensions: {Config.MIN_IMAGE_WIDTH}x{Config.MIN_IMAGE_HEIGHT}px', 'danger')
@@ -182,9 +357,7 @@ def upload():
             
             # Generate image hash for duplicate detection
             try:
-                # Convert BytesIO to PIL Image for hash generation
-                image_for_hash = Image.open(BytesIO(image_data))
-                img_hash = str(generate_image_hash(image_for_hash))
+                img_hash = image_context.image_hash
                 
                 # Check for duplicate analysis (within same session for guest users)
                 user_id = session.get('user_id')
@@ -203,50 +376,42 @@ def upload():
             
             # Upload image to storage
             try:
-                image_path, image_url = upload_image(file, session.get('user_id'))
+                image_path, image_url = upload_image(image_context, session.get('user_id'))
                 logger.debug(f"Image uploaded: {image_path}")
             except Exception as e:
                 logger.error(f"Error uploading image: {str(e)}")
                 flash('Error uploading image. Please try again.', 'danger')
                 return redirect(url_for('index'))
             
-            # Analyze skin age
+            # Hand the analysis to the background worker pool in async mode
+            if Config.ASYNC_ANALYSIS:
+                job_id = analysis_jobs.submit(
+                    analysis_job, image_context, actual_age, session.get('user_id'),
+                    image_path, image_url, img_hash,
+                    owner=job_owner()
+                )
+                logger.debug(f"Queued analysis job {job_id}")
+                if request.accept_mimetypes.best == 'application/json':
+                    return jsonify({
+                        'job_id': job_id,
+                        'status_url': url_for('job_status', job_id=job_id),
+                        'result_url': url_for('job_result', job_id=job_id)
+                    }), 202
+                return redirect(url_for('job_result', job_id=job_id))
+            
+            # Analyze skin age and generate feedback
             try:
                 logger.debug("Starting skin age analysis...")
-                # Load image from path for analysis
-                image_for_analysis = Image.open(image_path)
-                result = analyze_skin_age(image_for_analysis, actual_age)
-                if len(result) == 2:
-                    skin_age, features = result
-                else:
-                    skin_age, features, _ = result
-                logger.debug(f"Analysis complete: skin_age={skin_age}, features={features}")
+                skin_age, features, feedback = run_analysis(image_context, actual_age)
             except Exception as e:
                 logger.error(f"Error analyzing skin age: {str(e)}")
                 flash('Error analyzing image. Please try again with a different photo.', 'danger')
                 return redirect(url_for('index'))
             
-            # Generate feedback
-            try:
-                feedback = generate_feedback(skin_age, features, 'en')
-            except Exception as e:
-                logger.error(f"Error generating feedback: {str(e)}")
-                feedback = "Analysis completed successfully."
-            
             # Save analysis to database
             try:
-                analysis = SkinAnalysis()
-                analysis.user_id = session.get('user_id')
-                analysis.user_account_id = None  # No user accounts in simplified version
-                analysis.image_path = image_path
-                analysis.image_url = image_url
-                analysis.image_hash = img_hash
-                analysis.skin_age = skin_age
-                analysis.actual_age = actual_age
-                analysis.features = features
-                analysis.feedback = feedback
-                db.session.add(analysis)
-                db.session.commit()
+                analysis = save_analysis(session.get('user_id'), image_path, image_url, img_hash,
+                                         actual_age, skin_age, features, feedback)
                 
                 flash('Analysis completed successfully!', 'success')
                 return redirect(url_for('results', analysis_id=analysis.id))
@@ -282,34 +447,63 @@ def results(analysis_id):
             flash('Analysis not found.', 'danger')
             return redirect(url_for('index'))
         
-        # Ensure image_url is properly set for display
-        if not analysis.image_url or not analysis.image_url.startswith('http'):
-            # Regenerate URL from path if needed
-            from services.storage_service import get_image_url
-            analysis.image_url = get_image_url(analysis.image_path)
-            # Update in database
-            try:
-                db.session.commit()
-            except Exception as e:
-                logger.warning(f"Could not update image URL: {str(e)}")
-        
-        # Generate product recommendations based on analysis
-        recommended_products = get_product_recommendations(
-            analysis.features, 
-            analysis.skin_age, 
-            analysis.actual_age
-        )
-        
-        # Add recommendations to analysis object for template
-        analysis.recommended_products = recommended_products
+        # The row is immutable apart from its image path/URL, so the rendered content is reused across views
+        cache_key = (analysis.id, analysis.image_path, analysis.image_url)
+        content = results_fragment_cache.get(cache_key)
+        if content is None:
+            # Generate product recommendations based on analysis
+            analysis.recommended_products = get_product_recommendations(
+                analysis.features, 
+                analysis.skin_age, 
+                analysis.actual_age
+            )
+            content = render_template('results_simple_content.html', analysis=analysis)
+            results_fragment_cache.set(cache_key, content)
         
-        return render_template('results_simple.html', analysis=analysis)
+        # Only the layout (flash messages) is rendered per request
+        return render_template('results_simple.html', content=Markup(content))
     
     except Exception as e:
         logger.error(f"Error loading results: {str(e)}")
         flash('Error loading analysis results.', 'danger')
         return redirect(url_for('index'))
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status of an async analysis job as JSON."""
+    job = analysis_jobs.get(job_id)
+    owner = job_owner()
+    if job is None or owner is None or job['owner'] != owner:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == JOB_DONE:
+        response['analysis_id'] = job['result']
+        response['results_url'] = url_for('results', analysis_id=job['result'])
+    elif job['status'] == JOB_FAILED:
+        response['error'] = 'Error analyzing image. Please try again with a different photo.'
+    return jsonify(response)
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Redirect to the results page once an async analysis job finishes."""
+    job = analysis_jobs.get(job_id)
+    owner = job_owner()
+    if job is None or owner is None or job['owner'] != owner:
+        flash('Analysis not found.', 'danger')
+        return redirect(url_for('index'))
+    
+    if job['status'] == JOB_DONE:
+        flash('Analysis completed successfully!', 'success')
+        return redirect(url_for('results', analysis_id=job['result']))
+    
+    if job['status'] == JOB_FAILED:
+        flash('Error analyzing image. Please try again with a different photo.', 'danger')
+        return redirect(url_for('index'))
+    
+    # Still running: show a page that polls the status endpoint
+    return render_template('job_pending.html', job_id=job_id)
+
 @app.route('/download_pdf/<int:analysis_id>')
 def download_pdf(analysis_id):
     """Generate and download a PDF report for a skin analysis."""
@@ -321,25 +515,79 @@ def download_pdf(analysis_id):
             flash('Analysis not found.', 'danger')
             return redirect(url_for('index'))
         
-        # Generate PDF
-        pdf_buffer = create_skin_analysis_pdf(analysis, 'en')
+        # Serve the cached report (rendering it now if the background job hasn't yet)
+        pdf_path = pdf_report_cache.get_or_create(analysis_id, 'en', render_report)
         
-        # Create response
-        response = make_response(pdf_buffer.getvalue())
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=skin_analysis_{analysis_id}.pdf'
-        
-        return response
+        # send_file adds ETag/Last-Modified and answers conditional requests with 304
+        return send_file(
+            pdf_path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'skin_analysis_{analysis_id}.pdf',
+            conditional=True,
+            etag=True
+        )
         
     except Exception as e:
         logger.error(f"Error generating PDF: {str(e)}")
         flash('Error generating PDF report.', 'danger')
         return redirect(url_for('results', analysis_id=analysis_id))
 
+@app.route('/export_pdfs', methods=['GET', 'POST'])
+def export_pdfs():
+    """
+    Stream a ZIP of PDF reports for many analyses.
+    
+    Accepts ``ids`` (repeated, comma-separated or a JSON list) and/or a ``start``/``end`` date
+    range (YYYY-MM-DD). Regular visitors can only export their own session's
+    analyses; requests carrying the ADMIN_EXPORT_TOKEN in X-Export-Token may
+    export any analyses and filter by ``user_id``.
+    """
+    params = request.get_json(silent=True) or request.values
+    is_admin = bool(Config.ADMIN_EXPORT_TOKEN) and hmac.compare_digest(
+        request.headers.get('X-Export-Token', ''), Config.ADMIN_EXPORT_TOKEN
+    )
+    
+    query = SkinAnalysis.query.with_entities(SkinAnalysis.id)
+    if is_admin:
+        if params.get('user_id'):
+            query = query.filter(SkinAnalysis.user_id == params.get('user_id'))
+    else:
+        query = query.filter(SkinAnalysis.user_id == session.get('user_id'))
+    
+    try:
+        ids = parse_ids(params)
+        if ids:
+            query = query.filter(SkinAnalysis.id.in_(ids))
+        if params.get('start'):
+            query = query.filter(SkinAnalysis.created_at >= datetime.strptime(params.get('start'), '%Y-%m-%d'))
+        if params.get('end'):
+            end = datetime.strptime(params.get('end'), '%Y-%m-%d') + timedelta(days=1)
+            query = query.filter(SkinAnalysis.created_at < end)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid ids or date range'}), 400
+    
+    if is_admin and not (ids or params.get('start') or params.get('end') or params.get('user_id')):
+        return jsonify({'error': 'Specify ids, user_id or a date range'}), 400
+    
+    analysis_ids = [row.id for row in query.order_by(SkinAnalysis.id).limit(Config.EXPORT_MAX_REPORTS)]
+    if not analysis_ids:
+        return jsonify({'error': 'No analyses found'}), 404
+    
+    logger.info(f"Exporting {len(analysis_ids)} PDF reports")
+    archive = stream_reports_zip(
+        analysis_ids,
+        lambda analysis_id: pdf_report_cache.get_or_create(analysis_id, 'en', render_report),
+        max_workers=Config.EXPORT_WORKERS
+    )
+    filename = f"skin_analysis_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Response(archive, mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors."""
-    return render_template('404.html'), 404
+    return page_cache.render('404.html', status=404)
 
 @app.errorhandler(500)
 def server_error(e):
@@ -349,5 +597,61 @@ def server_error(e):
 
 # Dashboard removed - using Google Play Console analytics instead
 
+@app.cli.command('create-indexes')
+def create_indexes():
+    """Create model indexes missing from an existing database (run once per deploy)."""
+    created = ensure_indexes()
+    click.echo(f"Created indexes: {', '.join(created)}" if created else "All indexes exist")
+
+@app.cli.command('gc-uploads')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed.')
+def gc_uploads(dry_run):
+    """Apply the upload retention policy once and print what was reclaimed."""
+    stats = upload_retention.run(record_removed_uploads, dry_run=dry_run, is_referenced=referenced_uploads)
+    click.echo(json.dumps(stats))
+
+@app.cli.command('gc-reports')
+@click.option('--dry-run', is_flag=True, help='Only report what would be removed.')
+def gc_reports(dry_run):
+    """Apply the PDF report cache age and size limits once."""
+    stats = report_retention.run(dry_run=dry_run)
+    click.echo(json.dumps(stats))
+
+@app.cli.command('backfill-image-urls')
+@click.option('--batch-size', default=500, show_default=True)
+def backfill_image_urls(batch_size):
+    """Rewrite stored image URLs that do not match their image path."""
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (db.session.query(SkinAnalysis.id, SkinAnalysis.image_path, SkinAnalysis.image_url)
+                .filter(SkinAnalysis.id > last_id)
+                .order_by(SkinAnalysis.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        last_id = rows[-1].id
+        changes = []
+        for row in rows:
+            # Removed originals and rows that already point at a public URL stay as they are
+            if row.image_path.startswith((EXPIRED_PREFIX, EVICTED_PREFIX)) or row.image_url.startswith('http'):
+                continue
+            url = get_image_url(row.image_path)
+            if url != row.image_url:
+                changes.append({'id': row.id, 'image_url': url})
+        if changes:
+            db.session.execute(db.update(SkinAnalysis), changes)
+            db.session.commit()
+            updated += len(changes)
+    click.echo(f"Updated {updated} image URL(s)")
+
+if config.UPLOAD_RETENTION_INTERVAL > 0:
+    # 모든 워커가 호출하지만 잠금 파일을 얻은 한 프로세스만 정리를 수행
+    upload_retention.start(config.UPLOAD_RETENTION_INTERVAL, record_removed_uploads, referenced_uploads)
+
+if config.PDF_CACHE_GC_INTERVAL > 0:
+    report_retention.start(config.PDF_CACHE_GC_INTERVAL)
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+중복 이미지 조회 벤치마크.
+
+Times the ``upload()`` duplicate check (``user_id`` + ``image_hash``) against
+a SkinAnalysis table of growing size, with and without the model's
+indexes. With ``ix_skin_analysis_user_id_image_hash`` the lookup stays flat;
+without it every lookup is a full table scan.
+
+Usage:
+    python benchmarks/bench_duplicate_lookup.py [rows ...]
+    (default: 10000 100000 1000000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert, select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import SkinAnalysis  # noqa: E402
+
+LOOKUPS = 200
+BATCH = 20000
+
+
+def populate(engine, table, rows):
+    """Insert ``rows`` analyses spread over rows // 5 users; return sample keys."""
+    samples = []
+    user_ids = [str(uuid.uuid4()) for _ in range(max(1, rows // 5))]
+    with engine.begin() as conn:
+        for start in range(0, rows, BATCH):
+            batch = []
+            for i in range(start, min(rows, start + BATCH)):
+                user_id = user_ids[i % len(user_ids)]
+                image_hash = f"{i:016x}"
+                batch.append({
+                    'user_id': user_id, 'image_path': f'/tmp/uploads/{i}.jpg',
+                    'image_url': f'/serve_image/{i}.jpg', 'image_hash': image_hash,
+                    'skin_age': 30.0, 'features': '{}', 'feedback': '',
+                })
+                if i % max(1, rows // LOOKUPS) == 0:
+                    samples.append((user_id, image_hash))
+            conn.execute(insert(table), batch)
+    return samples[:LOOKUPS]
+
+
+def time_lookups(engine, table, samples):
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for user_id, image_hash in samples:
+            conn.execute(
+                select(table.c.id)
+                .where(table.c.user_id == user_id, table.c.image_hash == image_hash)
+                .limit(1)
+            ).first()
+        elapsed = time.perf_counter() - start
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN SELECT id FROM {table.name} WHERE user_id = ? AND image_hash = ? LIMIT 1",
+            samples[0]
+        ).fetchall()
+    return elapsed / len(samples), plan[-1][-1]
+
+
+def run(rows, with_indexes):
+    table = SkinAnalysis.__table__
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        table.create(engine)
+        if not with_indexes:
+            for index in table.indexes:
+                index.drop(engine)
+        samples = populate(engine, table, rows)
+        per_lookup, plan = time_lookups(engine, table, samples)
+        engine.dispose()
+    return per_lookup, plan
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    for rows in sizes:
+        for with_indexes in (True, False):
+            per_lookup, plan = run(rows, with_indexes)
+            label = 'indexed' if with_indexes else 'no index'
+            print(f"{rows:>9} rows | {label:8} | {per_lookup * 1e6:10.1f} us/lookup | {plan}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+analyze_fallback 에지 검출 마이크로 벤치마크.
+
+Compares the former nested ``getpixel`` loop (plus the per-pixel mean and
+variance passes) with the NumPy engine in ``utils.image_features`` and
+checks that both produce the same ``edges_normalized``, ``luminance`` and
+``contrast_normalized`` values.
+
+Usage:
+    python benchmarks/bench_fallback_edges.py [repeat]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.image_features import channel_statistics, edge_count, pixel_array  # noqa: E402
+
+
+def legacy_characteristics(image):
+    """The pre-vectorization implementation, kept here as the baseline."""
+    pixels = list(image.getdata())
+    pixel_count = len(pixels)
+    avg_r = sum(p[0] for p in pixels) / pixel_count
+    avg_g = sum(p[1] for p in pixels) / pixel_count
+    avg_b = sum(p[2] for p in pixels) / pixel_count
+    var_r = sum((p[0] - avg_r) ** 2 for p in pixels) / pixel_count
+    var_g = sum((p[1] - avg_g) ** 2 for p in pixels) / pixel_count
+    var_b = sum((p[2] - avg_b) ** 2 for p in pixels) / pixel_count
+    luminance = (0.299 * avg_r + 0.587 * avg_g + 0.114 * avg_b) / 255
+    contrast = (var_r + var_g + var_b) / 3 / 255
+    contrast_normalized = min(1.0, contrast * 200)
+
+    edges = 0
+    for y in range(1, 299):
+        for x in range(1, 299):
+            pixel = image.getpixel((x, y))
+            pixel_up = image.getpixel((x, y-1))
+            pixel_down = image.getpixel((x, y+1))
+            pixel_left = image.getpixel((x-1, y))
+            pixel_right = image.getpixel((x+1, y))
+            diff_up = abs(pixel[0] - pixel_up[0]) + abs(pixel[1] - pixel_up[1]) + abs(pixel[2] - pixel_up[2])
+            diff_down = abs(pixel[0] - pixel_down[0]) + abs(pixel[1] - pixel_down[1]) + abs(pixel[2] - pixel_down[2])
+            diff_left = abs(pixel[0] - pixel_left[0]) + abs(pixel[1] - pixel_left[1]) + abs(pixel[2] - pixel_left[2])
+            diff_right = abs(pixel[0] - pixel_right[0]) + abs(pixel[1] - pixel_right[1]) + abs(pixel[2] - pixel_right[2])
+            if diff_up > 30 or diff_down > 30 or diff_left > 30 or diff_right > 30:
+                edges += 1
+    return edges, luminance, contrast, min(1.0, edges / 5000), contrast_normalized
+
+
+def vectorized_characteristics(image):
+    """The current implementation used by analyze_fallback."""
+    pixels = pixel_array(image)
+    stats = channel_statistics(pixels)
+    avg_r, avg_g, avg_b = stats['means']
+    var_r, var_g, var_b = stats['variances']
+    luminance = (0.299 * avg_r + 0.587 * avg_g + 0.114 * avg_b) / 255
+    contrast = (var_r + var_g + var_b) / 3 / 255
+    contrast_normalized = min(1.0, contrast * 200)
+    edges = edge_count(pixels, threshold=30)
+    return edges, luminance, contrast, min(1.0, edges / 5000), contrast_normalized
+
+
+def sample_images():
+    """A gently textured image (few edges) and a noisy one (many edges)."""
+    rng = np.random.default_rng(42)
+    base = np.full((300, 300, 3), 128, dtype=np.int16)
+    images = []
+    for amplitude in (6, 40):
+        noise = rng.integers(-amplitude, amplitude + 1, base.shape)
+        images.append(Image.fromarray((base + noise).clip(0, 255).astype(np.uint8)))
+    return images
+
+
+def time_call(func, image, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(image)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for index, image in enumerate(sample_images()):
+        legacy_time, legacy = time_call(legacy_characteristics, image, repeat)
+        fast_time, fast = time_call(vectorized_characteristics, image, repeat * 20)
+        assert legacy[0] == fast[0], (legacy, fast)
+        assert np.allclose(legacy[1:], fast[1:], rtol=1e-12, atol=0), (legacy, fast)
+        print(f"image {index}: legacy {legacy_time * 1000:8.2f} ms | "
+              f"numpy {fast_time * 1000:6.2f} ms | speedup {legacy_time / fast_time:6.1f}x | "
+              f"edges={fast[0]} luminance={fast[1]:.6f} contrast={fast[2]:.6f}")
+
+
+if __name__ == '__main__':
+    main()
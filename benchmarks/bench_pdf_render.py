@@ -0,0 +1,95 @@
+"""
+PDF 보고서 렌더링 벤치마크.
+
+Renders the same report with the current pipeline (shared module-level
+styles, pre-downscaled 2.5x2 inch embed image) and with the previous one
+(stylesheet rebuilt per call, original upload embedded as-is) and compares
+render time and output size.
+
+Usage:
+    python benchmarks/bench_pdf_render.py [image_path] [repeat]
+    (default: a generated 4000x3000 JPEG, 5 repeats)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Image as ReportLabImage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_generator  # noqa: E402
+
+
+def sample_analysis(image_path):
+    return SimpleNamespace(
+        id=1, image_path=image_path, skin_age=34.2, actual_age=31, created_at=datetime.now(),
+        features={
+            'wrinkles': 0.35, 'pigmentation': 0.22, 'elasticity': 0.61, 'moisture': 0.48,
+            'fine_lines': 0.4, 'dark_spots': 0.18, 'pores': 0.52, 'dryness': 0.44, 'oiliness': 0.37,
+        },
+        feedback="Your skin's estimated age is 34 years.\n• Some wrinkles are starting to appear.\n\n"
+                 "당신의 피부 나이는 약 34세로 추정됩니다.",
+    )
+
+
+def legacy_embed(image_path):
+    """Previous behaviour: hand the full-resolution upload to ReportLab."""
+    return ReportLabImage(image_path, width=2.5 * pdf_generator.inch, height=2 * pdf_generator.inch)
+
+
+def legacy_styles():
+    """Previous behaviour: getSampleStyleSheet() and new ParagraphStyles on every call."""
+    styles = getSampleStyleSheet()
+    return (
+        ParagraphStyle('EnTitle', parent=styles['Title'], fontSize=18, leading=22),
+        ParagraphStyle('EnNormal', parent=styles['Normal'], fontSize=10, leading=12),
+        ParagraphStyle('EnHeading', parent=styles['Heading2'], fontSize=12, leading=16),
+    )
+
+
+def render(analysis, repeat, legacy):
+    current_embed = pdf_generator._embed_image
+    current_styles = pdf_generator.PDF_STYLES
+    if legacy:
+        pdf_generator._embed_image = legacy_embed
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if legacy:
+                pdf_generator.PDF_STYLES = {'en': legacy_styles()}
+            size = len(pdf_generator.create_skin_analysis_pdf(analysis, 'en').getvalue())
+        return (time.perf_counter() - start) / repeat, size
+    finally:
+        pdf_generator._embed_image = current_embed
+        pdf_generator.PDF_STYLES = current_styles
+
+
+def main():
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(tmp, 'upload.jpg')
+        if not os.path.exists(image_path):
+            rng = np.random.default_rng(7)
+            base = np.linspace(60, 200, 4000, dtype=np.float64)
+            pixels = np.stack([np.tile(base, (3000, 1))] * 3, axis=2) + rng.normal(0, 12, (3000, 4000, 3))
+            Image.fromarray(pixels.clip(0, 255).astype(np.uint8)).save(image_path, quality=92)
+
+        analysis = sample_analysis(image_path)
+        legacy_time, legacy_size = render(analysis, repeat, legacy=True)
+        current_time, current_size = render(analysis, repeat, legacy=False)
+        print(f"upload: {os.path.getsize(image_path) // 1024} KB")
+        print(f"legacy : {legacy_time * 1000:8.1f} ms  {legacy_size // 1024:6d} KB")
+        print(f"current: {current_time * 1000:8.1f} ms  {current_size // 1024:6d} KB")
+        print(f"speedup {legacy_time / current_time:.1f}x, size {legacy_size / current_size:.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,9 +13,69 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # File upload settings
-    UPLOAD_FOLDER = '/tmp/uploads'
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', '/tmp/uploads')
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')  # local(내용 주소 기반), memory 또는 firebase
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB max upload
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
+    IMAGE_CACHE_MAX_AGE = int(os.environ.get('IMAGE_CACHE_MAX_AGE', 365 * 24 * 3600))  # 업로드 파일명은 고유하므로 변경되지 않음
+    
+    # Upload retention (0이면 해당 제한 없음)
+    UPLOAD_RETENTION_DAYS = float(os.environ.get('UPLOAD_RETENTION_DAYS', 0))  # 기간이 지난 원본은 원격 사본까지 삭제
+    UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 0))  # 초과 시 원본만 삭제 (변형 이미지, 원격 사본 유지)
+    UPLOAD_EVICTION_POLICY = os.environ.get('UPLOAD_EVICTION_POLICY', 'oldest')  # oldest 또는 lru
+    UPLOAD_EVICTION_GRACE_DAYS = float(os.environ.get('UPLOAD_EVICTION_GRACE_DAYS', 1))  # 이 기간 안의 분석이 참조하는 원본은 용량 초과 시에도 유지
+    UPLOAD_RETENTION_INTERVAL = int(os.environ.get('UPLOAD_RETENTION_INTERVAL', 0))  # 백그라운드 실행 주기(초, 한 워커만 실행), 0이면 CLI로만 실행
+    
+    # Background Firebase uploads (요청은 로컬 저장 후 바로 응답)
+    REMOTE_UPLOADS = os.environ.get('REMOTE_UPLOADS', 'true').lower() in ('1', 'true', 'yes')
+    REMOTE_UPLOAD_WORKERS = int(os.environ.get('REMOTE_UPLOAD_WORKERS', 2))
+    REMOTE_UPLOAD_BATCH_SIZE = int(os.environ.get('REMOTE_UPLOAD_BATCH_SIZE', 16))
+    REMOTE_UPLOAD_BATCH_INTERVAL = float(os.environ.get('REMOTE_UPLOAD_BATCH_INTERVAL', 0.5))  # seconds
+    REMOTE_UPLOAD_MAX_RETRIES = int(os.environ.get('REMOTE_UPLOAD_MAX_RETRIES', 3))
+    REMOTE_UPLOAD_DEAD_LETTER = os.environ.get('REMOTE_UPLOAD_DEAD_LETTER', '')  # 최종 실패 기록 파일 (JSON Lines)
+    
+    # Rendered results page fragments (분석 ID별)
+    RESULTS_CACHE_SIZE = int(os.environ.get('RESULTS_CACHE_SIZE', 2048))
+    
+    # Static page cache (홈, 개인정보처리방침, 404)
+    PAGE_CACHE_FOLDER = os.environ.get('PAGE_CACHE_FOLDER', '')  # 지정 시 워커 간 공유되는 파일 캐시, 비어 있으면 메모리 LRU
+    PAGE_CACHE_VERSION = os.environ.get('PAGE_CACHE_VERSION', '1')  # 템플릿 변경 배포 시 올림
+    
+    # Product search adapters (제휴 API 서명을 처리하는 로컬 어댑터/프록시 URL, 비워 두면 로컬 카탈로그 사용)
+    COUPANG_API_URL = os.environ.get('COUPANG_API_URL', '')
+    AMAZON_API_URL = os.environ.get('AMAZON_API_URL', '')
+    COUPANG_API_TIMEOUT = float(os.environ.get('COUPANG_API_TIMEOUT', 3))  # seconds
+    AMAZON_API_TIMEOUT = float(os.environ.get('AMAZON_API_TIMEOUT', 3))  # seconds
+    PRODUCT_SEARCH_WORKERS = int(os.environ.get('PRODUCT_SEARCH_WORKERS', 8))
+    
+    # Product API rate limits
+    PRODUCT_API_DAILY_LIMIT = int(os.environ.get('PRODUCT_API_DAILY_LIMIT', 1000))  # 모든 제공자 합계
+    COUPANG_API_RATE = float(os.environ.get('COUPANG_API_RATE', 1))  # 초당 호출 수
+    COUPANG_API_BURST = float(os.environ.get('COUPANG_API_BURST', 5))
+    AMAZON_API_RATE = float(os.environ.get('AMAZON_API_RATE', 1))  # 초당 호출 수
+    AMAZON_API_BURST = float(os.environ.get('AMAZON_API_BURST', 1))
+    PRODUCT_API_USAGE_DB = os.environ.get('PRODUCT_API_USAGE_DB', '')  # 워커 간 일일 사용량을 공유할 SQLite 파일
+    
+    # Product search result cache
+    RECOMMENDATION_CACHE_SIZE = int(os.environ.get('RECOMMENDATION_CACHE_SIZE', 1024))
+    RECOMMENDATION_CACHE_TTL = int(os.environ.get('RECOMMENDATION_CACHE_TTL', 6 * 3600))  # seconds
+    RECOMMENDATION_CACHE_DB = os.environ.get('RECOMMENDATION_CACHE_DB', '')  # 워커 간 공유할 SQLite 파일
+    
+    # Local product catalog (API를 쓸 수 없을 때의 대체 제품, .json/.csv/.sqlite)
+    PRODUCT_CATALOG_PATH = os.environ.get('PRODUCT_CATALOG_PATH', '')  # 설정하지 않으면 대체 제품 없음
+    
+    # PDF report cache (분석 직후 백그라운드에서 미리 생성)
+    PDF_CACHE_FOLDER = os.environ.get('PDF_CACHE_FOLDER', '/tmp/reports')
+    PDF_PRERENDER = os.environ.get('PDF_PRERENDER', 'true').lower() in ('1', 'true', 'yes')
+    PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', 2))
+    PDF_CACHE_MAX_AGE_DAYS = float(os.environ.get('PDF_CACHE_MAX_AGE_DAYS', 30))  # 0이면 제한 없음
+    PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024))  # 초과 시 오래된 보고서부터 삭제
+    PDF_CACHE_GC_INTERVAL = int(os.environ.get('PDF_CACHE_GC_INTERVAL', 3600))  # 정리 주기(초, 한 워커만 실행), 0이면 CLI로만 실행
+    
+    # Batch PDF export
+    ADMIN_EXPORT_TOKEN = os.environ.get('ADMIN_EXPORT_TOKEN', '')  # 설정 시 X-Export-Token 헤더로 전체 분석 내보내기 허용
+    EXPORT_MAX_REPORTS = int(os.environ.get('EXPORT_MAX_REPORTS', 1000))
+    EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS', 4))
     
     # Image restrictions
     MIN_IMAGE_WIDTH = 300  # 최소 이미지 너비 (픽셀)
@@ -26,10 +86,44 @@ class Config:
     # 이미지 업로드 가이드라인 문구
     UPLOAD_GUIDELINES = 'Upload any image - yourself, your favorite celebrity, or even a 20-year-old photo!'
     
+    # Analyzer settings
+    # 기존 저장 결과와 동일한 값을 재현하려면 JPEG 재인코딩 기반 시드를 사용
+    ANALYZER_LEGACY_SEED = os.environ.get('ANALYZER_LEGACY_SEED', '').lower() in ('1', 'true', 'yes')
+    
+    # Analysis result cache (이미지 내용 해시 + 실제 나이 기반)
+    ANALYSIS_CACHE_SIZE = int(os.environ.get('ANALYSIS_CACHE_SIZE', 4096))
+    ANALYSIS_CACHE_DB = os.environ.get('ANALYSIS_CACHE_DB', '')  # 비어 있으면 디스크 캐시 사용 안 함
+    
+    # Derived text cache (피드백/키워드/추천 목록, 임계값 구간으로 정규화한 특성 기준)
+    DERIVED_CACHE_SIZE = int(os.environ.get('DERIVED_CACHE_SIZE', 4096))
+    
+    # Process pool for CPU-bound analysis (0이면 요청 스레드에서 직접 분석)
+    ANALYSIS_PROCESS_WORKERS = int(os.environ.get('ANALYSIS_PROCESS_WORKERS', 0))
+    ANALYSIS_TIMEOUT = float(os.environ.get('ANALYSIS_TIMEOUT', 10))  # seconds
+    
+    # Asynchronous analysis (업로드 시 작업 큐에 넣고 즉시 응답)
+    ASYNC_ANALYSIS = os.environ.get('ASYNC_ANALYSIS', '').lower() in ('1', 'true', 'yes')
+    ANALYSIS_JOB_WORKERS = int(os.environ.get('ANALYSIS_JOB_WORKERS', 4))
+    ANALYSIS_JOB_DB = os.environ.get('ANALYSIS_JOB_DB', '')  # 여러 프로세스가 작업 상태를 공유할 SQLite 파일
+    ANALYSIS_JOB_TTL = int(os.environ.get('ANALYSIS_JOB_TTL', 24 * 3600))  # 완료/실패 작업 기록 보관 시간 (seconds)
+    ANALYSIS_JOB_STALE_AFTER = int(os.environ.get('ANALYSIS_JOB_STALE_AFTER', 15 * 60))  # 이 시간 동안 갱신되지 않은 대기/실행 중 작업은 실패 처리 (seconds)
+    
     # API keys
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
     REPLICATE_API_KEY = os.environ.get('REPLICATE_API_KEY', '')
     HUGGINGFACE_API_KEY = os.environ.get('HUGGINGFACE_API_KEY', '')
     
+    # GPT-4 Vision client
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL', '')  # 로컬 스텁 서버 등으로 교체 가능
+    VISION_TIMEOUT = float(os.environ.get('VISION_TIMEOUT', 20))  # 호출 전체 제한 시간 (초)
+    VISION_MAX_RETRIES = int(os.environ.get('VISION_MAX_RETRIES', 2))
+    VISION_MAX_CONCURRENCY = int(os.environ.get('VISION_MAX_CONCURRENCY', 4))
+    VISION_BREAKER_THRESHOLD = int(os.environ.get('VISION_BREAKER_THRESHOLD', 5))  # 연속 실패 횟수
+    VISION_BREAKER_RESET = float(os.environ.get('VISION_BREAKER_RESET', 30))  # 서킷 재시도 대기 (초)
+    VISION_MAX_EDGE = int(os.environ.get('VISION_MAX_EDGE', 1024))  # 페이로드 이미지 최대 변 길이 (픽셀)
+    VISION_JPEG_QUALITY = int(os.environ.get('VISION_JPEG_QUALITY', 85))
+    VISION_MAX_PAYLOAD_BYTES = int(os.environ.get('VISION_MAX_PAYLOAD_BYTES', 300 * 1024))
+    
     # App-specific settings
     APP_NAME = 'Ooops Age'
     APP_DESCRIPTION = 'Upload any image and playfully guess how old it looks - just for fun!'
@@ -39,6 +133,6 @@ class Config:
     FIREBASE_API_KEY = os.environ.get('FIREBASE_API_KEY', '')
     FIREBASE_AUTH_DOMAIN = os.environ.get('FIREBASE_AUTH_DOMAIN', '')
     FIREBASE_PROJECT_ID = os.environ.get('FIREBASE_PROJECT_ID', '')
-    FIREBASE_STORAGE_BUCKET = os.environ.get('FIREBASE_STORAGE_BUCKET', '')
+    FIREBASE_STORAGE_BUCKET = os.environ.get('FIREBASE_STORAGE_BUCKET', '')  # 공개 URL 생성용 버킷 이름
     FIREBASE_MESSAGING_SENDER_ID = os.environ.get('FIREBASE_MESSAGING_SENDER_ID', '')
     FIREBASE_APP_ID = os.environ.get('FIREBASE_APP_ID', '')
@@ -46,6 +46,12 @@ class User(UserMixin, db.Model):
 
 class SkinAnalysis(db.Model):
     """Represents a skin analysis result."""
+    __table_args__ = (
+        # Duplicate-image check in upload(): filter_by(user_id=..., image_hash=...)
+        db.Index('ix_skin_analysis_user_id_image_hash', 'user_id', 'image_hash'),
+        db.Index('ix_skin_analysis_created_at', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), nullable=False)  # UUID string for anonymous user
     user_account_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # Registered user ID
@@ -60,13 +66,62 @@ class SkinAnalysis(db.Model):
     
     @property
     def features(self):
-        """Get the features as a dictionary."""
-        return json.loads(self._features)
+        """Get the features as a dictionary (decoded once per loaded row)."""
+        raw = self._features
+        cached = self.__dict__.get('_decoded_features')
+        if cached is None or cached[0] is not raw:
+            cached = (raw, json.loads(raw))
+            self.__dict__['_decoded_features'] = cached
+        return cached[1]
     
     @features.setter
     def features(self, value):
         """Set the features from a dictionary."""
         self._features = json.dumps(value)
+        self.__dict__.pop('_decoded_features', None)
     
     def __repr__(self):
         return f'<SkinAnalysis {self.id} for user {self.user_id}>'
+
+
+def ensure_indexes(concurrently=None):
+    """
+    Create any model indexes missing from an existing database.
+    
+    db.create_all() only creates indexes together with new tables, so
+    databases created before an index was declared need this pass. It is
+    run as a one-off step (``flask create-indexes``) rather than at worker
+    startup. Must be called inside an application context.
+    
+    Args:
+        concurrently (bool): Use CREATE INDEX CONCURRENTLY so large tables
+            stay writable (PostgreSQL only; defaults to True there)
+    
+    Returns:
+        list: Names of the indexes that were created
+    """
+    engine = db.engine
+    if concurrently is None:
+        concurrently = engine.dialect.name == 'postgresql'
+    
+    created = []
+    inspector = db.inspect(engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if concurrently:
+                # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 autocommit 연결 사용
+                index.dialect_kwargs['postgresql_concurrently'] = True
+                try:
+                    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                        index.create(bind=connection, checkfirst=True)
+                finally:
+                    index.dialect_kwargs['postgresql_concurrently'] = False
+            else:
+                index.create(bind=engine, checkfirst=True)
+            created.append(index.name)
+    return created
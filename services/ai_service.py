@@ -5,13 +5,18 @@ import requests
 import base64
 import os
 import logging
+import random
 import time
 import re
 from io import BytesIO
 from PIL import Image
 import openai
 from services.gpt_vision_analyzer import analyze_skin_with_vision
-from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze
+from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze, is_default_result
+from services.analysis_executor import analysis_executor
+from services.result_cache import AnalysisResultCache, analysis_result_cache
+from utils.image_context import ImageContext, get_analysis_image
+from utils.image_features import channel_statistics, edge_count, pixel_array
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +38,7 @@ def analyze_skin_age(image, user_age=None):
     Now uses enhanced photo analysis system that provides more accurate and varied results.
     
     Args:
-        image (PIL.Image): The image to analyze
+        image (PIL.Image | ImageContext): The image to analyze
         user_age (int, optional): The actual age of the user for more accurate analysis
         
     Returns:
@@ -51,9 +56,31 @@ def analyze_skin_age(image, user_age=None):
         if user_age:
             logger.debug(f"User provided actual age: {user_age}")
         
+        # Results are deterministic per thumbnail content and age, so reuse them across users
+        cache_key = None
+        if isinstance(image, ImageContext):
+            cache_key = AnalysisResultCache.make_key(image.content_hash, user_age)
+            cached = analysis_result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached analysis result")
+                return cached
+        
         # Use the enhanced analyzer that uses actual age for better results
         logger.info("Using enhanced age-aware photo system")
-        return enhanced_analyze(image, user_age)
+        if analysis_executor.enabled:
+            # Run the CPU work in the process pool so concurrent uploads use every core
+            try:
+                result = analysis_executor.analyze(image, user_age)
+            except Exception as e:
+                logger.error(f"Analysis worker failed: {type(e).__name__}: {str(e)}")
+                return get_default_analysis_result()
+        else:
+            result = enhanced_analyze(image, user_age)
+        
+        # 분석 실패 시의 대체 결과는 캐시하지 않음 (다음 요청에서 다시 분석)
+        if cache_key is not None and not is_default_result(result):
+            analysis_result_cache.set(cache_key, result)
+        return result
 
     except Exception as e:
         logger.error(f"Critical error in analyze_skin_age: {str(e)}")
@@ -83,7 +110,7 @@ def analyze_fallback(image, user_age=None):
     Advanced fallback method that uses image-specific characteristics for realistic skin analysis.
     
     Args:
-        image (PIL.Image): The image to analyze
+        image (PIL.Image | ImageContext): The image to analyze
         user_age (int, optional): The actual age of the user for more accurate analysis
         
     Returns:
@@ -97,74 +124,38 @@ def analyze_fallback(image, user_age=None):
             logger.error("Image is None in analyze_fallback")
             return get_default_analysis_result()
             
-        # Convert to RGB if not already
-        try:
-            image = image.convert('RGB')
-        except Exception as e:
-            logger.error(f"Error converting image to RGB: {str(e)}")
-            return get_default_analysis_result()
-        
-        # Resize for analysis
+        # Convert to RGB and resize for analysis (reuses the cached thumbnail for an ImageContext)
         try:
-            image = image.resize((300, 300))
+            image = get_analysis_image(image)
         except Exception as e:
-            logger.error(f"Error resizing image: {str(e)}")
+            logger.error(f"Error preparing image for analysis: {str(e)}")
             return get_default_analysis_result()
             
         # Check if image has data
         try:
-            pixels = list(image.getdata())
-            if not pixels:
-                logger.error("No pixels found in image")
-                return get_default_analysis_result()
-                
-            # Calculate image characteristics
-            pixel_count = len(pixels)
+            pixels = pixel_array(image)
+            pixel_count = pixels.shape[0] * pixels.shape[1]
             if pixel_count == 0:
                 logger.error("Zero pixels in image")
                 return get_default_analysis_result()
-                
-            # Make sure each pixel has RGB values
-            for p in pixels:
-                if len(p) < 3:
-                    logger.error(f"Invalid pixel format: {p}")
-                    return get_default_analysis_result()
             
-            # Color statistics
-            avg_r = sum(p[0] for p in pixels) / pixel_count
-            avg_g = sum(p[1] for p in pixels) / pixel_count
-            avg_b = sum(p[2] for p in pixels) / pixel_count
+            # Make sure each pixel has RGB values
+            if pixels.ndim != 3 or pixels.shape[2] < 3:
+                logger.error(f"Invalid pixel format: {pixels.shape}")
+                return get_default_analysis_result()
             
-            # Color variance for texture information
-            var_r = sum((p[0] - avg_r) ** 2 for p in pixels) / pixel_count
-            var_g = sum((p[1] - avg_g) ** 2 for p in pixels) / pixel_count
-            var_b = sum((p[2] - avg_b) ** 2 for p in pixels) / pixel_count
+            # Color statistics and variance for texture information
+            stats = channel_statistics(pixels)
+            avg_r, avg_g, avg_b = stats['means']
+            var_r, var_g, var_b = stats['variances']
             
             # Image characteristics
             luminance = (0.299 * avg_r + 0.587 * avg_g + 0.114 * avg_b) / 255
             contrast = (var_r + var_g + var_b) / 3 / 255
             contrast_normalized = min(1.0, contrast * 200)
             
-            # Edge detection (simplified)
-            edges = 0
-            for y in range(1, 299):
-                for x in range(1, 299):
-                    # Get the pixel and its neighbors
-                    pixel = image.getpixel((x, y))
-                    pixel_up = image.getpixel((x, y-1))
-                    pixel_down = image.getpixel((x, y+1))
-                    pixel_left = image.getpixel((x-1, y))
-                    pixel_right = image.getpixel((x+1, y))
-                    
-                    # Calculate the difference
-                    diff_up = abs(pixel[0] - pixel_up[0]) + abs(pixel[1] - pixel_up[1]) + abs(pixel[2] - pixel_up[2])
-                    diff_down = abs(pixel[0] - pixel_down[0]) + abs(pixel[1] - pixel_down[1]) + abs(pixel[2] - pixel_down[2])
-                    diff_left = abs(pixel[0] - pixel_left[0]) + abs(pixel[1] - pixel_left[1]) + abs(pixel[2] - pixel_left[2])
-                    diff_right = abs(pixel[0] - pixel_right[0]) + abs(pixel[1] - pixel_right[1]) + abs(pixel[2] - pixel_right[2])
-                    
-                    # If the difference is significant, count it as an edge
-                    if diff_up > 30 or diff_down > 30 or diff_left > 30 or diff_right > 30:
-                        edges += 1
+            # Edge detection (simplified, whole image in one array pass)
+            edges = edge_count(pixels, threshold=30)
             
             # Normalize edges count
             edges_normalized = min(1.0, edges / 5000)
@@ -176,9 +167,9 @@ def analyze_fallback(image, user_age=None):
             img_hash = hashlib.md5(img_bytes.getvalue()).hexdigest()
             
             # Use the hash to generate a random seed that will be consistent for this image
-            import random
+            # (a per-call generator, so concurrent requests never reseed each other)
             seed = int(img_hash[:8], 16)
-            random.seed(seed)
+            rng = random.Random(seed)
             
             # 얼굴 이미지의 특성을 좀 더 면밀하게 분석하여 더 정확한 나이를 추정합니다
             
@@ -208,21 +199,18 @@ def analyze_fallback(image, user_age=None):
             
             # 연령대별 확률 분포 조정
             if hash_value < 20:  # 20% 확률로 10대
-                base_age = random.uniform(16, 19)
+                base_age = rng.uniform(16, 19)
             elif hash_value < 45:  # 25% 확률로 20대
-                base_age = random.uniform(20, 29)
+                base_age = rng.uniform(20, 29)
             elif hash_value < 65:  # 20% 확률로 30대
-                base_age = random.uniform(30, 39)
+                base_age = rng.uniform(30, 39)
             elif hash_value < 80:  # 15% 확률로 40대
-                base_age = random.uniform(40, 49)
+                base_age = rng.uniform(40, 49)
             elif hash_value < 92:  # 12% 확률로 50대
-                base_age = random.uniform(50, 59)
+                base_age = rng.uniform(50, 59)
             else:  # 8% 확률로 60대 이상
-                base_age = random.uniform(60, 70)
+                base_age = rng.uniform(60, 70)
                 
-            # 이미지 해시를 활용하여 같은 사람은 동일한 나이 추정
-            random.seed(int(img_hash[:8], 16))
-            
             # 이제 이미지 특성에 따른 미세 조정을 적용합니다 (미세 조정만 적용)
             
             # 밝기 - 밝은 이미지일수록 젊은 얼굴
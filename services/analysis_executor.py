@@ -0,0 +1,99 @@
+"""
+Process-pool executor for CPU-bound image analysis.
+
+분석 연산을 요청 스레드(GIL) 밖의 워커 프로세스에서 실행하여 여러 코어를
+활용합니다. PIL 객체 대신 300x300 RGB 썸네일의 원시 픽셀 버퍼만 전달합니다.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image
+from config import Config
+from utils.image_context import get_analysis_image
+
+logger = logging.getLogger(__name__)
+
+
+def _analyze_buffer(mode, size, buffer, user_age):
+    """Worker entry point: rebuild the thumbnail from its pixel buffer and analyze it."""
+    from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze
+
+    image = Image.frombytes(mode, size, buffer)
+    return enhanced_analyze(image, user_age)
+
+
+class AnalysisExecutor:
+    """Lazily started ProcessPoolExecutor running the enhanced analyzer."""
+
+    def __init__(self, max_workers=0, timeout=10.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_workers > 0
+
+    def analyze(self, image, user_age=None):
+        """
+        워커 프로세스에서 이미지를 분석합니다.
+
+        Args:
+            image: ImageContext 또는 PIL.Image
+            user_age (int, optional): 사용자의 실제 나이
+
+        Returns:
+            tuple: (estimated_skin_age, features_dict, feedback_text)
+
+        Raises:
+            concurrent.futures.TimeoutError: 분석이 timeout 내에 끝나지 않은 경우
+            Exception: 워커 프로세스 오류
+        """
+        thumbnail = get_analysis_image(image)
+        future = None
+        try:
+            # 워커가 이미 죽은 풀에서는 submit 자체가 BrokenProcessPool을 냄
+            future = self._get_pool().submit(
+                _analyze_buffer, thumbnail.mode, thumbnail.size, thumbnail.tobytes(), user_age
+            )
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            # 워커가 비정상 종료된 경우 다음 요청을 위해 풀을 재생성
+            self._reset_pool()
+            raise
+        except Exception:
+            if future is not None:
+                future.cancel()
+            raise
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn: 웹 서버의 스레드 상태를 fork로 복제하지 않음
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                    logger.info(f"Started analysis process pool with {self.max_workers} workers")
+        return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 인스턴스
+analysis_executor = AnalysisExecutor(Config.ANALYSIS_PROCESS_WORKERS, Config.ANALYSIS_TIMEOUT)
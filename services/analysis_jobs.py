@@ -0,0 +1,181 @@
+"""
+Asynchronous analysis job queue.
+
+업로드 요청은 작업을 큐에 넣고 바로 작업 ID를 반환하며, 로컬 워커 풀이 분석을
+수행합니다. 외부 서비스 없이 동작하도록 작업 상태는 메모리에 보관하고, 선택적으로
+SQLite 파일에 기록하여 여러 웹 워커 프로세스가 상태를 공유할 수 있습니다.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.sqlite_tier import SqliteTier
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+STALE_JOB_ERROR = 'Job was abandoned by a worker that stopped before finishing it'
+
+
+class AnalysisJobQueue:
+    """Runs analysis jobs on a local thread pool and tracks their status."""
+
+    def __init__(self, max_workers=4, db_path=None, max_jobs=10000, job_ttl=24 * 3600, stale_after=15 * 60):
+        self.max_workers = max_workers
+        self.db_path = db_path or None
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self.stale_after = stale_after
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._tier = SqliteTier(
+            self.db_path,
+            "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+            "job_id TEXT PRIMARY KEY, owner TEXT, status TEXT NOT NULL, "
+            "result TEXT, error TEXT, updated_at REAL NOT NULL)",
+            'analysis job'
+        )
+
+    def submit(self, func, *args, owner=None, **kwargs):
+        """
+        작업을 큐에 추가합니다.
+
+        Args:
+            func: 워커에서 실행할 함수 (반환값이 작업 결과가 됨, JSON 직렬화 가능해야 함)
+            owner: 작업 상태를 조회할 수 있는 사용자 ID
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = uuid.uuid4().hex
+        self._update(job_id, owner=owner, status=PENDING)
+        self._prune_db()
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='analysis-job'
+                    )
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """Return the job record as a dict, or None if the job is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+
+            row = self._tier.fetchone(
+                "SELECT owner, status, result, error, updated_at FROM analysis_jobs WHERE job_id = ?",
+                (job_id,)
+            )
+            if row is None:
+                return None
+            job = {
+                'job_id': job_id,
+                'owner': row[0],
+                'status': row[1],
+                'result': json.loads(row[2]) if row[2] is not None else None,
+                'error': row[3],
+                'updated_at': row[4],
+            }
+
+        # 이 프로세스에 없는 대기/실행 중 작업은 다른 워커의 것이므로, 그 워커가 재시작되어
+        # 오래 갱신되지 않았다면 끝나지 않을 작업으로 보고 실패 처리
+        if job['status'] in (PENDING, RUNNING) and self._is_stale(job['updated_at']):
+            logger.warning(f"Analysis job {job_id} was abandoned while {job['status']}")
+            job.update(status=FAILED, error=STALE_JOB_ERROR, updated_at=time.time())
+            self._tier.write((
+                "UPDATE analysis_jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ? AND status IN (?, ?)",
+                (FAILED, STALE_JOB_ERROR, job['updated_at'], job_id, PENDING, RUNNING)
+            ))
+        return job
+
+    def _is_stale(self, updated_at):
+        return bool(self.stale_after) and updated_at < time.time() - self.stale_after
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, status=RUNNING)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {str(e)}")
+            self._update(job_id, status=FAILED, error=str(e))
+        else:
+            self._update(job_id, status=DONE, result=result)
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id) or {
+                'job_id': job_id, 'owner': None, 'status': PENDING, 'result': None, 'error': None,
+            }
+            job.update(fields, updated_at=time.time())
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            self._prune()
+
+            self._tier.write((
+                "INSERT OR REPLACE INTO analysis_jobs (job_id, owner, status, result, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job['owner'], job['status'],
+                 json.dumps(job['result']) if job['result'] is not None else None,
+                 job['error'], job['updated_at'])
+            ))
+
+    def _prune(self):
+        """Drop the oldest finished jobs once more than max_jobs are tracked in memory."""
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id]['status'] in (DONE, FAILED):
+                del self._jobs[job_id]
+
+    def _prune_db(self):
+        """
+        Fail pending/running rows not updated for stale_after, then delete finished and
+        failed rows older than job_ttl from the shared database.
+        """
+        if not self._tier.enabled:
+            return
+        now = time.time()
+        statements = []
+        if self.stale_after:
+            statements.append((
+                "UPDATE analysis_jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status IN (?, ?) AND updated_at < ?",
+                (FAILED, STALE_JOB_ERROR, now, PENDING, RUNNING, now - self.stale_after)
+            ))
+        if self.job_ttl:
+            statements.append((
+                "DELETE FROM analysis_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, now - self.job_ttl)
+            ))
+        if statements:
+            self._tier.write(*statements)
+
+
+# 전역 인스턴스
+analysis_jobs = AnalysisJobQueue(Config.ANALYSIS_JOB_WORKERS, Config.ANALYSIS_JOB_DB,
+                                 job_ttl=Config.ANALYSIS_JOB_TTL,
+                                 stale_after=Config.ANALYSIS_JOB_STALE_AFTER)
@@ -3,32 +3,50 @@
 """
 
 import logging
-import hashlib
 import random
-from io import BytesIO
 from PIL import Image
+from config import Config
+from utils.image_context import ImageContext, get_analysis_image
+from utils.image_features import channel_statistics, legacy_jpeg_digest, pixel_array, pixel_digest
+from utils.memo import memoize
 
 logger = logging.getLogger(__name__)
 
-def get_default_result(user_age=None):
+# 기본 결과 표시용 피드백
+DEFAULT_RESULT_FEEDBACK = "Could not fully analyze skin details, but we've provided an estimate based on available information.\n\n피부 세부 분석에 제한이 있었으나, 가능한 정보를 기반으로 추정치를 제공해 드립니다."
+
+# 피드백을 만들 수 없을 때의 문구
+FEEDBACK_ERROR_TEXT = "Based on our analysis, we've detected some characteristics of your skin. Please consult with a dermatologist for personalized advice.\n\n분석 결과에 따르면 귀하의 피부에서 몇 가지 특성이 감지되었습니다. 개인화된 조언을 위해 피부과 전문의와 상담하세요."
+
+# 피부 나이 - 실제 나이 비교 구간의 상한 (_feedback_template과 같은 순서)
+AGE_DIFF_BOUNDS = (-10, -5, -2, 2, 7)
+
+
+class DefaultResult(tuple):
+    """(skin_age, features, feedback) returned when analysis fails, marked by is_default."""
+
+    is_default = True
+
+
+def get_default_result(user_age=None, seed=None):
     """
     기본 피부 분석 결과를 반환합니다.
     사용자 나이가 제공된 경우 해당 나이와 가까운 추정치를 생성합니다.
+    seed(이미지 해시 기반)가 주어지면 같은 이미지에 항상 같은 ±3세 편차를, 없으면 실제 나이를
+    그대로 사용하므로 호출마다 값이 달라지지 않습니다.
     """
     # 사용자 나이가 제공된 경우 해당 나이와 비슷한 피부 나이 생성
     if user_age is not None:
         try:
             user_age_int = int(user_age)
-            # 사용자 나이에 기반한 피부 나이는 ±3세 범위 내에서 랜덤하게 생성
-            estimated_age = max(18.0, user_age_int + random.uniform(-3, 3))
+            offset = random.Random(seed).uniform(-3, 3) if seed is not None else 0.0
+            estimated_age = max(18.0, user_age_int + offset)
         except (ValueError, TypeError):
             estimated_age = 35.0
     else:
         estimated_age = 35.0
-        
-    feedback = "Could not fully analyze skin details, but we've provided an estimate based on available information.\n\n피부 세부 분석에 제한이 있었으나, 가능한 정보를 기반으로 추정치를 제공해 드립니다."
     
-    return estimated_age, {
+    return DefaultResult((estimated_age, {
         'wrinkles': 0.3,
         'pigmentation': 0.2,
         'elasticity': 0.7,
@@ -38,7 +56,12 @@ def get_default_result(user_age=None):
         'pores': 0.4,
         'dryness': 0.4,
         'oiliness': 0.5
-    }, feedback
+    }, DEFAULT_RESULT_FEEDBACK))
+
+
+def is_default_result(result):
+    """Return True for a get_default_result() value (분석 실패 시의 대체 결과)."""
+    return getattr(result, 'is_default', False)
 
 
 def analyze_skin_age(image, user_age=None):
@@ -46,48 +69,44 @@ def analyze_skin_age(image, user_age=None):
     사용자의 실제 나이를 고려한 맞춤형 뷰티 포토를 제공합니다.
     
     Args:
-        image (PIL.Image): 포토할 이미지
+        image (PIL.Image | ImageContext): 포토할 이미지
         user_age (int, optional): 사용자의 실제 나이 (선택 사항)
         
     Returns:
         tuple: (estimated_beauty_score, features_dict, feedback_text)
     """
+    seed = None
     try:
         # 이미지가 None인지 확인
         if image is None:
             logger.error("Image is None in analyze_skin_age")
             return get_default_result(user_age)
             
-        # RGB로 변환
-        try:
-            image = image.convert('RGB')
-        except Exception as e:
-            logger.error(f"Error converting image to RGB: {str(e)}")
-            return get_default_result(user_age)
+        # ImageContext는 썸네일 픽셀 해시를 이미 계산해 두므로 재사용
+        content_hash = image.content_hash if isinstance(image, ImageContext) else None
         
-        # 분석을 위한 리사이징
+        # RGB 변환 및 분석용 리사이징 (ImageContext인 경우 캐시된 썸네일 사용)
         try:
-            image = image.resize((300, 300))
+            image = get_analysis_image(image)
         except Exception as e:
-            logger.error(f"Error resizing image: {str(e)}")
+            logger.error(f"Error preparing image for analysis: {str(e)}")
             return get_default_result(user_age)
             
         # 이미지 해시 생성 (일관된 결과를 위해)
-        img_bytes = BytesIO()
-        image.save(img_bytes, format='JPEG')
-        img_hash = hashlib.md5(img_bytes.getvalue()).hexdigest()
+        # 기본은 픽셀 버퍼 해시, ANALYZER_LEGACY_SEED 설정 시 기존 JPEG 재인코딩 해시
+        if Config.ANALYZER_LEGACY_SEED:
+            img_hash = legacy_jpeg_digest(image)
+        else:
+            img_hash = content_hash or pixel_digest(image)
         
         # 해시를 사용하여 일관된 랜덤 시드 생성
+        # 전역 random.seed 대신 호출별 인스턴스를 사용해 동시 요청 간 간섭을 방지
         seed = int(img_hash[:8], 16)
-        random.seed(seed)
-        
-        # 기본 이미지 분석
-        pixels = list(image.getdata())
+        rng = random.Random(seed)
         
-        # 기본 이미지 특성 계산
-        avg_r = sum(p[0] for p in pixels) / len(pixels)
-        avg_g = sum(p[1] for p in pixels) / len(pixels)
-        avg_b = sum(p[2] for p in pixels) / len(pixels)
+        # 기본 이미지 특성 계산 (NumPy 버퍼에서 직접 계산)
+        stats = channel_statistics(pixel_array(image))
+        avg_r, avg_g, avg_b = stats['means']
         
         # 사용자 나이 기반 피부 나이 생성
         if user_age is not None:
@@ -98,19 +117,19 @@ def analyze_skin_age(image, user_age=None):
                 # 사용자 실제 나이에 따른 피부 나이 변화 계산
                 if user_age_int < 25:
                     # 젊은 사람: 실제 나이와 가까운 피부 나이
-                    variation = random.uniform(-2, 5)
+                    variation = rng.uniform(-2, 5)
                     base_factor = 0.9  # 대체로 젊어 보이는 경향
                 elif user_age_int < 40:
                     # 젊은 성인: 더 많은 변화
-                    variation = random.uniform(-7, 7)
+                    variation = rng.uniform(-7, 7)
                     base_factor = 0.95
                 elif user_age_int < 60:
                     # 중년: 더 넓은 변화
-                    variation = random.uniform(-10, 15)
+                    variation = rng.uniform(-10, 15)
                     base_factor = 1.05  # 약간 늙어 보이는 경향
                 else:
                     # 노년: 가장 넓은 변화
-                    variation = random.uniform(-15, 10)
+                    variation = rng.uniform(-15, 10)
                     base_factor = 1.1  # 실제 나이보다 젊게 보이는 경향이 높음
                 
                 # 이미지 특성을 적용하여 변화에 영향
@@ -130,10 +149,10 @@ def analyze_skin_age(image, user_age=None):
             except (ValueError, TypeError):
                 logger.warning(f"Invalid user_age format: {user_age}, using default estimation")
                 # 사용자 나이가 유효하지 않은 경우 이미지 기반 추정으로 대체
-                estimated_age = 30 + random.uniform(-5, 15) + (int(img_hash[1], 16) / 16.0) * 20
+                estimated_age = 30 + rng.uniform(-5, 15) + (int(img_hash[1], 16) / 16.0) * 20
         else:
             # 사용자 나이가 제공되지 않은 경우 이미지 해시 기반 다양한 추정치 생성
-            estimated_age = 30 + random.uniform(-5, 15) + (int(img_hash[1], 16) / 16.0) * 20
+            estimated_age = 30 + rng.uniform(-5, 15) + (int(img_hash[1], 16) / 16.0) * 20
         
         # 추정된 피부 나이와 이미지 특성을 기반으로 특성 생성
         wrinkle_base = min(1.0, max(0.1, (estimated_age - 20) / 60))
@@ -165,7 +184,41 @@ def analyze_skin_age(image, user_age=None):
             
     except Exception as e:
         logger.error(f"Error in enhanced analyze_skin_age: {str(e)}")
-        return get_default_result(user_age)
+        return get_default_result(user_age, seed)
+
+
+def _feedback_template_key(estimated_age, features, user_age=None):
+    """
+    _feedback_template 결과를 결정하는 값만 담은 키.
+    
+    피드백 문장은 나이 구간(25세 미만/45세 초과)별 임계값, 실제 나이와의 차이 구간,
+    (특성 순서대로) 각 특성이 임계값을 넘는지 여부로만 정해집니다. 피부 나이와 나이 차이
+    숫자는 generate_personalized_feedback이 호출마다 채우므로 키에 넣지 않습니다.
+    """
+    try:
+        age = int(user_age) if user_age is not None else None
+    except (ValueError, TypeError):
+        age = None
+    
+    threshold = 0.5
+    if estimated_age > 45:
+        threshold = 0.6
+    elif estimated_age < 25:
+        threshold = 0.4
+    
+    diff_band = None
+    if age is not None:
+        age_diff = estimated_age - age
+        diff_band = next((band for band, bound in enumerate(AGE_DIFF_BOUNDS) if age_diff <= bound),
+                         len(AGE_DIFF_BOUNDS))
+    
+    flags = []
+    for feature, value in features.items():
+        if feature in ('wrinkles', 'pigmentation', 'dark_spots', 'dryness', 'pores'):
+            flags.append((feature, value > threshold))
+        elif feature in ('elasticity', 'moisture'):
+            flags.append((feature, value < (1 - threshold)))
+    return threshold, diff_band, tuple(flags)
 
 
 def generate_personalized_feedback(estimated_age, features, user_age=None):
@@ -180,6 +233,29 @@ def generate_personalized_feedback(estimated_age, features, user_age=None):
     Returns:
         str: 영어와 한국어로 된 맞춤형 피드백
     """
+    try:
+        age_diff = 0
+        if user_age is not None:
+            try:
+                age_diff = estimated_age - int(user_age)
+            except (ValueError, TypeError):
+                pass
+        return _feedback_template(estimated_age, features, user_age).format(
+            age=f"{estimated_age:.1f}", diff=f"{abs(age_diff):.1f}"
+        )
+    except Exception as e:
+        logger.error(f"Error generating personalized feedback: {str(e)}")
+        return FEEDBACK_ERROR_TEXT
+
+
+@memoize(_feedback_template_key)
+def _feedback_template(estimated_age, features, user_age=None):
+    """
+    피부 나이와 나이 차이 자리를 {age}/{diff}로 남긴 맞춤형 피드백을 생성합니다.
+    
+    Returns:
+        str: str.format(age=..., diff=...)으로 채울 영어/한국어 피드백
+    """
     try:
         # 실제 나이와 피부 나이 비교 문구
         age_diff = 0
@@ -190,22 +266,22 @@ def generate_personalized_feedback(estimated_age, features, user_age=None):
                 age_diff = estimated_age - user_age_int
                 
                 if age_diff <= -10:
-                    age_statement = f"Your skin appears significantly younger than your chronological age (by about {abs(age_diff):.1f} years). "
+                    age_statement = f"Your skin appears significantly younger than your chronological age (by about {{diff}} years). "
                 elif age_diff <= -5:
-                    age_statement = f"Your skin appears younger than your chronological age (by about {abs(age_diff):.1f} years). "
+                    age_statement = f"Your skin appears younger than your chronological age (by about {{diff}} years). "
                 elif age_diff <= -2:
                     age_statement = f"Your skin appears slightly younger than your chronological age. "
                 elif age_diff <= 2:
                     age_statement = f"Your skin age closely matches your chronological age. "
                 elif age_diff <= 7:
-                    age_statement = f"Your skin appears slightly older than your chronological age (by about {age_diff:.1f} years). "
+                    age_statement = f"Your skin appears slightly older than your chronological age (by about {{diff}} years). "
                 else:
-                    age_statement = f"Your skin appears older than your chronological age (by about {age_diff:.1f} years). "
+                    age_statement = f"Your skin appears older than your chronological age (by about {{diff}} years). "
             except (ValueError, TypeError):
                 age_statement = ""
         
         # 영어 피드백
-        en_feedback = f"Based on our analysis, your skin age appears to be around {estimated_age:.1f}. "
+        en_feedback = f"Based on our analysis, your skin age appears to be around {{age}}. "
         en_feedback += age_statement
         
         # 주요 문제점 파악 - 특성 값에 따라 더 동적으로
@@ -250,7 +326,7 @@ def generate_personalized_feedback(estimated_age, features, user_age=None):
         en_feedback += "Regular skincare routine and sun protection are recommended for maintaining skin health."
         
         # 한국어 피드백 (더 개인화)
-        ko_feedback = f"분석 결과, 귀하의 피부 나이는 약 {estimated_age:.1f}세로 추정됩니다. "
+        ko_feedback = f"분석 결과, 귀하의 피부 나이는 약 {{age}}세로 추정됩니다. "
         
         # 한국어로 나이 비교 추가
         if user_age is not None:
@@ -259,17 +335,17 @@ def generate_personalized_feedback(estimated_age, features, user_age=None):
                 age_diff = estimated_age - user_age_int
                 
                 if age_diff <= -10:
-                    ko_feedback += f"귀하의 피부는 실제 나이보다 상당히 젊어 보입니다 (약 {abs(age_diff):.1f}세 차이). "
+                    ko_feedback += f"귀하의 피부는 실제 나이보다 상당히 젊어 보입니다 (약 {{diff}}세 차이). "
                 elif age_diff <= -5:
-                    ko_feedback += f"귀하의 피부는 실제 나이보다 젊어 보입니다 (약 {abs(age_diff):.1f}세 차이). "
+                    ko_feedback += f"귀하의 피부는 실제 나이보다 젊어 보입니다 (약 {{diff}}세 차이). "
                 elif age_diff <= -2:
                     ko_feedback += f"귀하의 피부는 실제 나이보다 조금 젊어 보입니다. "
                 elif age_diff <= 2:
                     ko_feedback += f"귀하의 피부 나이는 실제 나이와 거의 일치합니다. "
                 elif age_diff <= 7:
-                    ko_feedback += f"귀하의 피부는 실제 나이보다 약간 늙어 보입니다 (약 {age_diff:.1f}세 차이). "
+                    ko_feedback += f"귀하의 피부는 실제 나이보다 약간 늙어 보입니다 (약 {{diff}}세 차이). "
                 else:
-                    ko_feedback += f"귀하의 피부는 실제 나이보다 늙어 보입니다 (약 {age_diff:.1f}세 차이). "
+                    ko_feedback += f"귀하의 피부는 실제 나이보다 늙어 보입니다 (약 {{diff}}세 차이). "
             except (ValueError, TypeError):
                 pass
         
@@ -305,4 +381,4 @@ def generate_personalized_feedback(estimated_age, features, user_age=None):
         
     except Exception as e:
         logger.error(f"Error generating personalized feedback: {str(e)}")
-        return "Based on our analysis, we've detected some characteristics of your skin. Please consult with a dermatologist for personalized advice.\n\n분석 결과에 따르면 귀하의 피부에서 몇 가지 특성이 감지되었습니다. 개인화된 조언을 위해 피부과 전문의와 상담하세요."
\ No newline at end of file
+        return FEEDBACK_ERROR_TEXT
\ No newline at end of file
@@ -8,9 +8,15 @@ import base64
 import logging
 import re
 import json
+import threading
+from collections import OrderedDict
 from io import BytesIO
 import openai
 from PIL import Image
+from config import Config
+from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze
+from services.vision_client import RETRYABLE_ERRORS, VisionUnavailableError, get_vision_client
+from utils.image_context import ImageContext
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +25,76 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 openai.api_key = OPENAI_API_KEY
 
 
+# 이미지별로 인코딩된 페이로드 캐시 (재시도/재분석 시 재인코딩 방지)
+_payload_cache = OrderedDict()
+_payload_cache_lock = threading.Lock()
+PAYLOAD_CACHE_SIZE = 128
+
+
+def prepare_vision_payload(image):
+    """
+    Vision API로 보낼 크기 제한된 base64 JPEG 페이로드를 생성합니다.
+    
+    The image is downscaled so its longest edge is at most VISION_MAX_EDGE
+    and encoded at VISION_JPEG_QUALITY. The quality is lowered step by step
+    until the JPEG fits VISION_MAX_PAYLOAD_BYTES.
+    Payloads for an ImageContext are cached by its content hash.
+    
+    Args:
+        image (PIL.Image | ImageContext): 원본 이미지
+        
+    Returns:
+        str: base64로 인코딩된 JPEG
+    """
+    cache_key = None
+    original_bytes = None
+    if isinstance(image, ImageContext):
+        cache_key = (image.content_hash, Config.VISION_MAX_EDGE,
+                     Config.VISION_JPEG_QUALITY, Config.VISION_MAX_PAYLOAD_BYTES)
+        with _payload_cache_lock:
+            if cache_key in _payload_cache:
+                _payload_cache.move_to_end(cache_key)
+                return _payload_cache[cache_key]
+        original_bytes = image.size_bytes
+        image = image.image
+    
+    image = image.convert('RGB')
+    if max(image.size) > Config.VISION_MAX_EDGE:
+        # thumbnail()은 비율을 유지하며 제자리에서 축소
+        image = image.copy()
+        image.thumbnail((Config.VISION_MAX_EDGE, Config.VISION_MAX_EDGE), Image.LANCZOS)
+    
+    quality = Config.VISION_JPEG_QUALITY
+    while True:
+        img_byte_arr = BytesIO()
+        image.save(img_byte_arr, format='JPEG', quality=quality, optimize=True)
+        if img_byte_arr.tell() <= Config.VISION_MAX_PAYLOAD_BYTES or quality <= 40:
+            break
+        quality -= 10
+    
+    payload_bytes = img_byte_arr.tell()
+    if original_bytes:
+        logger.info(f"Vision payload: {payload_bytes // 1024}KB at {image.size[0]}x{image.size[1]}, "
+                    f"q={quality} (saved {max(0, original_bytes - payload_bytes) // 1024}KB vs upload)")
+    else:
+        logger.info(f"Vision payload: {payload_bytes // 1024}KB at {image.size[0]}x{image.size[1]}, q={quality}")
+    
+    base64_image = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
+    
+    if cache_key is not None:
+        with _payload_cache_lock:
+            _payload_cache[cache_key] = base64_image
+            while len(_payload_cache) > PAYLOAD_CACHE_SIZE:
+                _payload_cache.popitem(last=False)
+    return base64_image
+
+
 def analyze_skin_with_vision(image, user_age=None):
     """
     GPT-4 Vision API를 사용하여 피부 분석을 수행합니다.
     
     Args:
-        image (PIL.Image): 분석할 이미지
+        image (PIL.Image | ImageContext): 분석할 이미지
         user_age (int, optional): 사용자의 실제 나이 (선택 사항)
         
     Returns:
@@ -47,11 +117,12 @@ def analyze_skin_with_vision(image, user_age=None):
             logger.warning("No OpenAI API key available, using fallback analysis")
             return get_default_result()
             
-        # 이미지를 base64로 변환
-        img_byte_arr = BytesIO()
-        image.save(img_byte_arr, format='JPEG')
-        img_byte_arr.seek(0)
-        base64_image = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
+        # 크기 제한된 JPEG로 변환 후 base64 인코딩 (이미지별 캐시)
+        base64_image = prepare_vision_payload(image)
+        
+        # 업스트림 장애 시 로컬 분석기로 우회할 수 있도록 원본 이미지 유지
+        if isinstance(image, ImageContext):
+            image = image.image
         
         # GPT-4 Vision API용 프롬프트 구성
         prompt = f"""
@@ -95,7 +166,8 @@ Format your response in valid JSON exactly like this:
         # OpenAI API 호출
         try:
             # 2024년 5월 기준 최신 모델인 gpt-4o로 업데이트
-            gpt_response = openai.chat.completions.create(
+            # 공유 클라이언트: 제한 시간, 재시도, 동시 호출 제한, 서킷 브레이커 적용
+            gpt_response = get_vision_client().create_completion(
                 model="gpt-4o", # gpt-4-vision-preview는 더 이상 사용되지 않음 
                 messages=[
                     {
@@ -165,6 +237,12 @@ Format your response in valid JSON exactly like this:
                     logger.error(f"Error extracting data with regex: {str(extraction_error)}")
                     return get_default_result()
                 
+        except (VisionUnavailableError, *RETRYABLE_ERRORS) as unavailable:
+            # 업스트림 장애 (서킷 열림, 제한 시간 초과, 재시도 소진) 시 로컬 분석기로 우회
+            logger.warning(f"GPT-4 Vision unavailable ({type(unavailable).__name__}: {str(unavailable)}), "
+                           f"using enhanced analyzer")
+            return enhanced_analyze(image, user_age)
+            
         except Exception as api_error:
             logger.error(f"Error calling GPT-4 Vision API: {str(api_error)}")
             return get_default_result()
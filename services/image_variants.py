@@ -0,0 +1,111 @@
+"""
+Resized image variants for serving uploads.
+
+업로드 원본 대신 용도별로 축소한 이미지(썸네일, 결과 페이지용)를 처음 요청될 때 생성해
+디스크에 캐시하고, 브라우저가 지원하면 WebP/AVIF로 제공합니다.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from PIL import Image, features
+from werkzeug.http import parse_accept_header
+from utils.files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# 변형 이름 -> 최대 변 길이 (None은 원본)
+VARIANT_SIZES = {
+    'thumb': 200,
+    'results': 600,
+    'original': None,
+}
+
+# 선호 순서대로: (MIME 타입, PIL 포맷, 확장자, 저장 옵션)
+_FORMATS = [
+    ('image/avif', 'AVIF', 'avif', {'quality': 60}),
+    ('image/webp', 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+]
+_JPEG = ('image/jpeg', 'JPEG', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True})
+
+_SUPPORTED_FORMATS = [fmt for fmt in _FORMATS if features.check(fmt[1].lower())]
+
+# 출력 경로별 생성 잠금 (경로 -> [Lock, 대기 중인 요청 수])
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def negotiate_format(accept_header):
+    """
+    Accept 헤더와 Pillow 지원 여부에 따라 변형 이미지 포맷을 선택합니다.
+
+    명시적으로 나열되고 q > 0인 포맷 중 q가 가장 높은 것을 고르며, 같으면 AVIF, WebP 순입니다.
+    와일드카드(image/*, */*)는 AVIF/WebP 지원으로 보지 않습니다.
+
+    Returns:
+        tuple: (mime_type, pil_format, extension, save_options)
+    """
+    accepted = {value.lower(): quality for value, quality in parse_accept_header(accept_header or '')}
+    best, best_quality = _JPEG, 0
+    for fmt in _SUPPORTED_FORMATS:
+        quality = accepted.get(fmt[0], 0)
+        if quality > best_quality:
+            best, best_quality = fmt, quality
+    return best
+
+
+@contextmanager
+def _path_lock(path):
+    """Serialize generation of one output path without blocking other variants."""
+    with _path_locks_guard:
+        entry = _path_locks.setdefault(path, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _path_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _path_locks[path]
+
+
+def get_variant_path(source_path, variant, accept_header=None):
+    """
+    요청된 변형 이미지 경로를 반환합니다. 없으면 생성합니다.
+
+    Args:
+        source_path (str): 원본 이미지 경로
+        variant (str): VARIANT_SIZES의 키
+        accept_header (str, optional): 요청의 Accept 헤더
+
+    Returns:
+        tuple: (path, mime_type) - 원본 요청이면 원본 경로와 None
+    """
+    max_edge = VARIANT_SIZES[variant]
+    if max_edge is None:
+        return source_path, None
+
+    mime_type, pil_format, extension, save_options = negotiate_format(accept_header)
+    folder = os.path.join(os.path.dirname(source_path), 'variants', variant)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    path = os.path.join(folder, f"{stem}.{extension}")
+
+    if not os.path.exists(path):
+        with _path_lock(path):
+            if not os.path.exists(path):
+                _render_variant(source_path, path, max_edge, pil_format, save_options)
+    return path, mime_type
+
+
+def _render_variant(source_path, path, max_edge, pil_format, save_options):
+    with Image.open(source_path) as source:
+        source.draft('RGB', (max_edge, max_edge))  # JPEG는 디코딩 단계에서 미리 축소
+        image = source.convert('RGB')
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    # 동시 요청이 반쯤 쓰인 파일을 읽지 않도록 원자적으로 기록
+    with atomic_write(path) as f:
+        image.save(f, format=pil_format, **save_options)
+    logger.debug(f"Generated image variant {path}")
@@ -0,0 +1,216 @@
+"""
+Local product catalog used when the shopping APIs are unavailable.
+
+JSON / CSV / SQLite 파일에서 사전 선별된 제품 목록을 읽어 다음을 미리 계산합니다.
+- SKIN_ISSUE_MAPPING의 키워드/성분 -> 제품 번호 역색인
+- 제품 x 피부 문제(9개) 관련도 행렬 (특성 벡터와의 곱으로 점수 계산)
+- 민감 피부 제외 마스크 (avoid_sensitive 성분 포함 여부)와 제공자별 마스크
+따라서 검색은 네트워크 호출 없이 NumPy 연산 몇 번으로 끝납니다.
+"""
+
+import csv
+import json
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# CSV/SQLite에서 목록 컬럼(성분, 키워드)의 구분자
+LIST_SEPARATOR = ';'
+
+# 검색 점수에서 평점이 차지하는 비중 (일치도가 같을 때 평점 순)
+RATING_WEIGHT = 0.01
+
+
+def _normalize(term):
+    return str(term).strip().lower()
+
+
+def _as_list(value):
+    """Accept a list, a JSON array string or a ';'-separated string."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value if str(item).strip()]
+    value = str(value).strip()
+    if value.startswith('['):
+        try:
+            return _as_list(json.loads(value))
+        except ValueError:
+            pass
+    return [_normalize(item) for item in value.split(LIST_SEPARATOR) if item.strip()]
+
+
+def read_products(path: str) -> List[Dict]:
+    """
+    카탈로그 파일을 제품 dict 목록으로 읽습니다.
+
+    Args:
+        path (str): .json (목록 또는 {"products": [...]}), .csv, .sqlite/.db (products 테이블)
+
+    Returns:
+        list: 제품 dict 목록
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('products', []) if isinstance(data, dict) else data
+    if ext == '.csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+    if ext in ('.sqlite', '.sqlite3', '.db'):
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            db.row_factory = sqlite3.Row
+            return [dict(row) for row in db.execute("SELECT * FROM products")]
+        finally:
+            db.close()
+    raise ValueError(f"Unsupported product catalog format: {path}")
+
+
+class ProductCatalog:
+    """In-memory product catalog with an inverted index and vectorized scoring."""
+
+    def __init__(self, products: List[Dict], issue_mapping: Dict[str, Dict]):
+        """
+        Args:
+            products (list): 제품 dict 목록 (title, brand, price, rating, review_count, source,
+                ingredients, keywords 등)
+            issue_mapping (dict): SkinAnalysisMapper.SKIN_ISSUE_MAPPING
+        """
+        self.feature_names = tuple(issue_mapping)
+        self.products = []
+        product_terms = []
+        for item in products:
+            product = dict(item)
+            try:
+                product['rating'] = float(product.get('rating') or 0)
+                product['review_count'] = int(product.get('review_count') or 0)
+            except (TypeError, ValueError):
+                logger.warning(f"Skipping catalog product with invalid rating: {product.get('title')}")
+                continue
+            product['source'] = _normalize(product.get('source', ''))
+            product['ingredients'] = _as_list(product.get('ingredients'))
+            product['keywords'] = _as_list(product.get('keywords'))
+            self.products.append(product)
+            product_terms.append(set(product['ingredients']) | set(product['keywords']))
+
+        # 피부 문제별 관련 용어 (키워드 + 성분 + 민감 피부 대안)
+        self.issue_terms = [
+            {_normalize(term) for key in ('keywords', 'ingredients', 'alternative_sensitive')
+             for term in issue_mapping[name].get(key, [])}
+            for name in self.feature_names
+        ]
+        avoid = {_normalize(term) for mapping in issue_mapping.values()
+                 for term in mapping.get('avoid_sensitive', [])}
+        mapped_terms = set().union(*self.issue_terms) if self.issue_terms else set()
+
+        count = len(self.products)
+        # 관련도 행렬: 피부 문제 용어 중 제품이 가진 비율
+        self.relevance = np.zeros((count, len(self.feature_names)), dtype=np.float32)
+        index = {}
+        for row, terms in enumerate(product_terms):
+            for column, issue_terms in enumerate(self.issue_terms):
+                if issue_terms:
+                    self.relevance[row, column] = len(terms & issue_terms) / len(issue_terms)
+            for term in terms & mapped_terms:
+                index.setdefault(term, []).append(row)
+        self.index = {term: np.array(rows, dtype=np.intp) for term, rows in index.items()}
+
+        self.ratings = np.array([p['rating'] for p in self.products], dtype=np.float32)
+        self.sensitive_mask = np.array([bool(terms & avoid) for terms in product_terms], dtype=bool)
+        self.source_masks = {
+            source: np.array([p['source'] == source for p in self.products], dtype=bool)
+            for source in {p['source'] for p in self.products}
+        }
+
+    @classmethod
+    def load(cls, path: Optional[str], issue_mapping: Dict[str, Dict]) -> 'ProductCatalog':
+        """Load a catalog file, returning an empty catalog when it is missing or unreadable."""
+        if not path or not os.path.exists(path):
+            if path:
+                logger.warning(f"Product catalog not found at {path}, fallback products disabled")
+            return cls([], issue_mapping)
+        try:
+            products = read_products(path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error(f"Could not load product catalog {path}: {e}")
+            return cls([], issue_mapping)
+        catalog = cls(products, issue_mapping)
+        logger.info(f"Loaded {len(catalog)} catalog products from {path}")
+        return catalog
+
+    def __len__(self):
+        return len(self.products)
+
+    def search(self, keywords: List[str], source: Optional[str] = None, k: int = 6,
+               is_sensitive: bool = False) -> List[Dict]:
+        """
+        키워드와 일치하는 제품 중 상위 k개를 반환합니다.
+
+        점수 = 직접 일치한 키워드 수 + 키워드가 가리키는 피부 문제와의 관련도 + 평점 가중치
+
+        Args:
+            keywords (list): SkinAnalysisMapper.generate_keywords 결과
+            source (str): 'coupang' / 'amazon' (None이면 전체)
+            k (int): 반환할 제품 수
+            is_sensitive (bool): True면 avoid_sensitive 성분이 든 제품 제외
+
+        Returns:
+            list: 제품 dict 사본 (점수 순)
+        """
+        terms = [_normalize(keyword) for keyword in keywords]
+        postings = [self.index[term] for term in terms if term in self.index]
+        if not postings:
+            return []
+
+        hits = np.zeros(len(self.products), dtype=np.float32)
+        np.add.at(hits, np.concatenate(postings), 1.0)
+
+        # 키워드가 속한 피부 문제 벡터
+        query = np.array([sum(term in issue_terms for term in terms) for issue_terms in self.issue_terms],
+                         dtype=np.float32)
+        scores = hits + self.relevance @ query + RATING_WEIGHT * self.ratings
+        return self._top_k(scores, hits > 0, source, k, is_sensitive)
+
+    def recommend(self, features: Dict[str, float], source: Optional[str] = None, k: int = 6,
+                  is_sensitive: bool = False) -> List[Dict]:
+        """
+        9개 피부 특성 벡터와의 관련도로 상위 k개 제품을 반환합니다.
+
+        Args:
+            features (dict): 피부 문제 이름 -> 0~1 점수
+
+        Returns:
+            list: 제품 dict 사본 (점수 순)
+        """
+        vector = np.array([float(features.get(name, 0) or 0) for name in self.feature_names],
+                          dtype=np.float32)
+        relevance = self.relevance @ vector
+        scores = relevance + RATING_WEIGHT * self.ratings
+        return self._top_k(scores, relevance > 0, source, k, is_sensitive)
+
+    def _top_k(self, scores, mask, source, k, is_sensitive):
+        if source is not None:
+            source_mask = self.source_masks.get(source)
+            if source_mask is None:
+                return []
+            mask = mask & source_mask
+        if is_sensitive:
+            mask = mask & ~self.sensitive_mask
+
+        candidates = np.flatnonzero(mask)
+        if not len(candidates) or k <= 0:
+            return []
+        candidate_scores = scores[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+            candidates, candidate_scores = candidates[top], candidate_scores[top]
+        # 점수 내림차순, 같으면 카탈로그 순서 유지
+        order = np.lexsort((candidates, -candidate_scores))
+        return [dict(self.products[row]) for row in candidates[order]]
@@ -5,12 +5,19 @@ Product Recommendation Service
 
 import os
 import json
+import functools
 import time
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from config import Config
+from services.product_catalog import ProductCatalog
+from services.rate_limiter import ApiRateLimiter
+from services.recommendation_cache import RecommendationCache
 
 logger = logging.getLogger(__name__)
 
@@ -89,40 +96,55 @@ class SkinAnalysisMapper:
         }
     }
     
+    @staticmethod
+    def _keywords_key(issue_mapping: Dict[str, Dict], features: Dict[str, float],
+                      user_age: int = None, is_sensitive: bool = False) -> Tuple:
+        """
+        generate_keywords 결과를 결정하는 값만 담은 키.
+        
+        키워드는 임계값(0.6)을 넘는 피부 문제의 점수 순서, 나이 구간, 민감 피부 여부에만 의존합니다.
+        """
+        ranked = sorted(features.items(), key=lambda x: x[1], reverse=True)
+        issues = tuple(issue for issue, score in ranked if score > 0.6 and issue in issue_mapping)
+        age_group = None
+        if user_age:
+            age_group = 40 if user_age >= 40 else 30 if user_age >= 30 else 0
+        return issues, age_group, bool(is_sensitive)
+    
     @classmethod
     def generate_keywords(cls, features: Dict[str, float], user_age: int = None, 
                          is_sensitive: bool = False) -> List[str]:
         """피부 분석 결과를 기반으로 검색 키워드 생성"""
+        key = cls._keywords_key(cls.SKIN_ISSUE_MAPPING, features, user_age, is_sensitive)
+        return list(cls._keywords_for(*key))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=Config.DERIVED_CACHE_SIZE)
+    def _keywords_for(cls, issues: Tuple[str, ...], age_group: Optional[int],
+                      is_sensitive: bool) -> Tuple[str, ...]:
+        """_keywords_key로 정규화한 입력에서 키워드를 만듭니다 (결과는 키별로 캐시)."""
         keywords = []
-        priority_issues = []
-        
-        # 높은 수치의 문제들을 우선순위로 정렬
-        sorted_features = sorted(features.items(), key=lambda x: x[1], reverse=True)
-        
-        for issue, score in sorted_features:
-            if score > 0.6:  # 임계값 이상인 문제들만 처리
-                priority_issues.append((issue, score))
-                
-                if issue in cls.SKIN_ISSUE_MAPPING:
-                    mapping = cls.SKIN_ISSUE_MAPPING[issue]
-                    
-                    if is_sensitive and mapping['avoid_sensitive']:
-                        # 민감 피부용 대안 키워드 사용
-                        keywords.extend(mapping['alternative_sensitive'])
-                    else:
-                        keywords.extend(mapping['keywords'])
         
-        # 나이별 추가 키워드
-        if user_age:
-            if user_age >= 40:
-                keywords.extend(['anti-aging', 'mature skin', '안티에이징'])
-            elif user_age >= 30:
-                keywords.extend(['prevention', 'early anti-aging', '예방'])
+        # 높은 수치의 문제들부터 (점수 순)
+        for issue in issues:
+            mapping = cls.SKIN_ISSUE_MAPPING[issue]
+            
+            if is_sensitive and mapping['avoid_sensitive']:
+                # 민감 피부용 대안 키워드 사용
+                keywords.extend(mapping['alternative_sensitive'])
             else:
-                keywords.extend(['basic care', '기초케어'])
+                keywords.extend(mapping['keywords'])
+        
+        # 나이별 추가 키워드
+        if age_group == 40:
+            keywords.extend(['anti-aging', 'mature skin', '안티에이징'])
+        elif age_group == 30:
+            keywords.extend(['prevention', 'early anti-aging', '예방'])
+        elif age_group is not None:
+            keywords.extend(['basic care', '기초케어'])
         
         # 중복 제거 후 상위 10개 키워드만 반환
-        return list(dict.fromkeys(keywords))[:10]
+        return tuple(dict.fromkeys(keywords))[:10]
 
 class ProductRecommendationEngine:
     """제품 추천 엔진 - API 연동 준비된 구조"""
@@ -135,14 +157,42 @@ class ProductRecommendationEngine:
         self.amazon_secret_key = os.environ.get('AMAZON_SECRET_KEY')
         self.amazon_associate_tag = os.environ.get('AMAZON_ASSOCIATE_TAG')
         
-        # 캐시 설정
-        self.cache = {}
-        self.cache_duration = timedelta(hours=6)  # 6시간 캐시
+        # 캐시 설정 (크기/TTL 제한, 선택적으로 워커 간 공유되는 SQLite 계층)
+        self.cache_duration = timedelta(seconds=Config.RECOMMENDATION_CACHE_TTL)
+        self.cache = RecommendationCache(
+            max_entries=Config.RECOMMENDATION_CACHE_SIZE,
+            ttl=self.cache_duration.total_seconds(),
+            db_path=Config.RECOMMENDATION_CACHE_DB
+        )
         
-        # API 호출 제한 설정
-        self.api_call_limit = 1000  # 일일 호출 제한
-        self.daily_calls = 0
-        self.last_reset = datetime.now().date()
+        # 제공자별 검색 어댑터 엔드포인트와 제한 시간 (로컬 가짜 서버로 테스트 가능)
+        self.api_endpoints = {
+            'coupang': Config.COUPANG_API_URL,
+            'amazon': Config.AMAZON_API_URL,
+        }
+        self.provider_timeouts = {
+            'coupang': Config.COUPANG_API_TIMEOUT,
+            'amazon': Config.AMAZON_API_TIMEOUT,
+        }
+        self._sessions = {}
+        self._session_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.PRODUCT_SEARCH_WORKERS, thread_name_prefix='product-search'
+        )
+        
+        # API 호출 제한 설정 (제공자별 토큰 버킷 + 전체 일일 한도, 선택적으로 워커 간 공유)
+        self.api_call_limit = Config.PRODUCT_API_DAILY_LIMIT  # 일일 호출 제한
+        self.rate_limiter = ApiRateLimiter(
+            limits={
+                'coupang': (Config.COUPANG_API_RATE, Config.COUPANG_API_BURST),
+                'amazon': (Config.AMAZON_API_RATE, Config.AMAZON_API_BURST),
+            },
+            daily_limit=self.api_call_limit,
+            db_path=Config.PRODUCT_API_USAGE_DB
+        )
+        
+        # API 대체용 로컬 제품 카탈로그 (역색인/점수 행렬은 로드 시 한 번 계산)
+        self.catalog = ProductCatalog.load(Config.PRODUCT_CATALOG_PATH, SkinAnalysisMapper.SKIN_ISSUE_MAPPING)
         
     def is_api_available(self, source: str) -> bool:
         """API 사용 가능 여부 확인"""
@@ -153,120 +203,152 @@ class ProductRecommendationEngine:
         return False
     
     def get_cache_key(self, keywords: List[str], source: str) -> str:
-        """캐시 키 생성"""
-        return f"{source}_{hash('_'.join(sorted(keywords)))}"
-    
-    def is_cache_valid(self, cache_entry: Dict) -> bool:
-        """캐시 유효성 확인"""
-        if not cache_entry:
-            return False
-        cache_time = datetime.fromisoformat(cache_entry['timestamp'])
-        return datetime.now() - cache_time < self.cache_duration
+        """캐시 키 생성 (프로세스 간 동일)"""
+        return RecommendationCache.make_key(keywords, source)
     
-    def reset_daily_limit_if_needed(self):
-        """일일 제한 리셋"""
-        today = datetime.now().date()
-        if today > self.last_reset:
-            self.daily_calls = 0
-            self.last_reset = today
+    def get_api_usage(self) -> Dict:
+        """API 사용량 조회 (모니터링용)"""
+        return self.rate_limiter.usage()
     
-    def search_coupang_products(self, keywords: List[str]) -> List[ProductRecommendation]:
+    def search_coupang_products(self, keywords: List[str], is_sensitive: bool = False,
+                                features: Optional[Dict[str, float]] = None) -> List[ProductRecommendation]:
         """쿠팡 제품 검색 (API 연동 준비)"""
         logger.info(f"Searching Coupang products for keywords: {keywords}")
         
+        # 검색 어댑터가 없으면 한도/캐시를 건드리지 않고 카탈로그로 대체
+        if not self.api_endpoints.get('coupang'):
+            logger.warning("Coupang search endpoint not configured")
+            return self._get_fallback_products('coupang', keywords, is_sensitive, features)
+        
         if not self.is_api_available('coupang'):
             logger.warning("Coupang API credentials not available")
-            return self._get_fallback_products('coupang', keywords)
+            return self._get_fallback_products('coupang', keywords, is_sensitive, features)
         
         cache_key = self.get_cache_key(keywords, 'coupang')
         
         # 캐시 확인
-        if cache_key in self.cache and self.is_cache_valid(self.cache[cache_key]):
+        cached = self.cache.get(cache_key)
+        if cached is not None:
             logger.info("Returning cached Coupang results")
-            return [ProductRecommendation(**item) for item in self.cache[cache_key]['products']]
+            return [ProductRecommendation(**item) for item in cached]
         
-        # API 호출 제한 확인
-        self.reset_daily_limit_if_needed()
-        if self.daily_calls >= self.api_call_limit:
-            logger.warning("Daily API call limit reached")
-            return self._get_fallback_products('coupang', keywords)
+        # API 호출 제한 확인 (허용되면 사용량에 기록됨)
+        if not self.rate_limiter.acquire('coupang'):
+            return self._get_fallback_products('coupang', keywords, is_sensitive, features)
         
         try:
-            # TODO: 실제 쿠팡 API 호출 로직 구현
-            # 현재는 기본 구조만 준비
             products = self._call_coupang_api(keywords)
             
             # 캐시 저장
-            self.cache[cache_key] = {
-                'products': [product.__dict__ for product in products],
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            self.daily_calls += 1
+            self.cache.set(cache_key, [product.__dict__ for product in products])
             return products
             
         except Exception as e:
             logger.error(f"Coupang API error: {e}")
-            return self._get_fallback_products('coupang', keywords)
+            return self._get_fallback_products('coupang', keywords, is_sensitive, features)
     
-    def search_amazon_products(self, keywords: List[str]) -> List[ProductRecommendation]:
+    def search_amazon_products(self, keywords: List[str], is_sensitive: bool = False,
+                               features: Optional[Dict[str, float]] = None) -> List[ProductRecommendation]:
         """아마존 제품 검색 (API 연동 준비)"""
         logger.info(f"Searching Amazon products for keywords: {keywords}")
         
+        # 검색 어댑터가 없으면 한도/캐시를 건드리지 않고 카탈로그로 대체
+        if not self.api_endpoints.get('amazon'):
+            logger.warning("Amazon search endpoint not configured")
+            return self._get_fallback_products('amazon', keywords, is_sensitive, features)
+        
         if not self.is_api_available('amazon'):
             logger.warning("Amazon API credentials not available")
-            return self._get_fallback_products('amazon', keywords)
+            return self._get_fallback_products('amazon', keywords, is_sensitive, features)
         
         cache_key = self.get_cache_key(keywords, 'amazon')
         
         # 캐시 확인
-        if cache_key in self.cache and self.is_cache_valid(self.cache[cache_key]):
+        cached = self.cache.get(cache_key)
+        if cached is not None:
             logger.info("Returning cached Amazon results")
-            return [ProductRecommendation(**item) for item in self.cache[cache_key]['products']]
+            return [ProductRecommendation(**item) for item in cached]
         
-        # API 호출 제한 확인
-        self.reset_daily_limit_if_needed()
-        if self.daily_calls >= self.api_call_limit:
-            logger.warning("Daily API call limit reached")
-            return self._get_fallback_products('amazon', keywords)
+        # API 호출 제한 확인 (허용되면 사용량에 기록됨)
+        if not self.rate_limiter.acquire('amazon'):
+            return self._get_fallback_products('amazon', keywords, is_sensitive, features)
         
         try:
-            # TODO: 실제 아마존 API 호출 로직 구현
-            # 현재는 기본 구조만 준비
             products = self._call_amazon_api(keywords)
             
             # 캐시 저장
-            self.cache[cache_key] = {
-                'products': [product.__dict__ for product in products],
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            self.daily_calls += 1
+            self.cache.set(cache_key, [product.__dict__ for product in products])
             return products
             
         except Exception as e:
             logger.error(f"Amazon API error: {e}")
-            return self._get_fallback_products('amazon', keywords)
+            return self._get_fallback_products('amazon', keywords, is_sensitive, features)
     
     def _call_coupang_api(self, keywords: List[str]) -> List[ProductRecommendation]:
-        """쿠팡 API 호출 (구현 예정)"""
-        # TODO: 실제 쿠팡파트너스 API 호출 로직
-        # 지금은 빈 리스트 반환
-        return []
+        """쿠팡 API 호출"""
+        return self._call_search_api('coupang', keywords)
     
     def _call_amazon_api(self, keywords: List[str]) -> List[ProductRecommendation]:
-        """아마존 API 호출 (구현 예정)"""
-        # TODO: 실제 아마존 PA API 호출 로직
-        # 지금은 빈 리스트 반환
-        return []
+        """아마존 API 호출"""
+        return self._call_search_api('amazon', keywords)
+    
+    def get_session(self, source: str) -> requests.Session:
+        """제공자별로 재사용되는 HTTP 세션 (커넥션 풀)"""
+        session = self._sessions.get(source)
+        if session is None:
+            with self._session_lock:
+                session = self._sessions.get(source)
+                if session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=1, pool_maxsize=Config.PRODUCT_SEARCH_WORKERS
+                    )
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._sessions[source] = session
+        return session
+    
+    def _call_search_api(self, source: str, keywords: List[str]) -> List[ProductRecommendation]:
+        """
+        제공자 검색 어댑터 호출
+        
+        COUPANG_API_URL / AMAZON_API_URL은 쿠팡파트너스/아마존 PA API를 직접 가리키지 않고,
+        인증과 요청 서명을 처리하는 로컬 어댑터(또는 프록시)를 가리킵니다. 어댑터는
+        GET ?keywords=a,b,c 요청에 {"products": [...]} 형식의 JSON으로 응답하며, 각 항목은
+        ProductRecommendation 필드를 가집니다. 엔드포인트 설정 여부는 호출하는 쪽에서 확인합니다.
+        """
+        response = self.get_session(source).get(
+            self.api_endpoints[source],
+            params={'keywords': ','.join(keywords)},
+            timeout=self.provider_timeouts[source]
+        )
+        response.raise_for_status()
+        return self._to_products(response.json().get('products', []), source)
     
-    def _get_fallback_products(self, source: str, keywords: List[str]) -> List[ProductRecommendation]:
-        """API 실패 시 대체 제품 (기본 데이터베이스에서)"""
+    def _to_products(self, items: List[Dict], source: str) -> List[ProductRecommendation]:
+        """제품 dict를 ProductRecommendation으로 변환 (알 수 없는 필드는 무시)"""
+        fields = ProductRecommendation.__dataclass_fields__
+        products = []
+        for item in items:
+            item = {key: value for key, value in item.items() if key in fields}
+            item.setdefault('source', source)
+            try:
+                products.append(ProductRecommendation(**item))
+            except TypeError as e:
+                logger.warning(f"Skipping malformed {source} product: {e}")
+        return products
+    
+    def _get_fallback_products(self, source: str, keywords: List[str], is_sensitive: bool = False,
+                               features: Optional[Dict[str, float]] = None) -> List[ProductRecommendation]:
+        """API 실패 시 대체 제품 (로컬 제품 카탈로그에서)"""
         logger.info(f"Using fallback products for {source}")
         
-        # TODO: 실제 운영시에는 사전 선별된 제품 데이터베이스에서 가져오기
-        # 현재는 빈 리스트 반환
-        return []
+        # 민감 피부면 avoid_sensitive 성분이 든 제품은 제외
+        items = self.catalog.search(keywords, source=source, k=6, is_sensitive=is_sensitive)
+        if not items and features:
+            # 키워드가 카탈로그와 맞지 않으면 (예: 임계값을 넘는 문제 없음) 특성 벡터 관련도로 선택
+            items = self.catalog.recommend(features, source=source, k=6, is_sensitive=is_sensitive)
+        return self._to_products(items, source)
     
     def filter_and_rank_products(self, products: List[ProductRecommendation], 
                                 features: Dict[str, float]) -> List[ProductRecommendation]:
@@ -297,21 +379,24 @@ class ProductRecommendationEngine:
         
         recommendations = {}
         
-        # 쿠팡 제품 검색
-        try:
-            coupang_products = self.search_coupang_products(keywords)
-            recommendations['coupang'] = self.filter_and_rank_products(coupang_products, features)
-        except Exception as e:
-            logger.error(f"Coupang search failed: {e}")
-            recommendations['coupang'] = []
-        
-        # 아마존 제품 검색
-        try:
-            amazon_products = self.search_amazon_products(keywords)
-            recommendations['amazon'] = self.filter_and_rank_products(amazon_products, features)
-        except Exception as e:
-            logger.error(f"Amazon search failed: {e}")
-            recommendations['amazon'] = []
+        # 쿠팡/아마존 동시 검색 - 제한 시간 안에 끝나지 않은 제공자는 빈 결과로 처리
+        started = time.monotonic()
+        futures = {
+            'coupang': self._executor.submit(self.search_coupang_products, keywords, is_sensitive, features),
+            'amazon': self._executor.submit(self.search_amazon_products, keywords, is_sensitive, features),
+        }
+        for source, future in futures.items():
+            # HTTP 타임아웃 외에 연결 대기 등을 위한 여유 시간
+            deadline = self.provider_timeouts[source] + 0.5
+            try:
+                products = future.result(timeout=max(0.0, started + deadline - time.monotonic()))
+                recommendations[source] = self.filter_and_rank_products(products, features)
+            except FuturesTimeoutError:
+                logger.warning(f"{source} search exceeded its {deadline:.1f}s deadline, returning partial results")
+                recommendations[source] = []
+            except Exception as e:
+                logger.error(f"{source} search failed: {e}")
+                recommendations[source] = []
         
         logger.info(f"Recommendations generated: {len(recommendations['coupang'])} Coupang, {len(recommendations['amazon'])} Amazon")
         return recommendations
@@ -0,0 +1,179 @@
+"""
+Rate limiting and daily quota accounting for upstream product APIs.
+
+제공자별 토큰 버킷으로 초당 호출 수를 제한하고, 모든 제공자를 합한 일일 호출 한도를
+관리합니다. db_path를 지정하면 일일 사용량을 SQLite에 기록하여 여러 워커 프로세스가
+하나의 한도를 공유합니다.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def refund(self, tokens: float = 1.0):
+        """Return tokens taken for a call that was not made."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class ApiRateLimiter:
+    """Per-provider token buckets plus a daily quota shared by all providers."""
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], daily_limit: int = 1000,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            limits: 제공자 -> (초당 호출 수, 최대 버스트)
+            daily_limit: 모든 제공자를 합한 일일 호출 한도
+            db_path: 프로세스 간 공유할 사용량 SQLite 파일 (없으면 프로세스 내에서만 집계)
+        """
+        self.buckets = {source: TokenBucket(rate, burst) for source, (rate, burst) in limits.items()}
+        self.daily_limit = daily_limit
+        self.db_path = db_path or None
+        self.rejected = {source: 0 for source in limits}
+        self._lock = threading.Lock()
+        self._day = None
+        self._calls = {}
+        self._db = None
+
+        if self.db_path:
+            try:
+                # 트랜잭션을 직접 제어 (BEGIN IMMEDIATE로 프로세스 간 원자적 증가)
+                self._db = sqlite3.connect(self.db_path, timeout=5, isolation_level=None,
+                                           check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS api_usage ("
+                    "day TEXT NOT NULL, source TEXT NOT NULL, calls INTEGER NOT NULL, "
+                    "PRIMARY KEY (day, source))"
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Could not open API usage database {self.db_path}: {e}")
+                self._db = None
+
+    def acquire(self, source: str) -> bool:
+        """
+        상위 API 호출 전에 호출하여 허용 여부를 확인하고 사용량을 기록합니다.
+
+        Returns:
+            bool: 호출해도 되면 True
+        """
+        bucket = self.buckets.get(source)
+        if bucket is not None and not bucket.try_acquire():
+            self._reject(source, 'rate limit')
+            return False
+        if not self._consume_daily(source):
+            # 호출하지 않았으므로 토큰은 되돌림
+            if bucket is not None:
+                bucket.refund()
+            self._reject(source, 'daily quota')
+            return False
+        return True
+
+    def usage(self) -> Dict:
+        """현재 사용량 (모니터링용)"""
+        day = self._today()
+        with self._lock:
+            calls = self._read_calls(day)
+            rejected = dict(self.rejected)
+        return {
+            'day': day,
+            'daily_limit': self.daily_limit,
+            'total_calls': sum(calls.values()),
+            'calls': calls,
+            'rejected': rejected,
+            'tokens': {source: round(bucket.available(), 2) for source, bucket in self.buckets.items()},
+            'shared': self._db is not None,
+        }
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().date().isoformat()
+
+    def _reject(self, source, reason):
+        with self._lock:
+            self.rejected[source] = self.rejected.get(source, 0) + 1
+        logger.warning(f"{source} API call rejected by {reason}")
+
+    def _consume_daily(self, source: str) -> bool:
+        day = self._today()
+        with self._lock:
+            if self._db is not None:
+                try:
+                    return self._consume_shared(day, source)
+                except sqlite3.Error as e:
+                    logger.warning(f"Shared API usage update failed, counting locally: {e}")
+
+            if day != self._day:
+                self._day = day
+                self._calls = {}
+            if sum(self._calls.values()) >= self.daily_limit:
+                return False
+            self._calls[source] = self._calls.get(source, 0) + 1
+            return True
+
+    def _consume_shared(self, day: str, source: str) -> bool:
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            total = db.execute("SELECT COALESCE(SUM(calls), 0) FROM api_usage WHERE day = ?",
+                               (day,)).fetchone()[0]
+            if total >= self.daily_limit:
+                db.execute("ROLLBACK")
+                return False
+            db.execute(
+                "INSERT INTO api_usage (day, source, calls) VALUES (?, ?, 1) "
+                "ON CONFLICT(day, source) DO UPDATE SET calls = calls + 1",
+                (day, source)
+            )
+            # 지난 날짜 기록 정리
+            db.execute("DELETE FROM api_usage WHERE day < ?", (day,))
+            db.execute("COMMIT")
+            return True
+        except Exception:
+            # 실패한 문장에 따라 SQLite가 이미 트랜잭션을 끝냈을 수 있음
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+
+    def _read_calls(self, day: str) -> Dict[str, int]:
+        if self._db is not None:
+            try:
+                rows = self._db.execute("SELECT source, calls FROM api_usage WHERE day = ?", (day,)).fetchall()
+                return dict(rows)
+            except sqlite3.Error as e:
+                logger.warning(f"API usage lookup failed: {e}")
+        return dict(self._calls) if day == self._day else {}
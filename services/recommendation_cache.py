@@ -0,0 +1,105 @@
+"""
+Product search result cache.
+
+쿠팡/아마존 검색 결과를 (정렬된 키워드, 제공자) 의 SHA-1 키로 저장합니다. 키가 프로세스와
+무관하게 같으므로 선택적인 SQLite 계층을 통해 모든 gunicorn 워커가 같은 결과를 재사용할 수
+있습니다. 메모리 계층은 크기(LRU)와 TTL로 제한되며, 적중/실패/제거 횟수를 기록합니다.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from services.sqlite_tier import SqliteTier
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationCache:
+    """TTL + LRU bounded cache of product search results with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 6 * 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path or None
+        self._entries = OrderedDict()  # key -> (stored_at, products)
+        self._lock = threading.Lock()
+        self._tier = SqliteTier(
+            self.db_path,
+            "CREATE TABLE IF NOT EXISTS product_search_cache ("
+            "cache_key TEXT PRIMARY KEY, products TEXT NOT NULL, stored_at REAL NOT NULL)",
+            'recommendation cache'
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(keywords: List[str], source: str) -> str:
+        """프로세스와 무관하게 같은 캐시 키 생성"""
+        payload = json.dumps(sorted(keywords), ensure_ascii=False)
+        return f"{source}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached product dicts, or None when missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return [dict(product) for product in entry[1]]
+                del self._entries[key]
+                self.expirations += 1
+
+            row = self._tier.fetchone(
+                "SELECT products, stored_at FROM product_search_cache WHERE cache_key = ?", (key,)
+            )
+            if row is not None and now - row[1] < self.ttl:
+                products = json.loads(row[0])
+                self._remember(key, row[1], products)
+                self.hits += 1
+                return [dict(product) for product in products]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, products: List[Dict]):
+        """Store product dicts under ``key`` in every tier."""
+        stored_at = time.time()
+        products = [dict(product) for product in products]
+        with self._lock:
+            self._remember(key, stored_at, products)
+            self._tier.write(
+                ("INSERT OR REPLACE INTO product_search_cache (cache_key, products, stored_at) "
+                 "VALUES (?, ?, ?)",
+                 (key, json.dumps(products, ensure_ascii=False), stored_at)),
+                # 만료된 행 정리
+                ("DELETE FROM product_search_cache WHERE stored_at < ?", (stored_at - self.ttl,))
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, stored_at, products):
+        self._entries[key] = (stored_at, products)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
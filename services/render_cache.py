@@ -0,0 +1,170 @@
+"""
+Rendered template cache.
+
+SkinAnalysis 결과처럼 생성 후 바뀌지 않는 내용의 렌더링 결과(HTML 조각)를 보관하여
+같은 페이지를 다시 볼 때 Jinja 렌더링과 DB 파생 계산을 건너뜁니다.
+
+PageCache는 거의 정적인 페이지(홈, 개인정보처리방침, 404) 전체를 (템플릿, 언어, 버전)
+단위로 보관하고, gzip/brotli 압축본과 ETag를 미리 계산해 둡니다. 저장소는 LRUStore
+(프로세스 메모리) 또는 FilesystemStore(여러 워커 공유)를 사용할 수 있습니다.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from flask import Response, render_template, request, session
+from config import Config
+from utils.files import atomic_write
+
+try:
+    import brotli
+except ImportError:  # 선택적 의존성: 없으면 gzip만 제공
+    brotli = None
+
+
+class LRUStore:
+    """Thread-safe in-process LRU mapping of cache keys to rendered content."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FilesystemStore:
+    """Stores CachedPage entries as files so every worker process can reuse them."""
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def _path(self, key):
+        return os.path.join(self.folder, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.page')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return CachedPage.from_bytes(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        with atomic_write(self._path(key)) as f:
+            f.write(value.to_bytes())
+
+    def clear(self):
+        if os.path.isdir(self.folder):
+            for filename in os.listdir(self.folder):
+                if filename.endswith('.page'):
+                    os.remove(os.path.join(self.folder, filename))
+
+
+class CachedPage:
+    """A rendered page with its ETag and precompressed bodies."""
+
+    def __init__(self, etag, bodies):
+        self.etag = etag
+        self.bodies = bodies  # encoding -> bytes ('identity', 'gzip', 'br')
+
+    @classmethod
+    def build(cls, html):
+        body = html.encode('utf-8')
+        bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            bodies['br'] = brotli.compress(body, mode=brotli.MODE_TEXT)
+        return cls(hashlib.sha1(body).hexdigest()[:20], bodies)
+
+    def to_bytes(self):
+        header = {'etag': self.etag, 'lengths': {name: len(body) for name, body in self.bodies.items()}}
+        return json.dumps(header).encode('utf-8') + b'\n' + b''.join(self.bodies.values())
+
+    @classmethod
+    def from_bytes(cls, data):
+        header_end = data.index(b'\n')
+        header = json.loads(data[:header_end])
+        bodies, offset = {}, header_end + 1
+        for name, length in header['lengths'].items():
+            bodies[name] = data[offset:offset + length]
+            offset += length
+        return cls(header['etag'], bodies)
+
+
+class PageCache:
+    """Serves mostly static templated pages from a store, with ETag/304 and precompressed bodies."""
+
+    def __init__(self, store, version='1'):
+        self.store = store
+        self.version = version
+
+    def render(self, template, lang='en', status=200, key='', **context):
+        """
+        템플릿을 캐시에서 응답합니다.
+
+        Args:
+            template (str): 템플릿 이름
+            lang (str): 언어 코드
+            status (int): 응답 상태 코드
+            key (str): 컨텍스트가 바뀌는 값(예: 날짜)을 캐시 키에 포함
+            **context: 캐시가 비어 있을 때 렌더링에 쓰는 컨텍스트
+
+        Returns:
+            Response
+        """
+        # 표시할 flash 메시지가 있으면 페이지 내용이 달라지므로 캐시를 쓰지 않음
+        if session.get('_flashes'):
+            return Response(render_template(template, **context), status=status)
+
+        cache_key = f"{template}:{lang}:{self.version}:{key}"
+        page = self.store.get(cache_key)
+        if page is None:
+            page = CachedPage.build(render_template(template, **context))
+            self.store.set(cache_key, page)
+
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in page.bodies and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        response = Response(page.bodies[encoding], status=status, mimetype='text/html')
+        response.set_etag(page.etag if encoding == 'identity' else f"{page.etag}-{encoding}")
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        # 브라우저는 매번 재검증 (ETag가 같으면 304)
+        response.cache_control.no_cache = True
+        if status == 200:
+            response.make_conditional(request)
+        return response
+
+
+def create_page_store(folder=None, max_entries=256):
+    """Return a FilesystemStore when a folder is configured, otherwise an in-process LRU."""
+    if folder:
+        return FilesystemStore(folder)
+    return LRUStore(max_entries)
+
+
+# 전역 인스턴스
+results_fragment_cache = LRUStore(Config.RESULTS_CACHE_SIZE)
+page_cache = PageCache(create_page_store(Config.PAGE_CACHE_FOLDER), Config.PAGE_CACHE_VERSION)
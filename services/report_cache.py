@@ -0,0 +1,103 @@
+"""
+PDF report artifact cache.
+
+SkinAnalysis 행은 생성 후 변경되지 않으므로 PDF 보고서를 (분석 ID, 언어, 보고서 버전)
+단위로 한 번만 생성해 디스크에 저장하고, 이후 다운로드는 파일 전송만 수행합니다.
+저장된 보고서는 업로드와 같은 RetentionManager로 기간/용량 한도를 적용합니다.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.upload_retention import RetentionManager
+from utils.files import atomic_write
+from utils.pdf_generator import REPORT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class PdfReportCache:
+    """Stores rendered PDF reports on disk and renders missing ones in the background."""
+
+    def __init__(self, folder, version, max_workers=2):
+        self.folder = folder
+        self.version = version
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def path_for(self, analysis_id, lang='en'):
+        return os.path.join(self.folder, f"skin_analysis_{analysis_id}_{lang}_v{self.version}.pdf")
+
+    def get(self, analysis_id, lang='en'):
+        """Return the cached report path, or None if it has not been rendered yet."""
+        path = self.path_for(analysis_id, lang)
+        return path if os.path.exists(path) else None
+
+    def store(self, analysis_id, lang, pdf_buffer):
+        """
+        렌더링된 PDF를 저장합니다.
+
+        임시 파일에 쓴 뒤 rename하므로 다른 요청이 반쯤 쓰인 파일을 읽지 않습니다.
+
+        Args:
+            analysis_id (int): 분석 ID
+            lang (str): 언어 코드
+            pdf_buffer (BytesIO): create_skin_analysis_pdf 결과
+
+        Returns:
+            str: 저장된 파일 경로
+        """
+        path = self.path_for(analysis_id, lang)
+        with atomic_write(path) as f:
+            f.write(pdf_buffer.getbuffer())
+        return path
+
+    def get_or_create(self, analysis_id, lang, render):
+        """
+        Return the cached report path, rendering it synchronously if needed.
+
+        Args:
+            render: callable(analysis_id, lang) returning a BytesIO PDF
+        """
+        path = self.get(analysis_id, lang)
+        if path is not None:
+            return path
+        return self.store(analysis_id, lang, render(analysis_id, lang))
+
+    def schedule(self, analysis_id, lang, render):
+        """Render a report in the background unless it is cached or already queued."""
+        key = (analysis_id, lang)
+        with self._lock:
+            if key in self._pending or self.get(analysis_id, lang) is not None:
+                return
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='pdf-render'
+                )
+        self._executor.submit(self._render_in_background, analysis_id, lang, render)
+
+    def _render_in_background(self, analysis_id, lang, render):
+        try:
+            if self.get(analysis_id, lang) is None:
+                self.store(analysis_id, lang, render(analysis_id, lang))
+                logger.debug(f"Pre-rendered PDF report for analysis {analysis_id} ({lang})")
+        except Exception as e:
+            logger.error(f"Background PDF rendering failed for analysis {analysis_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard((analysis_id, lang))
+
+
+# 전역 인스턴스
+pdf_report_cache = PdfReportCache(Config.PDF_CACHE_FOLDER, REPORT_VERSION, Config.PDF_RENDER_WORKERS)
+# 다시 만들 수 있는 파일이므로 DB 갱신 없이 삭제만 수행 (이전 보고서 버전도 기간이 지나면 삭제)
+report_retention = RetentionManager(
+    Config.PDF_CACHE_FOLDER,
+    max_age_days=Config.PDF_CACHE_MAX_AGE_DAYS,
+    max_bytes=Config.PDF_CACHE_MAX_BYTES
+)
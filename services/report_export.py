@@ -0,0 +1,126 @@
+"""
+Batch PDF export.
+
+여러 분석 보고서를 워커 풀에서 병렬로 렌더링하고, ZIP 아카이브를 메모리에 모으지 않고
+조각 단위로 스트리밍합니다. 동시에 처리 중인 보고서 수가 제한되므로 보고서 개수와
+관계없이 메모리 사용량이 일정합니다.
+"""
+
+import io
+import logging
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_ids(params):
+    """
+    요청 파라미터에서 분석 ID 목록을 읽습니다.
+
+    ``?ids=1&ids=2``처럼 반복된 파라미터, ``ids=1,2`` 같은 쉼표 구분 값, JSON 본문의 목록을
+    모두 받습니다.
+
+    Args:
+        params: request.values (MultiDict) 또는 JSON 본문 dict
+
+    Returns:
+        list: 정수 ID 목록
+
+    Raises:
+        ValueError, TypeError: 정수가 아닌 값이 있는 경우
+    """
+    if hasattr(params, 'getlist'):
+        values = params.getlist('ids')
+    else:
+        values = params.get('ids')
+        if values is None:
+            values = []
+        elif not isinstance(values, list):
+            values = [values]
+
+    ids = []
+    for value in values:
+        if isinstance(value, str):
+            ids.extend(int(part) for part in value.split(',') if part.strip())
+        else:
+            ids.append(int(value))
+    return ids
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_reports_zip(analysis_ids, render_path, max_workers=4, window=8):
+    """
+    보고서 ZIP 아카이브를 스트리밍합니다.
+
+    Args:
+        analysis_ids (list): 내보낼 분석 ID 목록 (이 순서대로 아카이브에 기록)
+        render_path: callable(analysis_id) -> 렌더링된 PDF 파일 경로
+        max_workers (int): 병렬 렌더링 워커 수
+        window (int): 동시에 렌더링 중이거나 대기 중인 최대 보고서 수
+
+    Yields:
+        bytes: ZIP 데이터 조각
+    """
+    sink = _ZipStreamBuffer()
+    failed = []
+    ids = iter(analysis_ids)
+
+    # PDF는 이미 압축되어 있으므로 STORED로 CPU 사용을 줄임
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-export') as pool, \
+            zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        in_flight = deque()
+        for analysis_id in ids:
+            in_flight.append((analysis_id, pool.submit(render_path, analysis_id)))
+            if len(in_flight) >= window:
+                break
+
+        while in_flight:
+            analysis_id, future = in_flight.popleft()
+            next_id = next(ids, None)
+            if next_id is not None:
+                in_flight.append((next_id, pool.submit(render_path, next_id)))
+
+            try:
+                pdf_path = future.result()
+            except Exception as e:
+                logger.error(f"Could not render report {analysis_id} for export: {str(e)}")
+                failed.append(analysis_id)
+                continue
+
+            with open(pdf_path, 'rb') as source, \
+                    archive.open(f"skin_analysis_{analysis_id}.pdf", 'w') as target:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    yield sink.pop()
+            yield sink.pop()
+
+        if failed:
+            archive.writestr('errors.txt', 'Reports that could not be generated: ' +
+                             ', '.join(str(analysis_id) for analysis_id in failed) + '\n')
+
+    yield sink.pop()
@@ -0,0 +1,102 @@
+"""
+Content-addressed analysis result cache.
+
+분석기는 정규화된 썸네일 픽셀과 실제 나이가 같으면 항상 같은 결과를 반환하므로,
+사용자와 관계없이 (이미지 내용 해시, 실제 나이) 를 키로 결과를 재사용합니다.
+프로세스 내 LRU 캐시와 선택적인 SQLite 디스크 캐시 두 단계로 구성됩니다.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from config import Config
+from services.sqlite_tier import SqliteTier
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultCache:
+    """In-process LRU of analysis results with an optional SQLite tier."""
+
+    def __init__(self, max_entries=4096, db_path=None):
+        self.max_entries = max_entries
+        self.db_path = db_path or None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._tier = SqliteTier(
+            self.db_path,
+            "CREATE TABLE IF NOT EXISTS analysis_results ("
+            "cache_key TEXT PRIMARY KEY, skin_age REAL NOT NULL, "
+            "features TEXT NOT NULL, feedback TEXT NOT NULL)",
+            'analysis cache'
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content_hash, user_age=None):
+        """
+        캐시 키 생성
+
+        The seed mode is part of the key so toggling ANALYZER_LEGACY_SEED
+        never serves results computed under the other mode.
+        """
+        try:
+            age = int(user_age) if user_age is not None else None
+        except (ValueError, TypeError):
+            age = None
+        seed_mode = 'jpeg' if Config.ANALYZER_LEGACY_SEED else 'pixels'
+        return f"{content_hash}:{age}:{seed_mode}"
+
+    def get(self, key):
+        """Return a cached (skin_age, features, feedback) tuple or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(result)
+
+            row = self._tier.fetchone(
+                "SELECT skin_age, features, feedback FROM analysis_results WHERE cache_key = ?", (key,)
+            )
+            if row is not None:
+                result = (row[0], json.loads(row[1]), row[2])
+                self._remember(key, result)
+                self.hits += 1
+                return _copy_result(result)
+
+            self.misses += 1
+            return None
+
+    def set(self, key, result):
+        """Store an analyzer result under ``key`` in every tier."""
+        skin_age, features, feedback = result
+        result = (skin_age, dict(features), feedback)
+        with self._lock:
+            self._remember(key, result)
+            self._tier.write((
+                "INSERT OR REPLACE INTO analysis_results (cache_key, skin_age, features, feedback) "
+                "VALUES (?, ?, ?, ?)",
+                (key, skin_age, json.dumps(features), feedback)
+            ))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _copy_result(result):
+    skin_age, features, feedback = result
+    return skin_age, dict(features), feedback
+
+
+# 전역 인스턴스
+analysis_result_cache = AnalysisResultCache(Config.ANALYSIS_CACHE_SIZE, Config.ANALYSIS_CACHE_DB)
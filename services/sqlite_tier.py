@@ -0,0 +1,75 @@
+"""
+Optional SQLite tier shared by worker processes.
+
+프로세스 메모리를 1차 저장소로 쓰는 캐시/상태 저장소가, 경로가 설정되면 같은 SQLite
+파일을 통해 여러 gunicorn 워커와 내용을 공유하도록 하는 계층입니다.
+SQLite 오류는 경고만 남기고 조회 실패(미스)로 처리하므로 메모리 계층은 계속 동작합니다.
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteTier:
+    """One SQLite connection with a table schema, serialized by a lock."""
+
+    def __init__(self, db_path: Optional[str], schema: str, name: str):
+        """
+        Args:
+            db_path (str): SQLite 파일 경로 (없으면 비활성)
+            schema (str): CREATE TABLE IF NOT EXISTS 문
+            name (str): 로그에 쓰는 이름 (예: 'analysis cache')
+        """
+        self.db_path = db_path or None
+        self.name = name
+        self._db = None
+        self._lock = threading.Lock()
+
+        if self.db_path:
+            try:
+                self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+                # 여러 워커 프로세스가 동시에 읽고 쓸 수 있도록 WAL 사용
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(schema)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Could not open {name} database {self.db_path}: {e}")
+                self._db = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def fetchone(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        """Return the first row of a query, or None when disabled, missing or failed."""
+        if self._db is None:
+            return None
+        with self._lock:
+            try:
+                return self._db.execute(sql, params).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} lookup failed: {e}")
+                return None
+
+    def write(self, *statements: Tuple[str, Sequence]) -> bool:
+        """
+        (sql, params) 문들을 한 트랜잭션으로 실행합니다.
+
+        Returns:
+            bool: 기록되었으면 True (비활성이거나 실패하면 False, 실패 시 롤백)
+        """
+        if self._db is None:
+            return False
+        with self._lock:
+            try:
+                with self._db:
+                    for sql, params in statements:
+                        self._db.execute(sql, params)
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} write failed: {e}")
+                return False
@@ -0,0 +1,298 @@
+"""
+Storage backends for uploaded images.
+
+모든 이미지 저장소는 StorageBackend 인터페이스(put/get/exists/delete/url_for)를 따르며,
+대량 처리(put_many, delete_many)와 비동기 호출(put_async 등)은 공용 I/O 스레드 풀에서
+실행됩니다.
+
+- LocalContentStore: 내용 해시(SHA-256)를 키로 쓰는 로컬 저장소. 해시 앞부분으로 디렉터리를
+  나누고, 같은 내용은 한 번만 저장하며, 임시 파일 + rename으로 원자적으로 기록합니다.
+- FirebaseBackend: Firebase Storage 버킷 (키 = blob 이름)
+- MemoryBackend: 테스트용 메모리 저장소
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+import logging
+import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from utils.files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+_io_executor = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor(max_workers=4):
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='storage-io')
+    return _io_executor
+
+
+def public_url(bucket_name, path):
+    """Build a blob's public URL from strings only (same format as Blob.public_url)."""
+    return f"https://storage.googleapis.com/{bucket_name}/{quote(path, safe='/~')}"
+
+
+def content_key(data, extension='.jpg'):
+    """Return the content-addressed key (SHA-256 hex + extension) for some bytes."""
+    return hashlib.sha256(data).hexdigest() + extension
+
+
+class StorageBackend(ABC):
+    """Common interface for image stores. Keys are backend-relative names."""
+
+    url_prefix = '/serve_image'
+
+    @abstractmethod
+    def put(self, data, key=None, content_type=None):
+        """
+        데이터를 저장합니다.
+
+        Args:
+            data (bytes): 저장할 데이터
+            key (str, optional): 저장 키, 없으면 내용 해시로 생성
+            content_type (str, optional): MIME 타입
+
+        Returns:
+            str: 저장된 키
+        """
+
+    def put_file(self, path, key=None, content_type=None):
+        """Store the contents of a local file. Returns the key."""
+        with open(path, 'rb') as f:
+            return self.put(f.read(), key or os.path.basename(path), content_type)
+
+    @abstractmethod
+    def get(self, key):
+        """Return the stored bytes, or raise KeyError."""
+
+    @abstractmethod
+    def exists(self, key):
+        """Return True if the key is stored."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Delete a key. Returns True if something was removed."""
+
+    def url_for(self, key):
+        """Return the URL a browser can load the object from."""
+        return f"{self.url_prefix}/{key}"
+
+    def local_path(self, key):
+        """Return a filesystem path for the object, or None if it is not on local disk."""
+        return None
+
+    # 대량/비동기 API
+
+    def put_many(self, items, content_type=None):
+        """
+        여러 데이터를 병렬로 저장합니다.
+
+        Args:
+            items: bytes 또는 (key, bytes) 항목의 iterable
+
+        Returns:
+            list: 입력 순서대로 저장된 키
+        """
+        futures = []
+        for item in items:
+            key, data = item if isinstance(item, tuple) else (None, item)
+            futures.append(self.put_async(data, key, content_type))
+        return [future.result() for future in futures]
+
+    def delete_many(self, keys):
+        """Delete keys in parallel. Returns the number of objects removed."""
+        futures = [_get_io_executor().submit(self.delete, key) for key in keys]
+        return sum(1 for future in futures if future.result())
+
+    def put_async(self, data, key=None, content_type=None):
+        """Store data on the shared I/O pool. Returns a Future resolving to the key."""
+        return _get_io_executor().submit(self.put, data, key, content_type)
+
+    def put_file_async(self, path, key=None, content_type=None):
+        return _get_io_executor().submit(self.put_file, path, key, content_type)
+
+    def delete_async(self, key):
+        return _get_io_executor().submit(self.delete, key)
+
+
+class LocalContentStore(StorageBackend):
+    """Content-addressed store on local disk, sharded by hash prefix."""
+
+    def __init__(self, root, shard_depth=2, shard_width=2):
+        self.root = root
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+
+    def path_for(self, key):
+        """Return where the object for `key` is (or would be) stored."""
+        shards = [key[i * self.shard_width:(i + 1) * self.shard_width] for i in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, key)
+
+    def put(self, data, key=None, content_type=None):
+        key = key or content_key(data)
+        path = self.path_for(key)
+        try:
+            # 같은 내용이 이미 저장되어 있으면 보존 정책이 새 업로드로 보도록 시각만 갱신
+            os.utime(path)
+            logger.debug(f"Deduplicated upload {key}")
+            return key
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not refresh timestamps of {key}: {e}")
+            return key
+
+        with atomic_write(path) as f:
+            f.write(data)
+        logger.debug(f"Image saved locally at {path}")
+        return key
+
+    def get(self, key):
+        path = self.local_path(key)
+        if path is None:
+            raise KeyError(key)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def exists(self, key):
+        return self.local_path(key) is not None
+
+    def delete(self, key):
+        path = self.local_path(key)
+        if path is None:
+            return False
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def local_path(self, key):
+        path = self.path_for(key)
+        if os.path.isfile(path):
+            return path
+        # 해시 디렉터리 도입 이전의 평면 구조 파일
+        legacy_path = os.path.join(self.root, key)
+        if os.path.isfile(legacy_path):
+            return legacy_path
+        return None
+
+
+class FirebaseBackend(StorageBackend):
+    """Firebase Storage bucket; keys are blob names such as images/<hash>.jpg."""
+
+    def __init__(self, bucket_factory, bucket_name=None):
+        """
+        Args:
+            bucket_factory: callable returning the bucket (테스트에서는 가짜 버킷)
+            bucket_name (str, optional): 지정하면 URL 생성 시 SDK를 호출하지 않음
+        """
+        self.bucket_factory = bucket_factory
+        self.bucket_name = bucket_name or None
+
+    def put(self, data, key=None, content_type=None):
+        key = key or f"images/{content_key(data)}"
+        blob = self.bucket_factory().blob(key)
+        blob.upload_from_string(data, content_type=content_type or 'image/jpeg')
+        blob.make_public()
+        return key
+
+    def put_file(self, path, key=None, content_type=None):
+        key = key or f"images/{os.path.basename(path)}"
+        blob = self.bucket_factory().blob(key)
+        blob.upload_from_filename(path, content_type=content_type or mimetypes.guess_type(path)[0] or 'image/jpeg')
+        blob.make_public()
+        return key
+
+    def get(self, key):
+        blob = self.bucket_factory().blob(key)
+        if not blob.exists():
+            raise KeyError(key)
+        return blob.download_as_bytes()
+
+    def exists(self, key):
+        return self.bucket_factory().blob(key).exists()
+
+    def delete(self, key):
+        try:
+            self.bucket_factory().blob(key).delete()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting {key} from Firebase: {str(e)}")
+            return False
+
+    def url_for(self, key):
+        return public_url(self.bucket_name or self.bucket_factory().name, key)
+
+    def delete_many(self, keys):
+        """Delete blobs with one batched HTTP request per call when the SDK supports it."""
+        keys = list(keys)
+        bucket = self.bucket_factory()
+        client = getattr(bucket, 'client', None)
+        if client is None or not hasattr(client, 'batch'):
+            return super().delete_many(keys)
+        try:
+            with client.batch():
+                for key in keys:
+                    bucket.blob(key).delete()
+            return len(keys)
+        except Exception as e:
+            # 배치 중 하나라도 실패하면 개별 삭제로 다시 시도 (이미 지워진 blob은 실패로 집계)
+            logger.warning(f"Batched Firebase delete failed ({str(e)}), deleting individually")
+            return super().delete_many(keys)
+
+
+class MemoryBackend(StorageBackend):
+    """In-process store for tests and local experiments."""
+
+    def __init__(self):
+        self._objects = {}
+        self._lock = threading.Lock()
+
+    def put(self, data, key=None, content_type=None):
+        key = key or content_key(data)
+        with self._lock:
+            self._objects.setdefault(key, bytes(data))
+        return key
+
+    def get(self, key):
+        with self._lock:
+            return self._objects[key]
+
+    def exists(self, key):
+        with self._lock:
+            return key in self._objects
+
+    def delete(self, key):
+        with self._lock:
+            return self._objects.pop(key, None) is not None
+
+
+def create_backend(name, root=None, bucket_factory=None, bucket_name=None):
+    """
+    설정 이름으로 저장소를 생성합니다.
+
+    Args:
+        name (str): 'local', 'memory' 또는 'firebase'
+        root (str): local 저장소 루트 디렉터리
+        bucket_factory: firebase 버킷 생성 함수 (firebase에서는 필수)
+        bucket_name (str, optional): firebase 버킷 이름 (URL 생성용)
+    """
+    if name == 'local':
+        return LocalContentStore(root)
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'firebase':
+        if bucket_factory is None:
+            raise ValueError("The firebase storage backend requires a bucket_factory")
+        return FirebaseBackend(bucket_factory, bucket_name)
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -1,18 +1,23 @@
 import os
 import logging
+import threading
 import base64
 import json
 import requests
 from datetime import datetime, timedelta
-import uuid
-from io import BytesIO
 import firebase_admin
 from firebase_admin import credentials, storage, initialize_app
+from config import Config
+from services.storage_backends import FirebaseBackend, create_backend
+from services.upload_queue import BackgroundUploader
+from services.upload_retention import RetentionManager
 
 logger = logging.getLogger(__name__)
 
 # Flag to track if Firebase has been initialized
 firebase_initialized = False
+_bucket = None
+_bucket_lock = threading.Lock()
 
 def initialize_firebase():
     """Initialize Firebase if it hasn't been already."""
@@ -21,6 +26,11 @@ def initialize_firebase():
     if firebase_initialized:
         return True
     
+    # Another module (or an earlier call) already created the default app
+    if firebase_admin._apps:
+        firebase_initialized = True
+        return True
+    
     try:
         # Check for Firebase credentials
         firebase_api_key = os.environ.get('FIREBASE_API_KEY')
@@ -40,6 +50,27 @@ def initialize_firebase():
             logger.debug("Firebase initialized with service account")
             return True
             
+        # Service account split into individual environment variables
+        elif os.environ.get('FIREBASE_PRIVATE_KEY') and firebase_project_id and firebase_storage_bucket:
+            cred = credentials.Certificate({
+                "type": "service_account",
+                "project_id": firebase_project_id,
+                "private_key_id": os.environ.get('FIREBASE_PRIVATE_KEY_ID', ''),
+                "private_key": os.environ.get('FIREBASE_PRIVATE_KEY', '').replace('\\n', '\n'),
+                "client_email": os.environ.get('FIREBASE_CLIENT_EMAIL', ''),
+                "client_id": os.environ.get('FIREBASE_CLIENT_ID', ''),
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+                "client_x509_cert_url": os.environ.get('FIREBASE_CLIENT_CERT_URL', '')
+            })
+            firebase_admin.initialize_app(cred, {
+                'storageBucket': firebase_storage_bucket
+            })
+            firebase_initialized = True
+            logger.debug("Firebase initialized with service account fields")
+            return True
+            
         # If we have individual environment variables, try to use them
         elif firebase_api_key and firebase_storage_bucket:
             # Create a default app with storage bucket
@@ -61,106 +92,88 @@ def initialize_firebase():
         logger.error(f"Failed to initialize Firebase: {str(e)}")
         return False
 
-def upload_image(file, user_id):
+def upload_image(image_context, user_id):
     """
-    Upload an image to cloud storage.
+    Store an uploaded image in the local image store.
+    
+    The store is content-addressed, so re-uploading identical bytes reuses the
+    existing file. The remote (Firebase) copy is made later by
+    schedule_remote_upload, so the request never waits on the bucket.
     
     Args:
-        file: FileStorage object from Flask request
-        user_id: User ID for organizing files
+        image_context: ImageContext holding the raw upload bytes
+        user_id: User ID of the uploader (files are no longer named per user)
         
     Returns:
-        tuple: (path, url) - The path and URL to the stored image
+        tuple: (path, url) - The stored path and URL to the stored image
     """
-    # Generate unique filename
-    filename = f"{user_id}_{uuid.uuid4().hex}.jpg"
-    
-    # Read image data
-    image_data = BytesIO(file.read())
-    file.seek(0)  # Reset file pointer
-    # Try to use Firebase if credentials are available
-    if initialize_firebase():
-        try:
-            bucket = storage.bucket()
-            # Create a unique path for the image
-            path = f"images/{datetime.now().strftime('%Y%m%d')}/{filename}"
-            blob = bucket.blob(path)
-            
-            # Upload the image
-            image_data.seek(0)
-            blob.upload_from_file(image_data, content_type='image/jpeg')
-            
-            # Make the image publicly accessible
-            blob.make_public()
-            
-            logger.debug(f"Image uploaded to Firebase: {path}")
-            url = blob.public_url
-            return path, url
-            
-        except Exception as e:
-            logger.error(f"Firebase upload failed: {str(e)}")
-            # Fall back to local storage
-            path = upload_to_local(image_data, filename)
-            url = get_image_url(path)
-            return path, url
-    
-    # If Firebase isn't available, use an alternative method
-    else:
-        logger.debug("Firebase not initialized, using local storage")
-        path = upload_to_local(image_data, filename)
-        url = get_image_url(path)
-        return path, url
+    key = image_store.put(image_context.raw_bytes, content_type='image/jpeg')
+    path = image_store.local_path(key) or key
+    return path, image_store.url_for(key)
 
-def upload_to_local(image_data, filename):
+def schedule_remote_upload(local_path, on_uploaded=None):
     """
-    Upload an image to local storage.
+    Queue a locally stored image for background upload to Firebase.
     
     Args:
-        image_data: BytesIO object containing the image
-        filename: Name to save the file as
+        local_path: Path returned by upload_image
+        on_uploaded: callable(list of (local_path, remote_path, url)) run after each batch
         
     Returns:
-        str: The path to the stored image
+        bool: True if the upload was queued
     """
-    # Create directory if it doesn't exist
-    os.makedirs('/tmp/uploads', exist_ok=True)
-    
-    # Generate a path for the file
-    path = f"/tmp/uploads/{filename}"
-    
-    # Save the file
-    image_data.seek(0)
-    with open(path, 'wb') as f:
-        f.write(image_data.read())
-    
-    logger.debug(f"Image saved locally at {path}")
-    return path
+    if not Config.REMOTE_UPLOADS or not os.path.isfile(local_path) or not initialize_firebase():
+        return False
+    remote_uploader.enqueue(local_path, f"images/{os.path.basename(local_path)}", on_uploaded)
+    return True
+
+def get_bucket():
+    """Return the process-wide Firebase bucket handle, creating it on first use."""
+    global _bucket
+    if _bucket is None:
+        with _bucket_lock:
+            if _bucket is None:
+                initialize_firebase()
+                _bucket = storage.bucket()
+    return _bucket
 
 def get_image_url(path):
     """
     Get the URL for an image.
     
+    Pure string formatting: never calls the storage SDK.
+    
     Args:
         path: The path where the image is stored
         
     Returns:
         str: URL to access the image
     """
-    # If it's a Firebase path and Firebase is initialized
-    if firebase_initialized and path.startswith('images/'):
-        try:
-            bucket = storage.bucket()
-            blob = bucket.blob(path)
-            return blob.public_url
-        except Exception as e:
-            logger.error(f"Error getting Firebase URL: {str(e)}")
-            # Fall back to local URL
-            return f"/serve_image/{path.split('/')[-1]}"
-    
-    # If it's a local path
-    elif path.startswith('/tmp/uploads/'):
-        return f"/serve_image/{path.split('/')[-1]}"
+    # Firebase path with a known bucket
+    if path.startswith('images/') and remote_store.bucket_name:
+        return remote_store.url_for(path)
     
-    # Default case
-    else:
-        return f"/serve_image/{path.split('/')[-1]}"
+    # Local store (or fallback for Firebase paths)
+    return image_store.url_for(os.path.basename(path))
+
+# 전역 인스턴스
+image_store = create_backend(Config.STORAGE_BACKEND, root=Config.UPLOAD_FOLDER,
+                             bucket_factory=get_bucket, bucket_name=Config.FIREBASE_STORAGE_BUCKET)
+remote_store = FirebaseBackend(get_bucket, Config.FIREBASE_STORAGE_BUCKET)
+remote_uploader = BackgroundUploader(
+    remote_store,
+    max_workers=Config.REMOTE_UPLOAD_WORKERS,
+    batch_size=Config.REMOTE_UPLOAD_BATCH_SIZE,
+    batch_interval=Config.REMOTE_UPLOAD_BATCH_INTERVAL,
+    max_retries=Config.REMOTE_UPLOAD_MAX_RETRIES,
+    dead_letter_path=Config.REMOTE_UPLOAD_DEAD_LETTER
+)
+upload_retention = RetentionManager(
+    Config.UPLOAD_FOLDER,
+    max_age_days=Config.UPLOAD_RETENTION_DAYS,
+    max_bytes=Config.UPLOAD_MAX_BYTES,
+    policy=Config.UPLOAD_EVICTION_POLICY,
+    remote_store=remote_store,
+    remote_enabled=initialize_firebase,
+    eviction_grace_days=Config.UPLOAD_EVICTION_GRACE_DAYS
+)
@@ -0,0 +1,178 @@
+"""
+Background uploader for remote (Firebase) image storage.
+
+업로드 요청은 이미지를 로컬 디스크에만 저장하고 바로 응답하며, 원격 업로드는 이 큐가
+배치 단위로 워커 풀에서 처리합니다. 실패한 업로드는 백오프 후 재시도하고, 재시도
+횟수를 넘기면 dead-letter 목록(선택적으로 JSON Lines 파일)에 기록합니다.
+대상 저장소로 MemoryBackend나 가짜 버킷을 쓰는 FirebaseBackend를 넘기면 Firebase 없이
+테스트할 수 있습니다.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTask:
+    """One local file waiting to be pushed to the remote bucket."""
+
+    __slots__ = ('local_path', 'remote_path', 'on_uploaded', 'attempts', 'last_error')
+
+    def __init__(self, local_path, remote_path, on_uploaded=None):
+        self.local_path = local_path
+        self.remote_path = remote_path
+        self.on_uploaded = on_uploaded
+        self.attempts = 0
+        self.last_error = None
+
+
+class BackgroundUploader:
+    """Collects upload tasks into batches and uploads them on a thread pool."""
+
+    def __init__(self, destination, max_workers=2, batch_size=16, batch_interval=0.5,
+                 max_retries=3, backoff=1.0, dead_letter_path=None, max_dead_letters=1000):
+        """
+        Args:
+            destination: StorageBackend to copy local files into
+            max_workers (int): 동시에 업로드하는 배치 수
+            batch_size (int): 한 배치의 최대 파일 수
+            batch_interval (float): 배치를 채우기 위해 기다리는 최대 시간(초)
+            max_retries (int): 실패 시 재시도 횟수
+            backoff (float): 첫 재시도 대기 시간(초), 이후 두 배씩 증가
+            dead_letter_path (str, optional): 최종 실패 기록을 추가할 JSON Lines 파일
+        """
+        self.destination = destination
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.dead_letter_path = dead_letter_path or None
+        self.dead_letters = deque(maxlen=max_dead_letters)
+
+        self._queue = queue.Queue()
+        self._executor = None
+        self._dispatcher = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+
+    def enqueue(self, local_path, remote_path, on_uploaded=None):
+        """
+        원격 업로드를 예약합니다.
+
+        Args:
+            local_path (str): 업로드할 로컬 파일 경로
+            remote_path (str): 대상 저장소의 키
+            on_uploaded: callable(list of (local_path, remote_path, url)),
+                배치가 끝날 때 성공한 항목들로 한 번 호출됨
+        """
+        with self._lock:
+            self._outstanding += 1
+            self._ensure_started()
+        self._queue.put(UploadTask(local_path, remote_path, on_uploaded))
+
+    def flush(self, timeout=None):
+        """Block until every queued upload has succeeded or been dead-lettered."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def _ensure_started(self):
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='remote-upload'
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name='remote-upload-dispatcher', daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._upload_batch, batch)
+
+    def _upload_batch(self, batch):
+        uploaded = []
+        for task in batch:
+            try:
+                key = self.destination.put_file(task.local_path, task.remote_path)
+                uploaded.append((task, self.destination.url_for(key)))
+            except Exception as e:
+                self._handle_failure(task, e)
+
+        if uploaded:
+            logger.debug(f"Uploaded {len(uploaded)} image(s) to remote storage")
+        self._notify(uploaded)
+
+    def _notify(self, uploaded):
+        # 콜백별로 묶어서 한 번씩 호출 (예: 배치당 DB 커밋 한 번)
+        groups = {}
+        for task, url in uploaded:
+            if task.on_uploaded is not None:
+                groups.setdefault(task.on_uploaded, []).append((task.local_path, task.remote_path, url))
+        for callback, items in groups.items():
+            try:
+                callback(items)
+            except Exception as e:
+                logger.error(f"Remote upload callback failed: {str(e)}")
+        self._finish(len(uploaded))
+
+    def _handle_failure(self, task, error):
+        task.attempts += 1
+        task.last_error = str(error)
+        if task.attempts <= self.max_retries:
+            delay = self.backoff * (2 ** (task.attempts - 1))
+            logger.warning(f"Remote upload of {task.local_path} failed ({task.last_error}), "
+                           f"retrying in {delay:.1f}s")
+            timer = threading.Timer(delay, self._queue.put, args=(task,))
+            timer.daemon = True
+            timer.start()
+            return
+
+        logger.error(f"Remote upload of {task.local_path} failed after {task.attempts} attempts: "
+                     f"{task.last_error}")
+        record = {
+            'local_path': task.local_path,
+            'remote_path': task.remote_path,
+            'attempts': task.attempts,
+            'error': task.last_error,
+            'failed_at': time.time(),
+        }
+        self.dead_letters.append(record)
+        if self.dead_letter_path:
+            try:
+                with open(self.dead_letter_path, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+            except OSError as e:
+                logger.error(f"Could not write dead-letter record: {str(e)}")
+        self._finish(1)
+
+    def _finish(self, count):
+        if not count:
+            return
+        with self._idle:
+            self._outstanding -= count
+            if self._outstanding <= 0:
+                self._idle.notify_all()
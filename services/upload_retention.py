@@ -0,0 +1,290 @@
+"""
+Retention and disk-quota manager for locally stored uploads.
+
+로컬 업로드 디렉터리를 주기적으로 검사하여
+- 보관 기간(max_age)을 넘긴 원본은 만료 처리하고 (원격 사본과 변형 이미지도 삭제),
+- 남은 원본의 총 크기가 max_bytes를 넘으면 오래된 순(oldest) 또는 가장 오래 사용되지 않은 순(lru)으로
+  원본만 삭제합니다. 이때 변형 이미지(variants/)와 원격 사본은 유지됩니다.
+최근 분석(SkinAnalysis)이 아직 참조하는 원본은 is_referenced 콜백으로 확인하여 건너뜁니다.
+DB 반영은 on_removed 콜백에 맡기고, 실행마다 회수한 용량 등의 지표를 기록합니다.
+백그라운드 실행(start)은 잠금 파일을 가진 한 프로세스에서만 수행됩니다.
+"""
+
+import fcntl
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'
+
+# SkinAnalysis.image_path 표시용 접두사
+EXPIRED_PREFIX = 'expired/'
+EVICTED_PREFIX = 'evicted/'
+
+# 백그라운드 정리 담당 프로세스를 정하는 잠금 파일 (scan 대상에서 제외)
+LOCK_FILENAME = '.retention.lock'
+
+
+def remote_key_for(local_path):
+    """Return the Firebase key schedule_remote_upload used for a local file."""
+    return f"images/{os.path.basename(local_path)}"
+
+
+def variant_key_for(image_path):
+    """
+    Return the upload key whose local variants show an analysis image.
+
+    로컬/원격(images/...)/evicted 경로 모두 파일 이름이 콘텐츠 키이므로, 원본 URL이
+    Firebase로 바뀐 뒤에도 같은 키로 축소 이미지를 제공할 수 있습니다.
+
+    Args:
+        image_path (str): SkinAnalysis.image_path
+
+    Returns:
+        str: 콘텐츠 키, 이미지가 만료되었으면 None
+    """
+    if not image_path or image_path.startswith(EXPIRED_PREFIX):
+        return None
+    return os.path.basename(image_path)
+
+
+class RetentionManager:
+    """Applies age and size quotas to an upload directory."""
+
+    def __init__(self, root, max_age_days=0, max_bytes=0, policy='oldest',
+                 remote_store=None, remote_enabled=None, remote_batch_size=100,
+                 eviction_grace_days=1):
+        """
+        Args:
+            root (str): 업로드 루트 디렉터리
+            max_age_days (float): 원본 보관 기간(일), 0이면 제한 없음
+            max_bytes (int): 원본 총 크기 한도, 0이면 제한 없음
+            policy (str): 용량 초과 시 삭제 순서 - 'oldest'(수정 시각) 또는 'lru'(접근 시각)
+            remote_store: 만료된 원본의 원격 사본을 지울 StorageBackend (없으면 로컬만 처리)
+            remote_enabled: callable() -> bool, 실행 시점에 원격 저장소 사용 가능 여부 확인
+            remote_batch_size (int): 원격 삭제 배치 크기
+            eviction_grace_days (float): 이 기간 안에 만든 분석이 참조하는 원본은 용량 초과 시에도 유지
+        """
+        if policy not in ('oldest', 'lru'):
+            raise ValueError(f"Unknown retention policy: {policy}")
+        self.root = root
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.remote_store = remote_store
+        self.remote_enabled = remote_enabled
+        self.remote_batch_size = remote_batch_size
+        self.eviction_grace_days = eviction_grace_days
+        self.metrics = {
+            'runs': 0,
+            'files_removed': 0,
+            'bytes_reclaimed': 0,
+            'remote_deleted': 0,
+            'last_run_at': None,
+            'last_run_seconds': None,
+        }
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock_file = None
+
+    def scan(self):
+        """Return (path, size, mtime, atime) for every original under the root."""
+        originals = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            # 변형 이미지 디렉터리는 대상이 아님
+            dirnames[:] = [name for name in dirnames if name != VARIANTS_DIR]
+            for filename in filenames:
+                if filename.endswith('.tmp') or filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                originals.append((path, stat.st_size, stat.st_mtime, stat.st_atime))
+        return originals
+
+    def plan(self, now=None, is_referenced=None):
+        """
+        삭제 대상을 계산합니다.
+
+        Args:
+            now (float): 기준 시각
+            is_referenced: callable(paths, since) -> set, since(epoch 초) 이후에 만든 분석이
+                참조하는 경로 집합. 여기에 포함된 원본은 삭제하지 않음
+
+        Returns:
+            tuple: (expired, evicted) - 각각 (path, size) 목록
+        """
+        now = now or time.time()
+        originals = self.scan()
+
+        expired = []
+        if self.max_age_days:
+            cutoff = now - self.max_age_days * 86400
+            expired = [entry for entry in originals if entry[2] < cutoff]
+            if expired and is_referenced is not None:
+                # 오래된 파일이라도 보관 기간 안의 분석이 다시 참조하면 유지 (중복 업로드)
+                referenced = is_referenced([entry[0] for entry in expired], cutoff)
+                expired = [entry for entry in expired if entry[0] not in referenced]
+            expired_paths = {entry[0] for entry in expired}
+            originals = [entry for entry in originals if entry[0] not in expired_paths]
+
+        evicted = []
+        if self.max_bytes:
+            total = sum(entry[1] for entry in originals)
+            order_index = 2 if self.policy == 'oldest' else 3
+            candidates = sorted(originals, key=lambda entry: entry[order_index])
+            if total > self.max_bytes and is_referenced is not None and self.eviction_grace_days:
+                since = now - self.eviction_grace_days * 86400
+                referenced = is_referenced([entry[0] for entry in candidates], since)
+                candidates = [entry for entry in candidates if entry[0] not in referenced]
+            for entry in candidates:
+                if total <= self.max_bytes:
+                    break
+                evicted.append(entry)
+                total -= entry[1]
+
+        return ([(entry[0], entry[1]) for entry in expired],
+                [(entry[0], entry[1]) for entry in evicted])
+
+    def run(self, on_removed=None, dry_run=False, is_referenced=None):
+        """
+        보존 정책을 한 번 적용합니다.
+
+        Args:
+            on_removed: callable(expired_paths, evicted_paths) - DB 행 갱신용
+            dry_run (bool): True면 삭제하지 않고 대상만 집계
+            is_referenced: plan() 참고 - 최근 분석이 참조하는 원본 확인용
+
+        Returns:
+            dict: 이번 실행의 통계
+        """
+        with self._run_lock:
+            started = time.monotonic()
+            expired, evicted = self.plan(is_referenced=is_referenced)
+
+            if dry_run:
+                return {
+                    'expired': len(expired),
+                    'evicted': len(evicted),
+                    'bytes_reclaimable': sum(size for _, size in expired + evicted),
+                }
+
+            removed_expired = [path for path, _ in expired if self._remove_original(path, with_variants=True)]
+            removed_evicted = [path for path, _ in evicted if self._remove_original(path)]
+            removed = set(removed_expired) | set(removed_evicted)
+            bytes_reclaimed = sum(size for path, size in expired + evicted if path in removed)
+
+            remote_deleted = 0
+            if removed_expired and self._remote_available():
+                keys = [remote_key_for(path) for path in removed_expired]
+                for start in range(0, len(keys), self.remote_batch_size):
+                    remote_deleted += self.remote_store.delete_many(keys[start:start + self.remote_batch_size])
+
+            if on_removed is not None and removed:
+                try:
+                    on_removed(removed_expired, removed_evicted)
+                except Exception as e:
+                    logger.error(f"Could not record removed uploads: {str(e)}")
+
+            elapsed = time.monotonic() - started
+            self.metrics['runs'] += 1
+            self.metrics['files_removed'] += len(removed)
+            self.metrics['bytes_reclaimed'] += bytes_reclaimed
+            self.metrics['remote_deleted'] += remote_deleted
+            self.metrics['last_run_at'] = time.time()
+            self.metrics['last_run_seconds'] = elapsed
+
+            stats = {
+                'expired': len(removed_expired),
+                'evicted': len(removed_evicted),
+                'bytes_reclaimed': bytes_reclaimed,
+                'remote_deleted': remote_deleted,
+                'seconds': round(elapsed, 3),
+            }
+            if removed:
+                logger.info(f"Upload retention removed {len(removed)} file(s), "
+                            f"reclaimed {bytes_reclaimed} bytes, deleted {remote_deleted} remote blob(s)")
+            return stats
+
+    def start(self, interval, on_removed=None, is_referenced=None):
+        """
+        Run the policy every `interval` seconds on a daemon thread.
+
+        여러 워커 프로세스가 start()를 호출해도 잠금 파일을 얻은 한 프로세스만 정리를 수행하며,
+        그 프로세스가 종료되면 다른 프로세스가 다음 주기에 이어받습니다.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                if not self._acquire_sweeper_lock():
+                    continue
+                try:
+                    self.run(on_removed, is_referenced=is_referenced)
+                except Exception as e:
+                    logger.error(f"Upload retention run failed: {str(e)}")
+
+        self._thread = threading.Thread(target=loop, name='upload-retention', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _acquire_sweeper_lock(self):
+        """Hold an exclusive lock file for the process lifetime; False if another process holds it."""
+        if self._lock_file is not None:
+            return True
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            lock_file = open(os.path.join(self.root, LOCK_FILENAME), 'a')
+        except OSError as e:
+            logger.error(f"Could not open retention lock file: {str(e)}")
+            return False
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f"Upload retention sweeper running in process {os.getpid()}")
+        return True
+
+    def _remote_available(self):
+        if self.remote_store is None:
+            return False
+        return self.remote_enabled is None or self.remote_enabled()
+
+    def _remove_original(self, path, with_variants=False):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.error(f"Could not remove upload {path}: {str(e)}")
+            return False
+
+        if with_variants:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            variants_root = os.path.join(os.path.dirname(path), VARIANTS_DIR)
+            if os.path.isdir(variants_root):
+                for variant in os.listdir(variants_root):
+                    variant_dir = os.path.join(variants_root, variant)
+                    for filename in os.listdir(variant_dir):
+                        if os.path.splitext(filename)[0] == stem:
+                            try:
+                                os.remove(os.path.join(variant_dir, filename))
+                            except FileNotFoundError:
+                                pass
+        return True
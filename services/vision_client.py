@@ -0,0 +1,180 @@
+"""
+Pooled GPT-4 Vision client.
+
+하나의 OpenAI 클라이언트(커넥션 풀)를 프로세스 전체에서 재사용하고, 호출별 제한 시간,
+지터가 포함된 제한된 재시도, 동시 호출 수 제한, 서킷 브레이커를 제공합니다.
+base_url을 지정하면 로컬 스텁 HTTP 서버를 대상으로 테스트할 수 있습니다.
+"""
+
+import logging
+import random
+import threading
+import time
+import openai
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 재시도해도 되는 일시적 오류
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class VisionUnavailableError(Exception):
+    """Raised when the vision upstream should not be called right now."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial call through after a cooldown."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # 쿨다운이 지나면 한 번의 시험 호출만 허용
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release_trial(self):
+        """
+        시험 호출이 업스트림에 도달하지 못하고 끝난 경우 (예: 동시 호출 슬롯 대기 초과)
+        HALF_OPEN 상태를 OPEN으로 되돌려 다음 호출이 다시 시험 호출을 할 수 있게 합니다.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Vision circuit breaker opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class VisionClient:
+    """Thread-safe wrapper around one pooled OpenAI client."""
+
+    def __init__(self, api_key, base_url=None, timeout=20.0, max_retries=2,
+                 max_concurrency=4, backoff=0.5, breaker=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        # 재시도는 이 클래스에서 직접 관리하므로 SDK 재시도는 비활성화
+        self._client = openai.OpenAI(
+            api_key=api_key,
+            base_url=base_url or None,
+            timeout=timeout,
+            max_retries=0
+        )
+
+    def create_completion(self, deadline=None, **request):
+        """
+        chat.completions.create 호출
+
+        Args:
+            deadline (float, optional): 이 호출 전체(대기 + 재시도)에 허용할 시간(초)
+            **request: chat.completions.create 인자
+
+        Returns:
+            ChatCompletion: OpenAI 응답
+
+        Raises:
+            VisionUnavailableError: 서킷이 열려 있거나, 동시 호출 슬롯을 얻지 못했거나, 제한 시간을 넘긴 경우
+            openai.OpenAIError: 재시도 후에도 실패했거나 재시도할 수 없는 오류인 경우
+        """
+        if not self.breaker.allow_request():
+            raise VisionUnavailableError("Vision API circuit is open")
+
+        # 성공/실패를 기록하지 않고 끝나는 경로에서도 시험 호출 상태가 남지 않도록 함
+        settled = False
+        try:
+            expires_at = time.monotonic() + (deadline or self.timeout)
+            if not self._semaphore.acquire(timeout=max(0.0, expires_at - time.monotonic())):
+                raise VisionUnavailableError("Too many concurrent vision calls")
+
+            try:
+                attempt = 0
+                while True:
+                    remaining = expires_at - time.monotonic()
+                    if remaining <= 0:
+                        settled = True
+                        self.breaker.record_failure()
+                        raise VisionUnavailableError("Vision call deadline exceeded")
+                    try:
+                        response = self._client.chat.completions.create(timeout=remaining, **request)
+                        settled = True
+                        self.breaker.record_success()
+                        return response
+                    except RETRYABLE_ERRORS as e:
+                        if attempt >= self.max_retries:
+                            settled = True
+                            self.breaker.record_failure()
+                            raise
+                        # 지수 백오프 + 지터, 남은 시간을 넘기지 않음
+                        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                        delay = min(delay, max(0.0, expires_at - time.monotonic()))
+                        logger.warning(f"Vision call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+                        time.sleep(delay)
+                        attempt += 1
+                    except openai.OpenAIError:
+                        # 4xx 등 재시도 불가 오류는 요청의 문제이므로 성공/실패 어느 쪽으로도 기록하지 않음
+                        # (settled를 두지 않아 시험 호출이었다면 아래에서 반환됨)
+                        raise
+                    except Exception:
+                        # 예상하지 못한 오류는 실패로 기록
+                        settled = True
+                        self.breaker.record_failure()
+                        raise
+            finally:
+                self._semaphore.release()
+        finally:
+            if not settled:
+                self.breaker.release_trial()
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_vision_client():
+    """Return the process-wide VisionClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = VisionClient(
+                    api_key=Config.OPENAI_API_KEY,
+                    base_url=Config.OPENAI_BASE_URL,
+                    timeout=Config.VISION_TIMEOUT,
+                    max_retries=Config.VISION_MAX_RETRIES,
+                    max_concurrency=Config.VISION_MAX_CONCURRENCY,
+                    breaker=CircuitBreaker(Config.VISION_BREAKER_THRESHOLD, Config.VISION_BREAKER_RESET)
+                )
+    return _client
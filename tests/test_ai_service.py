@@ -0,0 +1,47 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from services import ai_service
+from services.enhanced_analyzer import get_default_result, is_default_result
+from services.result_cache import AnalysisResultCache
+from utils.image_context import ImageContext
+
+
+def _context(color):
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, format='PNG')
+    return ImageContext(buffer.getvalue(), 'face.png')
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AnalysisResultCache(max_entries=16)
+    monkeypatch.setattr(ai_service, 'analysis_result_cache', cache)
+    monkeypatch.setattr(ai_service.analysis_executor, 'max_workers', 0)
+    return cache
+
+
+def test_fallback_result_is_not_cached(cache, monkeypatch):
+    calls = []
+
+    def failing_analyze(image, user_age=None):
+        calls.append(user_age)
+        return get_default_result(user_age)
+
+    monkeypatch.setattr(ai_service, 'enhanced_analyze', failing_analyze)
+    image = _context((200, 150, 120))
+    ai_service.analyze_skin_age(image, 30)
+    ai_service.analyze_skin_age(image, 30)
+
+    assert len(calls) == 2
+    assert cache.get(AnalysisResultCache.make_key(image.content_hash, 30)) is None
+
+
+def test_real_result_is_cached(cache):
+    image = _context((180, 140, 110))
+    first = ai_service.analyze_skin_age(image, 30)
+    assert not is_default_result(first)
+    assert cache.get(AnalysisResultCache.make_key(image.content_hash, 30)) == first
+    assert ai_service.analyze_skin_age(image, 30) == first
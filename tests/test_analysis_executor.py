@@ -0,0 +1,71 @@
+import os
+import signal
+import time
+from concurrent.futures import TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from services import ai_service
+from services.analysis_executor import AnalysisExecutor
+from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze
+from services.result_cache import AnalysisResultCache
+from utils.image_context import ImageContext, get_analysis_image
+
+
+def _context(color):
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, format='PNG')
+    return ImageContext(buffer.getvalue(), 'face.png')
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = AnalysisExecutor(max_workers=1, timeout=30)
+    monkeypatch.setattr(ai_service, 'analysis_executor', executor)
+    monkeypatch.setattr(ai_service, 'analysis_result_cache', AnalysisResultCache(max_entries=16))
+    yield executor
+    executor.shutdown()
+
+
+def _kill_workers(executor):
+    pool = executor._pool
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while not pool._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool._broken
+
+
+def test_worker_result_matches_in_process_analysis(executor):
+    image = _context((180, 140, 110))
+    assert executor.analyze(image, 30) == enhanced_analyze(get_analysis_image(image), 30)
+
+
+def test_timeout_falls_back_to_default_result(executor):
+    image = _context((180, 140, 110))
+    executor.timeout = 0.001
+    with pytest.raises(TimeoutError):
+        executor.analyze(image, 30)
+
+    assert ai_service.analyze_skin_age(image, 30) == ai_service.get_default_analysis_result()
+
+
+def test_broken_pool_falls_back_and_is_restarted(executor):
+    image = _context((170, 130, 100))
+    expected = executor.analyze(image, 40)
+
+    _kill_workers(executor)
+    with pytest.raises(BrokenProcessPool):
+        executor.analyze(image, 40)
+    assert executor._pool is None
+
+    # 다음 요청은 새 풀에서 정상 분석
+    assert executor.analyze(image, 40) == expected
+
+    _kill_workers(executor)
+    assert ai_service.analyze_skin_age(image, 40) == ai_service.get_default_analysis_result()
+    assert ai_service.analyze_skin_age(image, 40) == expected
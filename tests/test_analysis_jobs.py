@@ -0,0 +1,49 @@
+import sqlite3
+import time
+
+from services.analysis_jobs import DONE, FAILED, PENDING, RUNNING, AnalysisJobQueue
+
+
+def test_submit_prunes_expired_terminal_rows(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    queue = AnalysisJobQueue(max_workers=1, db_path=path, job_ttl=60)
+    old = time.time() - 3600
+    db = sqlite3.connect(path)
+    db.executemany(
+        "INSERT INTO analysis_jobs (job_id, owner, status, result, error, updated_at) VALUES (?, NULL, ?, NULL, NULL, ?)",
+        [('old-done', DONE, old), ('old-failed', FAILED, old), ('old-pending', PENDING, old),
+         ('recent-done', DONE, time.time())]
+    )
+    db.commit()
+
+    job_id = queue.submit(lambda: {'ok': True})
+    queue.shutdown()
+
+    remaining = {row[0] for row in db.execute("SELECT job_id FROM analysis_jobs")}
+    assert remaining == {'old-pending', 'recent-done', job_id}
+    assert queue.get(job_id)['status'] == DONE
+
+
+def test_abandoned_pending_and_running_rows_fail(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    queue = AnalysisJobQueue(max_workers=1, db_path=path, stale_after=60)
+    now = time.time()
+    db = sqlite3.connect(path)
+    db.executemany(
+        "INSERT INTO analysis_jobs (job_id, owner, status, result, error, updated_at) VALUES (?, NULL, ?, NULL, NULL, ?)",
+        [('stale-pending', PENDING, now - 3600), ('stale-running', RUNNING, now - 3600),
+         ('fresh-running', RUNNING, now)]
+    )
+    db.commit()
+
+    # 조회 시점에 실패로 바뀌고 그 상태가 기록됨
+    assert queue.get('stale-running')['status'] == FAILED
+    assert queue.get('fresh-running')['status'] == RUNNING
+    assert db.execute("SELECT status FROM analysis_jobs WHERE job_id = 'stale-running'").fetchone() == (FAILED,)
+
+    # 제출 시 정리에서도 오래된 대기 작업이 실패 처리됨
+    queue.submit(lambda: None)
+    queue.shutdown()
+    statuses = dict(db.execute("SELECT job_id, status FROM analysis_jobs"))
+    assert statuses['stale-pending'] == FAILED
+    assert statuses['fresh-running'] == RUNNING
@@ -0,0 +1,47 @@
+import pickle
+
+from services.enhanced_analyzer import DEFAULT_RESULT_FEEDBACK, get_default_result, is_default_result
+
+
+def test_default_result_is_deterministic_without_seed():
+    assert get_default_result(40) == get_default_result(40)
+    assert get_default_result(40)[0] == 40.0
+    assert get_default_result()[0] == 35.0
+
+
+def test_default_result_is_stable_per_seed():
+    first = get_default_result(40, seed=0x1234abcd)
+    assert first == get_default_result(40, seed=0x1234abcd)
+    assert 37.0 <= first[0] <= 43.0
+
+
+def test_default_result_is_marked():
+    assert is_default_result(get_default_result(30))
+    assert not is_default_result((30.0, {}, "Based on our analysis"))
+    # 문구가 아니라 표시로 구분하고, 프로세스 풀을 거쳐도 유지됨
+    assert not is_default_result((35.0, {}, DEFAULT_RESULT_FEEDBACK))
+    assert is_default_result(pickle.loads(pickle.dumps(get_default_result(30))))
+    skin_age, features, feedback = get_default_result(30)
+    assert (skin_age, feedback) == (30.0, DEFAULT_RESULT_FEEDBACK)
+
+
+def test_personalized_feedback_template_is_shared_across_ages_in_a_band():
+    from services.enhanced_analyzer import _feedback_template, generate_personalized_feedback
+
+    features = {'wrinkles': 0.7, 'moisture': 0.3, 'pores': 0.2}
+    _feedback_template.cache_clear()
+
+    # 같은 나이 구간/차이 구간이면 문장 템플릿을 재사용하고 숫자만 다시 채움
+    first = generate_personalized_feedback(40.21, features, 30)
+    second = generate_personalized_feedback(43.64, features, 35)
+    assert 'around 40.2.' in first and 'by about 10.2 years' in first
+    assert 'around 43.6.' in second and 'by about 8.6 years' in second
+    assert second == first.replace('40.2', '43.6').replace('10.2', '8.6')
+    assert _feedback_template.cache_info().hits == 1
+
+    # 나이 구간 경계(임계값)나 차이 구간이 바뀌면 다른 항목
+    borderline = {'wrinkles': 0.55}
+    assert 'wrinkles' in generate_personalized_feedback(44.96, borderline)
+    assert 'wrinkles' not in generate_personalized_feedback(45.04, borderline)
+    assert 'closely matches' in generate_personalized_feedback(36.0, features, 35)
+    assert _feedback_template.cache_info().misses == 4
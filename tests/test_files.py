@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from utils.files import atomic_write
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = tmp_path / 'nested' / 'report.pdf'
+    with atomic_write(str(path)) as f:
+        f.write(b'first')
+    with atomic_write(str(path)) as f:
+        f.write(b'second')
+
+    assert path.read_bytes() == b'second'
+    assert os.listdir(path.parent) == ['report.pdf']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / 'page.page'
+    path.write_bytes(b'old')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write(b'partial')
+            raise RuntimeError('render failed')
+
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['page.page']
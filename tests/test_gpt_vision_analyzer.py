@@ -0,0 +1,81 @@
+import base64
+from collections import OrderedDict
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from config import Config
+from services import gpt_vision_analyzer
+from services.gpt_vision_analyzer import prepare_vision_payload
+from utils.image_context import ImageContext
+
+
+def _upload(size):
+    """Return PNG bytes of a smooth gradient image."""
+    width, height = size
+    image = Image.new('RGB', size)
+    image.putdata([(x * 255 // width, y * 255 // height, 128) for y in range(height) for x in range(width)])
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _decode(payload):
+    return Image.open(BytesIO(base64.b64decode(payload)))
+
+
+@pytest.fixture(autouse=True)
+def payload_cache(monkeypatch):
+    cache = OrderedDict()
+    monkeypatch.setattr(gpt_vision_analyzer, '_payload_cache', cache)
+    return cache
+
+
+def test_large_upload_is_downscaled_within_budget(monkeypatch):
+    monkeypatch.setattr(Config, 'VISION_MAX_EDGE', 256)
+    context = ImageContext(_upload((800, 400)), 'face.png')
+
+    payload = prepare_vision_payload(context)
+
+    image = _decode(payload)
+    assert image.format == 'JPEG'
+    assert image.size == (256, 128)
+    assert len(base64.b64decode(payload)) <= Config.VISION_MAX_PAYLOAD_BYTES
+    # 원본 이미지는 축소되지 않음
+    assert context.image.size == (800, 400)
+
+
+def test_small_image_keeps_its_size(monkeypatch):
+    monkeypatch.setattr(Config, 'VISION_MAX_EDGE', 256)
+    image = Image.open(BytesIO(_upload((120, 90))))
+
+    assert _decode(prepare_vision_payload(image)).size == (120, 90)
+
+
+def test_payload_is_cached_by_content_hash(monkeypatch, payload_cache):
+    monkeypatch.setattr(Config, 'VISION_MAX_EDGE', 256)
+    raw = _upload((400, 300))
+    encodes = []
+    save = Image.Image.save
+
+    def counting_save(image, *args, **kwargs):
+        encodes.append(image.size)
+        return save(image, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, 'save', counting_save)
+
+    first = prepare_vision_payload(ImageContext(raw, 'a.png'))
+    assert encodes == [(256, 192)]
+
+    # 같은 내용의 다른 업로드는 다시 인코딩하지 않고 캐시된 페이로드를 사용
+    second_context = ImageContext(raw, 'b.png')
+    assert prepare_vision_payload(second_context) == first
+    assert encodes == [(256, 192)]
+    assert len(payload_cache) == 1
+
+    # 설정이 바뀌면 다시 인코딩
+    monkeypatch.setattr(Config, 'VISION_MAX_EDGE', 128)
+    assert _decode(prepare_vision_payload(second_context)).size == (128, 96)
+    assert encodes == [(256, 192), (128, 96)]
+    assert len(payload_cache) == 2
@@ -0,0 +1,57 @@
+from io import BytesIO
+
+from PIL import Image
+
+from utils import image_context
+from utils.image_context import ANALYSIS_SIZE, ImageContext, get_analysis_image
+
+
+class CountingUpload:
+    """Stands in for a Flask FileStorage and counts reads."""
+
+    def __init__(self, data, filename='face.jpg'):
+        self.stream = BytesIO(data)
+        self.filename = filename
+        self.reads = 0
+
+    def read(self, *args):
+        self.reads += 1
+        return self.stream.read(*args)
+
+
+def _jpeg(size=(640, 480), color=(180, 140, 120)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def test_upload_is_read_and_decoded_once(monkeypatch):
+    opened = []
+    real_open = image_context.Image.open
+
+    def counting_open(fp, *args, **kwargs):
+        opened.append(fp)
+        return real_open(fp, *args, **kwargs)
+
+    monkeypatch.setattr(image_context.Image, 'open', counting_open)
+    upload = CountingUpload(_jpeg())
+    context = ImageContext.from_file(upload)
+
+    assert upload.reads == 1
+    assert context.filename == 'face.jpg' and context.size_bytes == len(upload.stream.getvalue())
+    assert context.size == (640, 480)
+    image = context.image
+    thumbnail = context.analysis_image
+    assert context.image_hash and context.content_hash
+
+    assert context.image is image
+    assert get_analysis_image(context) is thumbnail
+    assert thumbnail.size == ANALYSIS_SIZE and thumbnail.mode == 'RGB'
+    assert len(opened) == 1
+    assert upload.reads == 1
+
+
+def test_content_hash_is_stable_across_contexts():
+    data = _jpeg()
+    assert ImageContext(data).content_hash == ImageContext(data).content_hash
+    assert ImageContext(data).content_hash != ImageContext(_jpeg(color=(90, 60, 50))).content_hash
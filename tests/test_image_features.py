@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.image_features import channel_statistics, edge_count, pixel_array
+
+
+def _noisy_image(amplitude, size=24, seed=0):
+    rng = np.random.default_rng(seed)
+    base = np.full((size, size, 3), 128, dtype=np.int16)
+    noise = rng.integers(-amplitude, amplitude + 1, base.shape)
+    return Image.fromarray((base + noise).clip(0, 255).astype(np.uint8))
+
+
+def _legacy_statistics(image):
+    width, height = image.size
+    pixels = [image.getpixel((x, y)) for y in range(height) for x in range(width)]
+    count = len(pixels)
+    means = tuple(sum(p[c] for p in pixels) / count for c in range(3))
+    variances = tuple(sum((p[c] - means[c]) ** 2 for p in pixels) / count for c in range(3))
+    return means, variances
+
+
+@pytest.mark.parametrize('amplitude', [0, 6, 40, 127])
+def test_channel_statistics_match_the_per_pixel_loop(amplitude):
+    image = _noisy_image(amplitude)
+    means, variances = _legacy_statistics(image)
+
+    stats = channel_statistics(pixel_array(image))
+    assert stats['means'] == means
+    assert stats['variances'] == pytest.approx(variances, rel=1e-12, abs=1e-9)
+
+
+def _legacy_edges(image, threshold=30):
+    width, height = image.size
+    edges = 0
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            pixel = image.getpixel((x, y))
+            neighbours = [image.getpixel(point) for point in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))]
+            if any(sum(abs(pixel[c] - other[c]) for c in range(3)) > threshold for other in neighbours):
+                edges += 1
+    return edges
+
+
+@pytest.mark.parametrize('amplitude', [0, 6, 12, 40])
+def test_edge_count_matches_the_getpixel_loop(amplitude):
+    image = _noisy_image(amplitude, seed=amplitude)
+    assert edge_count(pixel_array(image), threshold=30) == _legacy_edges(image)
+
+
+def test_edge_count_ignores_the_border_and_non_square_shapes():
+    pixels = np.zeros((5, 7, 3), dtype=np.uint8)
+    pixels[0, :] = 255  # 테두리 행은 세지 않지만 이웃 비교에는 쓰임
+    pixels[2, 3] = 255
+    image = Image.fromarray(pixels)
+
+    assert edge_count(pixels) == _legacy_edges(image) == 9
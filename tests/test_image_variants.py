@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from services import image_variants
+from services.image_variants import _JPEG, _SUPPORTED_FORMATS, get_variant_path, negotiate_format
+
+SUPPORTED = {fmt[0] for fmt in _SUPPORTED_FORMATS}
+
+
+@pytest.mark.skipif('image/webp' not in SUPPORTED, reason='Pillow built without WebP')
+def test_negotiate_format_honours_q_values():
+    assert negotiate_format('image/webp,*/*')[0] == 'image/webp'
+    assert negotiate_format('image/webp;q=0,*/*') == _JPEG
+    assert negotiate_format('image/*,*/*;q=0.8') == _JPEG
+    assert negotiate_format('') == _JPEG
+    assert negotiate_format(None) == _JPEG
+
+
+@pytest.mark.skipif(not {'image/webp', 'image/avif'} <= SUPPORTED, reason='Pillow built without AVIF/WebP')
+def test_negotiate_format_prefers_higher_quality_then_avif():
+    assert negotiate_format('image/avif,image/webp')[0] == 'image/avif'
+    assert negotiate_format('image/avif;q=0.5,image/webp')[0] == 'image/webp'
+    assert negotiate_format('image/avif;q=0,image/webp;q=0.4')[0] == 'image/webp'
+
+
+def test_generation_is_locked_per_output_path(tmp_path, monkeypatch):
+    sources = []
+    for name in ('a', 'b'):
+        path = tmp_path / f'{name}.jpg'
+        Image.new('RGB', (800, 800), 'white').save(path)
+        sources.append(str(path))
+
+    active = []
+    overlap = []
+    renders = []
+    real_render = image_variants._render_variant
+
+    def slow_render(source_path, path, *args):
+        active.append(path)
+        overlap.append(len(active))
+        time.sleep(0.1)
+        real_render(source_path, path, *args)
+        renders.append(path)
+        active.remove(path)
+
+    monkeypatch.setattr(image_variants, '_render_variant', slow_render)
+    threads = [threading.Thread(target=get_variant_path, args=(source, 'thumb'))
+               for source in sources + sources]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 같은 경로는 한 번만 생성하고, 다른 이미지의 생성은 동시에 진행됨
+    assert len(renders) == 2
+    assert max(overlap) == 2
+    assert image_variants._path_locks == {}
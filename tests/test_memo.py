@@ -0,0 +1,31 @@
+from utils.memo import memoize
+
+
+def test_calls_with_the_same_key_share_one_result():
+    calls = []
+
+    @memoize(lambda value: value > 0.5, copy=list)
+    def classify(value):
+        calls.append(value)
+        return ['high' if value > 0.5 else 'low']
+
+    assert classify(0.7) == ['high']
+    result = classify(0.9)
+    result.append('mutated')
+    assert classify(0.8) == ['high']
+    assert classify(0.1) == ['low']
+    assert calls == [0.7, 0.1]
+    assert classify.cache_info().hits == 2
+
+    classify.cache_clear()
+    classify(0.6)
+    assert calls == [0.7, 0.1, 0.6]
+
+
+def test_unhashable_or_failing_keys_bypass_the_cache():
+    @memoize(lambda value: float(value))
+    def double(value):
+        return value * 2
+
+    assert double('ab') == 'abab'
+    assert double.cache_info().currsize == 0
@@ -0,0 +1,22 @@
+import sqlite3
+
+from flask import Flask
+
+from models import db, ensure_indexes
+
+
+def test_ensure_indexes_adds_missing_indexes_once(tmp_path):
+    path = tmp_path / 'legacy.db'
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE skin_analysis (id INTEGER PRIMARY KEY, user_id TEXT, image_hash TEXT, created_at TEXT)"
+    )
+    connection.commit()
+    connection.close()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{path}"
+    db.init_app(app)
+    with app.app_context():
+        assert sorted(ensure_indexes()) == ['ix_skin_analysis_created_at', 'ix_skin_analysis_user_id_image_hash']
+        assert ensure_indexes() == []
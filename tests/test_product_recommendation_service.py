@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from services.product_catalog import ProductCatalog
+from services.product_recommendation_service import ProductRecommendationEngine, SkinAnalysisMapper
+from services.rate_limiter import ApiRateLimiter
+from services.recommendation_cache import RecommendationCache
+
+FEATURES = {'wrinkles': 0.9, 'dryness': 0.8, 'pores': 0.2}
+SAMPLE_CATALOG = os.path.join(os.path.dirname(__file__), 'fixtures', 'sample_product_catalog.json')
+
+
+def _product(source, index):
+    return {'title': f'{source} product {index}', 'price': '10', 'image_url': '', 'product_url': '',
+            'rating': 4.5, 'review_count': 100, 'brand': 'brand', 'category': 'serum'}
+
+
+@pytest.fixture
+def fake_provider():
+    """Start a local search adapter: fake_provider(source, delay=0) -> (url, received queries)."""
+    servers = []
+
+    def start(source, delay=0.0):
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                received.append(parse_qs(urlparse(self.path).query)['keywords'][0])
+                time.sleep(delay)
+                body = json.dumps({'products': [_product(source, i) for i in range(3)]}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}/search', received
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def engine():
+    engine = ProductRecommendationEngine()
+    engine.coupang_access_key = engine.coupang_secret_key = 'key'
+    engine.amazon_access_key = engine.amazon_secret_key = engine.amazon_associate_tag = 'key'
+    engine.api_endpoints = {'coupang': '', 'amazon': ''}
+    engine.provider_timeouts = {'coupang': 1.0, 'amazon': 1.0}
+    engine.cache = RecommendationCache()
+    engine.rate_limiter = ApiRateLimiter({'coupang': (10, 10), 'amazon': (10, 10)}, daily_limit=100)
+    engine.catalog = ProductCatalog.load(SAMPLE_CATALOG, SkinAnalysisMapper.SKIN_ISSUE_MAPPING)
+    return engine
+
+
+def test_missing_endpoint_falls_back_without_quota_or_cache(engine):
+    products = engine.search_coupang_products(['retinol', 'moisturizer'])
+
+    assert products and all(p.source == 'coupang' for p in products)
+    assert engine.get_api_usage()['total_calls'] == 0
+    assert engine.cache.stats()['entries'] == 0
+
+
+def test_adapter_results_are_cached(engine, fake_provider):
+    engine.api_endpoints['amazon'], received = fake_provider('amazon')
+
+    first = engine.search_amazon_products(['retinol', 'collagen'])
+    second = engine.search_amazon_products(['collagen', 'retinol'])
+
+    assert [p.title for p in first] == [p.title for p in second] == [f'amazon product {i}' for i in range(3)]
+    assert received == ['retinol,collagen']
+    assert engine.get_api_usage()['calls'] == {'amazon': 1}
+
+
+def test_providers_are_searched_concurrently_with_deadlines(engine, fake_provider):
+    engine.api_endpoints['coupang'], _ = fake_provider('coupang', delay=0.3)
+    engine.api_endpoints['amazon'], _ = fake_provider('amazon', delay=0.3)
+
+    started = time.monotonic()
+    recommendations = engine.get_recommendations(FEATURES, user_age=45)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.55
+    assert [p.source for p in recommendations['coupang']] == ['coupang'] * 3
+    assert [p.source for p in recommendations['amazon']] == ['amazon'] * 3
+
+    # 느린 제공자는 카탈로그로 대체되고, 다른 제공자의 결과는 그대로 반환
+    engine.cache.clear()
+    engine.api_endpoints['amazon'], _ = fake_provider('amazon', delay=2.0)
+    engine.provider_timeouts['amazon'] = 0.2
+    started = time.monotonic()
+    recommendations = engine.get_recommendations(FEATURES, user_age=45)
+    assert time.monotonic() - started < 1.5
+    assert len(recommendations['coupang']) == 3
+    assert all(p.source == 'amazon' for p in recommendations['amazon'])
+
+
+def test_fallback_uses_feature_relevance_when_keywords_match_nothing(engine):
+    mild = {'wrinkles': 0.5, 'dryness': 0.4, 'pores': 0.1}
+    assert engine.search_coupang_products([]) == []
+
+    products = engine.search_coupang_products([], features=mild)
+    assert products and all(p.source == 'coupang' for p in products)
+
+    recommendations = engine.get_recommendations(mild)
+    assert recommendations['amazon']
+
+
+def test_no_fallback_products_without_a_configured_catalog(engine):
+    engine.catalog = ProductCatalog.load('', SkinAnalysisMapper.SKIN_ISSUE_MAPPING)
+
+    assert engine.search_coupang_products(['retinol'], features=FEATURES) == []
+    assert engine.get_recommendations(FEATURES)['amazon'] == []
+
+
+def test_keywords_are_cached_by_ranked_issues():
+    SkinAnalysisMapper._keywords_for.cache_clear()
+
+    first = SkinAnalysisMapper.generate_keywords({'wrinkles': 0.9, 'dryness': 0.7, 'pores': 0.1}, 45)
+    first.append('mutated')
+    second = SkinAnalysisMapper.generate_keywords({'wrinkles': 0.8, 'dryness': 0.65, 'pores': 0.5}, 52)
+
+    assert second == ['retinol', 'anti-aging', 'collagen', 'peptide', '주름', '안티에이징',
+                      'moisturizer', 'hydrating cream', 'hyaluronic acid', '보습']
+    assert SkinAnalysisMapper._keywords_for.cache_info().hits == 1
+    assert SkinAnalysisMapper.generate_keywords({'wrinkles': 0.9}, is_sensitive=True) == ['bakuchiol', 'vitamin c']
@@ -0,0 +1,42 @@
+from services.rate_limiter import ApiRateLimiter
+
+
+def test_quota_rejection_does_not_spend_tokens():
+    limiter = ApiRateLimiter({'coupang': (0.001, 3)}, daily_limit=1)
+
+    assert limiter.acquire('coupang')
+    assert not limiter.acquire('coupang')
+    assert not limiter.acquire('coupang')
+
+    usage = limiter.usage()
+    assert usage['calls'] == {'coupang': 1}
+    assert usage['rejected'] == {'coupang': 2}
+    assert usage['tokens']['coupang'] >= 2
+
+
+def test_rate_limit_rejection_does_not_use_quota():
+    limiter = ApiRateLimiter({'amazon': (0.001, 1)}, daily_limit=10)
+
+    assert limiter.acquire('amazon')
+    assert not limiter.acquire('amazon')
+    assert limiter.usage()['total_calls'] == 1
+
+
+def test_shared_quota_across_limiters(tmp_path):
+    db_path = str(tmp_path / 'usage.sqlite')
+    limiters = [ApiRateLimiter({}, daily_limit=5, db_path=db_path) for _ in range(3)]
+
+    admitted = sum(limiter.acquire(source) for limiter in limiters for source in ('coupang', 'amazon')
+                   for _ in range(2))
+
+    assert admitted == 5
+    assert limiters[0].usage()['total_calls'] == 5
+
+
+def test_failed_shared_update_rolls_back_and_counts_locally(tmp_path):
+    limiter = ApiRateLimiter({}, daily_limit=5, db_path=str(tmp_path / 'usage.sqlite'))
+    limiter._db.execute("DROP TABLE api_usage")
+
+    assert limiter.acquire('coupang')
+    assert not limiter._db.in_transaction
+    assert limiter._calls == {'coupang': 1}
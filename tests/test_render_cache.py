@@ -0,0 +1,104 @@
+import gzip
+
+import pytest
+from flask import Flask, flash
+
+from services.render_cache import CachedPage, FilesystemStore, LRUStore, PageCache
+
+
+@pytest.fixture
+def app(tmp_path):
+    (tmp_path / 'page.html').write_text(
+        '{% for message in get_flashed_messages() %}<p>{{ message }}</p>{% endfor %}<h1>{{ title }}</h1>'
+    )
+    app = Flask(__name__, template_folder=str(tmp_path))
+    app.secret_key = 'test'
+    app.page_cache = PageCache(LRUStore(16))
+    app.renders = 0
+
+    @app.route('/')
+    def index():
+        app.renders += 1
+        return app.page_cache.render('page.html', title=f'render {app.renders}')
+
+    @app.route('/flash')
+    def with_flash():
+        flash('saved')
+        return index()
+
+    return app
+
+
+def test_repeat_views_are_cached_and_revalidated(app):
+    client = app.test_client()
+    first = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert first.status_code == 200
+    assert first.get_data(as_text=True) == '<h1>render 1</h1>'
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    again = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert again.get_data(as_text=True) == '<h1>render 1</h1>'
+    assert again.headers['ETag'] == etag
+
+    not_modified = client.get('/', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b''
+
+
+def test_encoding_follows_accept_encoding(app):
+    client = app.test_client()
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+
+    zipped = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+
+    refused = client.get('/', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in refused.headers
+    assert refused.get_data() == plain.get_data()
+
+
+def test_brotli_is_preferred_when_available(app):
+    # brotli 본문이 있는 항목을 직접 넣어 선택 규칙만 확인 (brotli 패키지는 선택 사항)
+    html = b'<h1>cached</h1>'
+    page = CachedPage('etag', {'identity': html, 'gzip': gzip.compress(html), 'br': b'brotli body'})
+    app.page_cache.store.set('page.html:en:1:', page)
+    client = app.test_client()
+
+    assert client.get('/', headers={'Accept-Encoding': 'gzip, br'}).headers['Content-Encoding'] == 'br'
+    assert client.get('/', headers={'Accept-Encoding': 'br;q=0, gzip'}).headers['Content-Encoding'] == 'gzip'
+    assert client.get('/', headers={'Accept-Encoding': 'br'}).get_data() == b'brotli body'
+
+
+def test_pending_flashes_bypass_the_cache(app):
+    client = app.test_client()
+    flashed = client.get('/flash', headers={'Accept-Encoding': 'identity'})
+    assert flashed.get_data(as_text=True) == '<p>saved</p><h1>render 1</h1>'
+    assert 'ETag' not in flashed.headers
+
+    # 플래시가 포함된 페이지는 저장되지 않음
+    assert client.get('/', headers={'Accept-Encoding': 'identity'}).get_data(as_text=True) == '<h1>render 2</h1>'
+    assert app.page_cache.store.get('page.html:en:1:') is not None
+
+
+def test_filesystem_store_round_trip(tmp_path):
+    folder = tmp_path / 'pages'
+    page = CachedPage.build('<h1>안녕하세요</h1>' * 50)
+    FilesystemStore(str(folder)).set('index.html:ko:1:', page)
+
+    # 다른 워커(새 인스턴스)에서도 같은 항목을 읽음
+    store = FilesystemStore(str(folder))
+    loaded = store.get('index.html:ko:1:')
+    assert loaded.etag == page.etag
+    assert loaded.bodies == page.bodies
+    assert gzip.decompress(loaded.bodies['gzip']) == loaded.bodies['identity']
+    assert store.get('missing') is None
+
+    (folder / next(p.name for p in folder.iterdir())).write_bytes(b'corrupt')
+    assert store.get('index.html:ko:1:') is None
+
+    store.clear()
+    assert list(folder.iterdir()) == []
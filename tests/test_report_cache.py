@@ -0,0 +1,23 @@
+import os
+import time
+from io import BytesIO
+
+from services.report_cache import PdfReportCache
+from services.upload_retention import RetentionManager
+
+
+def test_report_cache_is_bounded_by_age_and_size(tmp_path):
+    cache = PdfReportCache(str(tmp_path), version='2')
+    old = cache.store(1, 'en', BytesIO(b'%PDF old' * 10))
+    stamp = time.time() - 40 * 86400
+    os.utime(old, (stamp, stamp))
+    for analysis_id in (2, 3, 4):
+        cache.store(analysis_id, 'en', BytesIO(b'%PDF' * 50))
+        stamp = time.time() - (10 - analysis_id) * 60
+        os.utime(cache.path_for(analysis_id), (stamp, stamp))
+
+    stats = RetentionManager(str(tmp_path), max_age_days=30, max_bytes=450).run()
+
+    assert (stats['expired'], stats['evicted']) == (1, 1)
+    assert cache.get(1) is None and cache.get(2) is None
+    assert cache.get(3) is not None and cache.get(4) is not None
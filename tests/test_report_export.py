@@ -0,0 +1,21 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from services.report_export import parse_ids
+
+
+def test_parse_ids_reads_repeated_and_comma_separated_values():
+    params = MultiDict([('ids', '1'), ('ids', '2,3'), ('ids', ' 4 , ')])
+    assert parse_ids(params) == [1, 2, 3, 4]
+
+
+def test_parse_ids_reads_json_bodies():
+    assert parse_ids({'ids': [5, '6']}) == [5, 6]
+    assert parse_ids({'ids': '7,8'}) == [7, 8]
+    assert parse_ids({'ids': 9}) == [9]
+    assert parse_ids({}) == []
+
+
+def test_parse_ids_rejects_non_integers():
+    with pytest.raises(ValueError):
+        parse_ids(MultiDict([('ids', '1'), ('ids', 'x')]))
@@ -0,0 +1,37 @@
+from services.recommendation_cache import RecommendationCache
+from services.result_cache import AnalysisResultCache
+from services.sqlite_tier import SqliteTier
+
+
+def test_result_cache_shares_results_through_the_sqlite_tier(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite')
+    writer, reader = AnalysisResultCache(db_path=db_path), AnalysisResultCache(db_path=db_path)
+    writer.set('key', (31.5, {'wrinkles': 0.4}, 'feedback'))
+    assert reader.get('key') == (31.5, {'wrinkles': 0.4}, 'feedback')
+
+
+def test_recommendation_cache_shares_results_through_the_sqlite_tier(tmp_path):
+    db_path = str(tmp_path / 'cache.sqlite')
+    products = [{'title': 'serum'}]
+    RecommendationCache(db_path=db_path).set('coupang:abc', products)
+    assert RecommendationCache(db_path=db_path).get('coupang:abc') == products
+
+
+def test_failed_statements_roll_back_and_read_as_misses(tmp_path):
+    tier = SqliteTier(str(tmp_path / 'tier.sqlite'),
+                      "CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, value TEXT)", 'test')
+
+    assert not tier.write(("INSERT INTO items VALUES (?, ?)", ('a', '1')),
+                          ("INSERT INTO missing VALUES (?)", ('b',)))
+    assert tier.fetchone("SELECT value FROM items WHERE key = ?", ('a',)) is None
+    assert tier.fetchone("SELECT value FROM missing") is None
+
+    assert tier.write(("INSERT INTO items VALUES (?, ?)", ('a', '1')))
+    assert tier.fetchone("SELECT value FROM items WHERE key = ?", ('a',)) == ('1',)
+
+
+def test_disabled_tier_is_a_no_op():
+    tier = SqliteTier(None, "CREATE TABLE items (key TEXT)", 'test')
+    assert not tier.enabled
+    assert not tier.write(("INSERT INTO items VALUES (?)", ('a',)))
+    assert tier.fetchone("SELECT * FROM items") is None
@@ -0,0 +1,34 @@
+import pytest
+
+from services.storage_backends import FirebaseBackend, MemoryBackend, StorageBackend, content_key, create_backend
+
+
+def test_backends_must_implement_the_core_operations():
+    class PutOnly(StorageBackend):
+        def put(self, data, key=None, content_type=None):
+            return key
+
+    with pytest.raises(TypeError):
+        PutOnly()
+
+
+def test_memory_backend_round_trip():
+    store = MemoryBackend()
+    key = store.put(b'image')
+    assert key == content_key(b'image')
+    assert store.exists(key) and store.get(key) == b'image'
+    assert store.put_many([b'a', ('named.jpg', b'b')]) == [content_key(b'a'), 'named.jpg']
+    assert store.delete_many([key, 'named.jpg', 'missing.jpg']) == 2
+    assert not store.exists(key)
+
+
+def test_firebase_backend_needs_a_bucket_factory():
+    with pytest.raises(ValueError):
+        create_backend('firebase')
+
+    def no_sdk_calls():
+        raise AssertionError('bucket should not be created to build a URL')
+
+    store = create_backend('firebase', bucket_factory=no_sdk_calls, bucket_name='demo.appspot.com')
+    assert isinstance(store, FirebaseBackend)
+    assert 'demo.appspot.com' in store.url_for('images/abc.jpg')
@@ -0,0 +1,65 @@
+import os
+
+from PIL import Image
+
+from services.image_variants import get_variant_path
+from services.storage_backends import FirebaseBackend, LocalContentStore
+from services.upload_queue import BackgroundUploader
+from services.upload_retention import EXPIRED_PREFIX, remote_key_for, variant_key_for
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_filename(self, path, content_type=None):
+        with open(path, 'rb') as f:
+            self.bucket.objects[self.name] = f.read()
+
+    def make_public(self):
+        pass
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+
+class FakeBucket:
+    name = 'test-bucket'
+
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+def test_mirrored_uploads_keep_serving_local_variants(tmp_path):
+    store = LocalContentStore(str(tmp_path))
+    Image.new('RGB', (1200, 900), 'white').save(tmp_path / 'photo.jpg')
+    key = store.put((tmp_path / 'photo.jpg').read_bytes())
+    local_path = store.local_path(key)
+
+    bucket = FakeBucket()
+    uploader = BackgroundUploader(FirebaseBackend(lambda: bucket), batch_interval=0.01)
+    uploaded = []
+    uploader.enqueue(local_path, remote_key_for(local_path), uploaded.extend)
+    assert uploader.flush(timeout=5)
+
+    [(path, remote_key, url)] = uploaded
+    assert path == local_path and remote_key in bucket.objects
+    assert url == f'https://storage.googleapis.com/test-bucket/images/{key}'
+
+    # The row's URL now points at the bucket, but the variant key is still the content hash
+    assert variant_key_for(local_path) == key
+    variant, _ = get_variant_path(store.local_path(variant_key_for(local_path)), 'results')
+    with Image.open(variant) as image:
+        assert max(image.size) == 600
+
+    # Once retention evicts the original, the kept variant is found from the remote key
+    os.remove(local_path)
+    assert variant_key_for(remote_key) == key
+    assert get_variant_path(store.path_for(variant_key_for(remote_key)), 'results')[0] == variant
+
+    assert variant_key_for(EXPIRED_PREFIX + key) is None
+    assert variant_key_for('') is None
@@ -0,0 +1,76 @@
+import os
+import time
+
+from services.storage_backends import LocalContentStore
+from services.upload_retention import RetentionManager
+
+DAY = 86400
+
+
+def _age(path, days):
+    stamp = time.time() - days * DAY
+    os.utime(path, (stamp, stamp))
+
+
+def test_dedup_hit_refreshes_blob_so_retention_keeps_it(tmp_path):
+    store = LocalContentStore(str(tmp_path))
+    key = store.put(b'same image')
+    path = store.local_path(key)
+    _age(path, 30)
+
+    assert store.put(b'same image') == key
+    assert time.time() - os.stat(path).st_mtime < 60
+
+    stats = RetentionManager(str(tmp_path), max_age_days=7).run()
+    assert stats['expired'] == 0
+    assert os.path.exists(path)
+
+
+def test_referenced_blobs_are_not_expired(tmp_path):
+    store = LocalContentStore(str(tmp_path))
+    kept = store.local_path(store.put(b'referenced'))
+    dropped = store.local_path(store.put(b'unreferenced'))
+    _age(kept, 30)
+    _age(dropped, 30)
+
+    seen = []
+
+    def is_referenced(paths, since):
+        seen.append(since)
+        return {kept} & set(paths)
+
+    stats = RetentionManager(str(tmp_path), max_age_days=7).run(is_referenced=is_referenced)
+    assert stats['expired'] == 1
+    assert os.path.exists(kept) and not os.path.exists(dropped)
+    assert abs(seen[0] - (time.time() - 7 * DAY)) < 60
+
+
+def test_recently_referenced_blobs_are_not_evicted(tmp_path):
+    store = LocalContentStore(str(tmp_path))
+    oldest = store.local_path(store.put(b'a' * 100))
+    middle = store.local_path(store.put(b'b' * 100))
+    newest = store.local_path(store.put(b'c' * 100))
+    _age(oldest, 3)
+    _age(middle, 2)
+    _age(newest, 1)
+
+    manager = RetentionManager(str(tmp_path), max_bytes=150)
+    stats = manager.run(is_referenced=lambda paths, since: {oldest})
+    assert stats['evicted'] == 2
+    assert os.path.exists(oldest)
+    assert not os.path.exists(middle) and not os.path.exists(newest)
+
+
+def test_only_one_process_holds_the_sweeper_lock(tmp_path):
+    first = RetentionManager(str(tmp_path))
+    second = RetentionManager(str(tmp_path))
+    try:
+        assert first._acquire_sweeper_lock()
+        assert not second._acquire_sweeper_lock()
+        first.stop()
+        assert second._acquire_sweeper_lock()
+    finally:
+        first.stop()
+        second.stop()
+    # 잠금 파일은 정리 대상이 아님
+    assert RetentionManager(str(tmp_path)).scan() == []
@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+from PIL import Image
+
+from services import gpt_vision_analyzer
+from services.enhanced_analyzer import analyze_skin_age as enhanced_analyze
+from services.vision_client import CircuitBreaker, VisionClient, VisionUnavailableError
+
+
+class StubState:
+    """Queued responses for the stub server and what it observed."""
+
+    def __init__(self):
+        self.outcomes = []
+        self.arrivals = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def next_outcome(self):
+        with self.lock:
+            self.arrivals.append(time.monotonic())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.outcomes.pop(0) if self.outcomes else {}
+
+    @property
+    def calls(self):
+        return len(self.arrivals)
+
+
+def _completion(content):
+    return {
+        'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': 0, 'model': 'gpt-4o',
+        'choices': [{'index': 0, 'finish_reason': 'stop',
+                     'message': {'role': 'assistant', 'content': content}}],
+    }
+
+
+@pytest.fixture
+def vision_stub():
+    """Start a local OpenAI-compatible server: outcomes are dicts with status, delay and content."""
+    state = StubState()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            outcome = state.next_outcome()
+            try:
+                time.sleep(outcome.get('delay', 0))
+                status = outcome.get('status', 200)
+                if status == 200:
+                    body = _completion(outcome.get('content', 'ok'))
+                else:
+                    body = {'error': {'message': f'stub error {status}', 'type': 'stub'}}
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except OSError:
+                pass
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    state.base_url = f'http://127.0.0.1:{server.server_port}/v1'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, **options):
+    options.setdefault('max_retries', 0)
+    options.setdefault('backoff', 0.01)
+    options.setdefault('breaker', CircuitBreaker(failure_threshold=1, reset_timeout=0.0))
+    return VisionClient(api_key='test', base_url=stub.base_url, timeout=5.0, **options)
+
+
+def complete(client, **options):
+    response = client.create_completion(model='gpt-4o', messages=[], **options)
+    return response.choices[0].message.content
+
+
+def open_breaker(client, stub):
+    stub.outcomes.append({'status': 500})
+    with pytest.raises(openai.InternalServerError):
+        complete(client)
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_success(vision_stub):
+    client = make_client(vision_stub)
+    vision_stub.outcomes.append({'content': 'hello'})
+
+    assert complete(client) == 'hello'
+    assert vision_stub.calls == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_server_errors_are_retried_with_jittered_backoff(vision_stub):
+    client = make_client(vision_stub, max_retries=2, backoff=0.05)
+    vision_stub.outcomes += [{'status': 500}, {'status': 503}, {'content': 'recovered'}]
+
+    assert complete(client) == 'recovered'
+    assert vision_stub.calls == 3
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+    # 시도 간 간격은 backoff * 2^attempt의 0.5~1.5배
+    first, second, third = vision_stub.arrivals
+    assert 0.025 <= second - first < 0.5
+    assert 0.05 <= third - second < 0.5
+
+
+def test_exhausted_retries_record_a_failure(vision_stub):
+    client = make_client(vision_stub, max_retries=1,
+                         breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30.0))
+    vision_stub.outcomes += [{'status': 502}, {'status': 502}]
+
+    with pytest.raises(openai.InternalServerError):
+        complete(client)
+    assert vision_stub.calls == 2
+    assert client.breaker.failures == 1
+
+
+def test_slow_call_is_bounded_by_deadline(vision_stub):
+    client = make_client(vision_stub, max_retries=3,
+                         breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30.0))
+    vision_stub.outcomes += [{'delay': 2.0}] * 4
+
+    started = time.monotonic()
+    with pytest.raises((openai.APITimeoutError, VisionUnavailableError)):
+        complete(client, deadline=0.3)
+    assert time.monotonic() - started < 1.0
+    assert client.breaker.failures == 1
+
+
+def test_client_errors_leave_breaker_unchanged(vision_stub):
+    client = make_client(vision_stub, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.0))
+    vision_stub.outcomes += [{'status': 500}, {'status': 400}]
+
+    with pytest.raises(openai.InternalServerError):
+        complete(client)
+    with pytest.raises(openai.BadRequestError):
+        complete(client)
+    assert client.breaker.failures == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_in_flight_calls_are_capped(vision_stub):
+    client = make_client(vision_stub, max_concurrency=2)
+    vision_stub.outcomes += [{'delay': 0.2}] * 5
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(complete(client))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['ok'] * 5
+    assert vision_stub.max_in_flight == 2
+
+
+def test_half_open_trial_success_closes_breaker(vision_stub):
+    client = make_client(vision_stub)
+    open_breaker(client, vision_stub)
+
+    assert complete(client) == 'ok'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_trial_failure_reopens_breaker(vision_stub):
+    client = make_client(vision_stub)
+    open_breaker(client, vision_stub)
+
+    vision_stub.outcomes.append({'status': 503})
+    with pytest.raises(openai.InternalServerError):
+        complete(client)
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_client_error_returns_trial(vision_stub):
+    client = make_client(vision_stub)
+    open_breaker(client, vision_stub)
+
+    vision_stub.outcomes.append({'status': 400})
+    with pytest.raises(openai.BadRequestError):
+        complete(client)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert complete(client) == 'ok'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_trial_without_upstream_call_does_not_wedge_breaker(vision_stub):
+    client = make_client(vision_stub, max_concurrency=1)
+    open_breaker(client, vision_stub)
+    client._semaphore.acquire()
+    try:
+        with pytest.raises(VisionUnavailableError):
+            complete(client, deadline=0.01)
+    finally:
+        client._semaphore.release()
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # 다음 호출이 다시 시험 호출을 할 수 있어야 함
+    assert complete(client) == 'ok'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_during_trial_reopens_breaker(vision_stub, monkeypatch):
+    client = make_client(vision_stub)
+    open_breaker(client, vision_stub)
+
+    def broken_create(**request):
+        raise ValueError('bad payload')
+
+    monkeypatch.setattr(client._client.chat.completions, 'create', broken_create)
+    with pytest.raises(ValueError):
+        complete(client)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    assert client.breaker.allow_request()
+
+
+def test_upstream_outage_routes_to_enhanced_analyzer(vision_stub, monkeypatch):
+    client = make_client(vision_stub, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30.0))
+    monkeypatch.setattr(gpt_vision_analyzer, 'OPENAI_API_KEY', 'test')
+    monkeypatch.setattr(gpt_vision_analyzer, 'get_vision_client', lambda: client)
+    image = Image.new('RGB', (64, 64), (180, 140, 110))
+    expected = enhanced_analyze(image, 30)
+
+    # 재시도 소진: 서킷이 열리고 로컬 분석기 결과 반환
+    vision_stub.outcomes.append({'status': 500})
+    assert gpt_vision_analyzer.analyze_skin_with_vision(image, 30) == expected
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # 서킷이 열린 동안에는 업스트림을 호출하지 않음
+    assert gpt_vision_analyzer.analyze_skin_with_vision(image, 30) == expected
+    assert vision_stub.calls == 1
@@ -2,6 +2,7 @@ import random
 import imagehash
 from PIL import Image
 from config import Config
+from utils.memo import memoize
 
 def allowed_file(filename):
     """Check if the file has an allowed extension."""
@@ -159,6 +160,24 @@ SKIN_FEEDBACK_MESSAGES_EN = {
     },
 }
 
+def feature_level(feature, value):
+    """Return the SKIN_FEATURE_RANGES level containing value, or None when out of range."""
+    for level, (low, high) in SKIN_FEATURE_RANGES[feature].items():
+        if low <= value < high:
+            return level
+    return None
+
+def _feedback_key(skin_age, features, lang="en"):
+    """
+    generate_feedback 결과를 결정하는 값만 담은 키.
+    
+    피드백은 정수 피부 나이, 언어, 그리고 (특성 순서대로) 각 특성이 속한 구간에만 의존합니다.
+    """
+    levels = tuple((feature, feature_level(feature, value))
+                   for feature, value in features.items() if feature in SKIN_FEATURE_RANGES)
+    return int(skin_age), lang == "ko", levels
+
+@memoize(_feedback_key)
 def generate_feedback(skin_age, features, lang="en"):
     """Generate personalized feedback based on skin age and features in the specified language."""
     # 기본 인사말
@@ -0,0 +1,37 @@
+"""
+파일 쓰기 유틸리티.
+
+다른 요청이나 프로세스가 동시에 읽는 파일(캐시, 업로드 등)은 임시 파일 + rename으로
+기록하여 반쯤 쓰인 내용이 보이지 않도록 합니다.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    path를 원자적으로 교체하는 쓰기용 파일 객체를 제공합니다.
+
+    같은 디렉터리의 임시 파일(.tmp)에 쓴 뒤 블록이 정상 종료되면 os.replace로 교체하므로
+    동시에 읽는 쪽은 반쯤 쓰인 파일을 보지 않습니다. 예외가 나면 임시 파일을 지우고 다시 발생시킵니다.
+
+    Args:
+        path (str): 최종 파일 경로 (상위 디렉터리는 없으면 생성)
+
+    Yields:
+        file: 바이너리 쓰기 모드 파일 객체
+    """
+    folder = os.path.dirname(path) or '.'
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,96 @@
+"""
+Request-scoped image context.
+
+업로드된 이미지를 한 번만 읽고 한 번만 디코딩한 뒤, 검증/해시/저장/분석 단계에서
+같은 객체를 공유하기 위한 모듈입니다.
+"""
+
+from io import BytesIO
+from PIL import Image
+from utils.common import generate_image_hash
+from utils.image_features import pixel_digest
+
+# 분석기가 사용하는 정규화 썸네일 크기
+ANALYSIS_SIZE = (300, 300)
+
+
+class ImageContext:
+    """Holds the raw upload bytes and everything derived from them.
+
+    Every derived product (decoded image, analysis thumbnail, perceptual
+    hash) is computed lazily on first access and then reused, so a request
+    never decodes the same upload twice.
+    """
+
+    def __init__(self, raw_bytes, filename=None):
+        self.raw_bytes = raw_bytes
+        self.filename = filename
+        self._header = None
+        self._image = None
+        self._analysis_image = None
+        self._image_hash = None
+        self._content_hash = None
+
+    @classmethod
+    def from_file(cls, file):
+        """Build a context from a Flask FileStorage, reading it exactly once."""
+        return cls(file.read(), file.filename)
+
+    @property
+    def size_bytes(self):
+        return len(self.raw_bytes)
+
+    @property
+    def size(self):
+        """Image dimensions, read from the header without decoding pixels."""
+        if self._image is not None:
+            return self._image.size
+        if self._header is None:
+            self._header = Image.open(BytesIO(self.raw_bytes))
+        return self._header.size
+
+    @property
+    def image(self):
+        """The fully decoded upload (decoded once per request)."""
+        if self._image is None:
+            image = self._header or Image.open(BytesIO(self.raw_bytes))
+            image.load()
+            self._image = image
+            self._header = None
+        return self._image
+
+    @property
+    def analysis_image(self):
+        """RGB 300x300 thumbnail shared by every analyzer."""
+        if self._analysis_image is None:
+            self._analysis_image = self.image.convert('RGB').resize(ANALYSIS_SIZE)
+        return self._analysis_image
+
+    @property
+    def content_hash(self):
+        """Exact digest of the normalized analysis thumbnail's pixel buffer."""
+        if self._content_hash is None:
+            self._content_hash = pixel_digest(self.analysis_image)
+        return self._content_hash
+
+    @property
+    def image_hash(self):
+        """Perceptual hash of the upload, used for duplicate detection."""
+        if self._image_hash is None:
+            self._image_hash = str(generate_image_hash(self.image))
+        return self._image_hash
+
+
+def get_analysis_image(image):
+    """
+    분석기 입력을 RGB 300x300 이미지로 정규화합니다.
+
+    Args:
+        image: ImageContext 또는 PIL.Image
+
+    Returns:
+        PIL.Image: 분석용 썸네일
+    """
+    if isinstance(image, ImageContext):
+        return image.analysis_image
+    return image.convert('RGB').resize(ANALYSIS_SIZE)
@@ -0,0 +1,69 @@
+"""
+Memoization for pure functions of skin analysis features.
+
+피드백/키워드/추천 함수는 특성 값 자체가 아니라 각 함수가 비교하는 임계값 구간에만
+의존합니다. 호출마다 key 함수로 입력을 그 구간의 튜플로 정규화하고, 그 키로
+functools.lru_cache에 결과를 보관하므로 값이 조금씩 다른 분석 결과도 같은 항목을 재사용합니다.
+"""
+
+import functools
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """lru_cache argument that hashes and compares by the canonical key only."""
+
+    __slots__ = ('key', 'args', 'kwargs')
+
+    def __init__(self, key, args, kwargs):
+        self.key = key
+        self.args = args
+        self.kwargs = kwargs
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def memoize(key_func, max_entries=None, copy=None):
+    """
+    정규화 키로 결과를 캐시하는 데코레이터.
+
+    Args:
+        key_func: 함수와 같은 인자를 받아 결과를 결정하는 값만 담은 해시 가능한 키를 반환
+        max_entries (int): LRU 크기 (기본값 Config.DERIVED_CACHE_SIZE)
+        copy: 반환 전에 결과를 복사하는 함수 (리스트/딕셔너리처럼 변경 가능한 결과용)
+
+    key_func가 예외를 내면(예: 숫자가 아닌 값) 캐시 없이 원래 함수를 호출합니다.
+    래핑된 함수는 functools.lru_cache와 같은 cache_info()/cache_clear()를 제공합니다.
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=max_entries or Config.DERIVED_CACHE_SIZE)
+        def cached(call):
+            try:
+                return func(*call.args, **call.kwargs)
+            finally:
+                # 캐시에는 키만 남김 (호출 인자를 붙잡아 두지 않음)
+                call.args = call.kwargs = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = key_func(*args, **kwargs)
+                hash(key)
+            except Exception:
+                return func(*args, **kwargs)
+
+            result = cached(_Call(key, args, kwargs))
+            return copy(result) if copy is not None else result
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
@@ -17,8 +17,71 @@ from reportlab.pdfbase.ttfonts import TTFont
 
 logger = logging.getLogger(__name__)
 
-# 기본 폰트 사용 (한글 폰트 대신)
-KOREAN_FONT = 'Helvetica'
+# 보고서 레이아웃이 바뀌면 올려서 캐시된 PDF를 무효화
+REPORT_VERSION = 2
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'static', 'fonts', 'NanumGothic.ttf')
+
+# 보고서에 들어가는 이미지 크기와 인쇄 해상도
+EMBED_WIDTH = 2.5 * inch
+EMBED_HEIGHT = 2 * inch
+EMBED_DPI = 200
+
+
+def _register_korean_font():
+    """번들된 나눔고딕 폰트를 프로세스당 한 번 등록합니다. 실패 시 Helvetica 사용."""
+    try:
+        pdfmetrics.registerFont(TTFont('NanumGothic', FONT_PATH))
+        return 'NanumGothic'
+    except Exception as e:
+        logger.warning(f"Could not register NanumGothic font, using Helvetica: {str(e)}")
+        return 'Helvetica'
+
+
+KOREAN_FONT = _register_korean_font()
+
+
+def _build_styles():
+    """언어별 (제목, 본문, 소제목) 스타일 - 폰트 크기 조정으로 1페이지에 맞춤"""
+    styles = getSampleStyleSheet()
+    return {
+        'ko': (
+            ParagraphStyle('KoreanTitle', parent=styles['Title'], fontName=KOREAN_FONT, fontSize=18, leading=22),
+            ParagraphStyle('KoreanNormal', parent=styles['Normal'], fontName=KOREAN_FONT, fontSize=10, leading=12),
+            ParagraphStyle('KoreanHeading', parent=styles['Heading2'], fontName=KOREAN_FONT, fontSize=12, leading=16),
+        ),
+        'en': (
+            ParagraphStyle('EnTitle', parent=styles['Title'], fontSize=18, leading=22),
+            ParagraphStyle('EnNormal', parent=styles['Normal'], fontSize=10, leading=12),
+            ParagraphStyle('EnHeading', parent=styles['Heading2'], fontSize=12, leading=16),
+        ),
+    }
+
+
+# 스타일은 읽기 전용으로 공유되므로 모듈 로드 시 한 번만 생성
+PDF_STYLES = _build_styles()
+
+
+def _embed_image(image_path):
+    """
+    업로드 원본 대신 보고서 크기(2.5x2 inch)에 맞춰 축소한 JPEG를 만듭니다.
+    
+    Args:
+        image_path (str): 로컬 이미지 경로
+        
+    Returns:
+        ReportLabImage: PDF에 삽입할 이미지
+    """
+    size = (int(EMBED_WIDTH / inch * EMBED_DPI), int(EMBED_HEIGHT / inch * EMBED_DPI))
+    with Image.open(image_path) as source:
+        source.draft('RGB', size)  # JPEG는 디코딩 단계에서 미리 축소
+        embed = source.convert('RGB').resize(size, Image.LANCZOS)
+    buffer = BytesIO()
+    embed.save(buffer, format='JPEG', quality=85, optimize=True)
+    buffer.seek(0)
+    return ReportLabImage(buffer, width=EMBED_WIDTH, height=EMBED_HEIGHT)
+
 
 def create_skin_analysis_pdf(analysis, lang='en'):
     """
@@ -33,49 +96,8 @@ def create_skin_analysis_pdf(analysis, lang='en'):
     """
     buffer = BytesIO()
     
-    # PDF 스타일과 설정 - 폰트 크기 조정으로 1페이지에 맞춤
-    styles = getSampleStyleSheet()
-    if lang == 'ko':
-        title_style = ParagraphStyle(
-            'KoreanTitle',
-            parent=styles['Title'],
-            fontName=KOREAN_FONT,
-            fontSize=18,  # 폰트 크기 축소
-            leading=22    # 줄 간격 축소
-        )
-        normal_style = ParagraphStyle(
-            'KoreanNormal',
-            parent=styles['Normal'],
-            fontName=KOREAN_FONT,
-            fontSize=10,  # 폰트 크기 축소
-            leading=12    # 줄 간격 축소
-        )
-        heading_style = ParagraphStyle(
-            'KoreanHeading',
-            parent=styles['Heading2'],
-            fontName=KOREAN_FONT,
-            fontSize=12,  # 폰트 크기 축소
-            leading=16    # 줄 간격 축소
-        )
-    else:
-        title_style = ParagraphStyle(
-            'EnTitle',
-            parent=styles['Title'],
-            fontSize=18,  # 폰트 크기 축소
-            leading=22    # 줄 간격 축소
-        )
-        normal_style = ParagraphStyle(
-            'EnNormal',
-            parent=styles['Normal'],
-            fontSize=10,  # 폰트 크기 축소
-            leading=12    # 줄 간격 축소
-        )
-        heading_style = ParagraphStyle(
-            'EnHeading',
-            parent=styles['Heading2'],
-            fontSize=12,  # 폰트 크기 축소
-            leading=16    # 줄 간격 축소
-        )
+    # PDF 스타일 (모듈 로드 시 생성된 공유 스타일)
+    title_style, normal_style, heading_style = PDF_STYLES['ko' if lang == 'ko' else 'en']
     
     # PDF 문서 생성 - 마진 축소로 공간 확보
     doc = SimpleDocTemplate(
@@ -109,8 +131,7 @@ def create_skin_analysis_pdf(analysis, lang='en'):
     try:
         # 이미지 경로에서 이미지 로드 (크기 축소)
         if analysis.image_path and os.path.exists(analysis.image_path):
-            img = ReportLabImage(analysis.image_path, width=2.5*inch, height=2*inch)
-            elements.append(img)
+            elements.append(_embed_image(analysis.image_path))
         else:
             # 이미지 URL이 있지만 로컬 파일이 없는 경우 URL 표시
             image_note = "Image available online" if lang == 'en' else "이미지는 온라인에서 확인 가능합니다"
@@ -2,10 +2,19 @@
 Product recommendation system based on skin analysis results.
 """
 
+from utils.memo import memoize
+
+# Features the recommendation rules look at (the only inputs that affect the result)
+FEATURE_NAMES = ('wrinkles', 'pigmentation', 'elasticity', 'moisture', 'fine_lines',
+                 'dark_spots', 'pores', 'dryness', 'oiliness')
+
 def get_product_recommendations(features, skin_age, actual_age=None):
     """
     Generate product recommendations based on skin analysis features.
     
+    Results are cached by which rule thresholds the features cross, so
+    analyses with slightly different values share one cache entry.
+    
     Args:
         features (dict): Skin analysis features (wrinkles, pigmentation, etc.)
         skin_age (float): Estimated skin age
@@ -14,18 +23,27 @@ def get_product_recommendations(features, skin_age, actual_age=None):
     Returns:
         list: List of recommended products
     """
+    feature_values = tuple(features.get(name, 0) for name in FEATURE_NAMES)
+    # Copies, so callers can't modify the cached entries
+    return [dict(product) for product in _recommendations_for(feature_values)]
+
+def _rule_key(feature_values):
+    """The outcome of every threshold test in _recommendations_for."""
+    (wrinkles, pigmentation, elasticity, moisture, fine_lines,
+     dark_spots, pores, dryness, oiliness) = feature_values
+    return (wrinkles > 0.3, wrinkles > 0.5, fine_lines > 0.3,
+            pigmentation > 0.3, pigmentation > 0.5, dark_spots > 0.3,
+            dryness > 0.4, dryness > 0.6, moisture < 0.4,
+            oiliness > 0.6, pores > 0.5, elasticity < 0.4)
+
+@memoize(_rule_key)
+def _recommendations_for(feature_values):
+    """Apply the recommendation rules to a FEATURE_NAMES-ordered value tuple."""
     recommendations = []
     
     # Get feature values
-    wrinkles = features.get('wrinkles', 0)
-    pigmentation = features.get('pigmentation', 0)
-    elasticity = features.get('elasticity', 0)
-    moisture = features.get('moisture', 0)
-    fine_lines = features.get('fine_lines', 0)
-    dark_spots = features.get('dark_spots', 0)
-    pores = features.get('pores', 0)
-    dryness = features.get('dryness', 0)
-    oiliness = features.get('oiliness', 0)
+    (wrinkles, pigmentation, elasticity, moisture, fine_lines,
+     dark_spots, pores, dryness, oiliness) = feature_values
     
     # Anti-aging products for wrinkles and fine lines
     if wrinkles > 0.3 or fine_lines > 0.3:
@@ -130,4 +148,4 @@ def get_product_recommendations(features, skin_age, actual_age=None):
         ])
     
     # Limit to 3 recommendations maximum
-    return recommendations[:3]
\ No newline at end of file
+    return tuple(recommendations[:3])
\ No newline at end of file